@@ -0,0 +1,58 @@
+"""Measures cold-start time of the command-line entry points.
+
+Each command runs in a fresh interpreter several times against a throwaway
+copy of the database directory; the median wall time is reported.
+
+    python benchmarks/cold_start.py [--runs 10] [--output results.json]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = {
+    "python (baseline)": ["-c", "pass"],
+    "import main (interactive menu)": ["-c", "import main"],
+    "cli.py balance --json": [os.path.join(ROOT, "cli.py"), "balance", "--json"],
+    "cli.py list --limit 5": [os.path.join(ROOT, "cli.py"), "list", "--limit", "5"],
+    "cli.py add-expense": [os.path.join(ROOT, "cli.py"), "add-expense", "--amount", "1.00", "--category", "Food"],
+}
+
+def time_command(args, cwd, runs):
+    """Returns the wall times, in milliseconds, of `runs` fresh interpreter launches."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=cwd, env=env, check=True, stdout=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        if os.path.isdir(os.path.join(ROOT, "database")):
+            shutil.copytree(os.path.join(ROOT, "database"), os.path.join(workdir, "database"))
+        for name, command in COMMANDS.items():
+            timings = time_command(command, workdir, args.runs)
+            results[name] = {"median_ms": statistics.median(timings), "min_ms": min(timings), "runs": args.runs}
+            print(f"{name:<34} median {results[name]['median_ms']:8.1f} ms   min {results[name]['min_ms']:8.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump({"python": sys.version.split()[0], "cold_start": results}, file, indent=2)
+
+if __name__ == "__main__":
+    main()
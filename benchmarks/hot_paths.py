@@ -0,0 +1,191 @@
+"""Times the application's hot paths against synthetic ledgers of several sizes.
+
+For every size a ledger is generated in a temporary directory and a fresh
+interpreter runs each benchmark there, so in-process caches never leak
+between sizes. Results are written as JSON; pass an earlier results file to
+--compare to see what got faster or slower.
+
+    python benchmarks/hot_paths.py --sizes 10k,100k,1M
+    python benchmarks/hot_paths.py --sizes 10k --compare benchmarks/results/old.json
+"""
+from datetime import datetime
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEDUP_CANDIDATES = 10_000
+REGRESSION_THRESHOLD = 1.10
+
+# --- Worker: runs inside the generated ledger's directory ---
+def _timed(function, repeat, setup=None):
+    """Returns the wall times, in seconds, of `repeat` calls, running `setup` untimed before each."""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def run_worker(repeat):
+    """Runs every benchmark against ./database and returns {name: timings}."""
+    from features.transactions.transactions import _get_transactions, _store
+    from features.analytics.analytics import _get_monthly_data
+    from features.budgets.budgets import _get_budgets
+    from features.smart_assistant.smart_assistant import _get_alerts
+    from features.data_management.exporter import export_rows
+    from features.storage.table import ordinal_to_date
+
+    current_month = datetime.now().strftime("%Y-%m")
+    backend = _store.backend
+    results = {}
+
+    def load_table():
+        _store.invalidate()
+        _get_transactions()
+
+    def export(format_name):
+        table = _get_transactions()
+        return lambda: export_rows(table.rows(table.indices()), os.path.join("exports", "bench"), format_name)
+
+    def reset_fingerprints():
+        for name in os.listdir("database"):
+            if name.endswith(".fp"):
+                os.remove(os.path.join("database", name))
+        if hasattr(backend, "fingerprints"):
+            backend.fingerprints._fingerprints = None
+
+    # Ledger load and the cached table.
+    results["get_transactions_cold"] = _timed(_get_transactions, repeat, setup=_store.invalidate)
+    results["get_transactions_warm"] = _timed(_get_transactions, repeat)
+
+    # Month rollups: first query builds every month, later ones are lookups.
+    results["monthly_data_cold"] = _timed(lambda: _get_monthly_data(current_month), repeat, setup=load_table)
+    results["monthly_data_warm"] = _timed(lambda: _get_monthly_data(current_month), repeat)
+
+    # view_budgets' spending aggregation.
+    results["budget_aggregation"] = _timed(
+        lambda: (_get_budgets(), _store.month(current_month).expenses_by_cat), repeat
+    )
+    results["alerts"] = _timed(_get_alerts, repeat)
+
+    # Import dedup: half the candidates already exist in the ledger.
+    table = _get_transactions()
+    rng = random.Random(7)
+    candidates = [table[i] for i in rng.sample(range(len(table)), min(len(table), DEDUP_CANDIDATES // 2))]
+    candidates += [
+        {"date": ordinal_to_date(table.dates[0]), "type": "expense", "category": "Other",
+         "description": f"new row {i}", "amount_paisa": 1 + i}
+        for i in range(DEDUP_CANDIDATES - len(candidates))
+    ]
+    check_all = lambda: sum(1 for t in candidates if backend.contains(t))
+    results["import_dedup_cold"] = _timed(check_all, repeat, setup=reset_fingerprints)
+    results["import_dedup_warm"] = _timed(check_all, repeat)
+
+    # Exports of the whole ledger.
+    os.makedirs("exports", exist_ok=True)
+    results["export_csv"] = _timed(export("CSV"), repeat)
+    results["export_json"] = _timed(export("JSON"), repeat)
+    return results
+
+# --- Driver ---
+def run_size(rows, repeat):
+    """Generates a ledger of `rows` rows and benchmarks it in a fresh interpreter."""
+    from benchmarks.ledger import write_ledger
+
+    with tempfile.TemporaryDirectory() as workdir:
+        started = time.perf_counter()
+        write_ledger(os.path.join(workdir, "database"), rows)
+        print(f"  generated {rows:,} rows in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", "--repeat", str(repeat)],
+            cwd=workdir, env=dict(os.environ, PYTHONPATH=ROOT),
+            check=True, capture_output=True, text=True,
+        ).stdout
+    timings = json.loads(output)
+    return {
+        name: {"median_s": statistics.median(values), "min_s": min(values), "runs": len(values)}
+        for name, values in timings.items()
+    }
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def compare(baseline, current):
+    """Prints each benchmark's median against a baseline results file."""
+    print(f"\nCompared with {baseline['meta']['revision']} ({baseline['meta']['created']}):")
+    for size, benchmarks in current["results"].items():
+        old_benchmarks = baseline["results"].get(size, {})
+        for name, result in benchmarks.items():
+            old = old_benchmarks.get(name)
+            if not old or not old["median_s"]:
+                continue
+            ratio = result["median_s"] / old["median_s"]
+            flag = "  SLOWER" if ratio > REGRESSION_THRESHOLD else ""
+            print(f"  {size:>10} {name:<24} {old['median_s'] * 1000:10.2f} ms -> {result['median_s'] * 1000:10.2f} ms  x{ratio:.2f}{flag}")
+
+def main():
+    from benchmarks.ledger import parse_size
+
+    parser = argparse.ArgumentParser(description="Benchmark the finance tracker's hot paths.")
+    parser.add_argument("--sizes", default="10k,100k,1M", help="Comma-separated ledger sizes, e.g. 10k,100k,1M,10M")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<revision>-<time>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        json.dump(run_worker(args.repeat), sys.stdout)
+        return
+
+    revision = _git_revision()
+    report = {
+        "meta": {
+            "revision": revision,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "storage": os.environ.get("FINANCE_TRACKER_STORAGE", "csv"),
+            "numpy": os.environ.get("FINANCE_TRACKER_NUMPY", ""),
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+    for size in args.sizes.split(","):
+        rows = parse_size(size)
+        print(f"{rows:,} rows", file=sys.stderr)
+        results = run_size(rows, args.repeat)
+        report["results"][str(rows)] = results
+        for name, result in results.items():
+            print(f"  {name:<24} median {result['median_s'] * 1000:10.2f} ms   min {result['min_s'] * 1000:10.2f} ms")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{revision}-{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            compare(json.load(file), report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Synthetic ledger generator for benchmarks.
+
+Writes a transactions file in the application's CSV format with a realistic
+mix: a monthly salary, occasional other income, and many expenses whose
+categories, amounts and frequencies follow everyday spending. Rows are mostly
+in date order with a share of back-dated entries, as a real ledger would be.
+
+    python benchmarks/ledger.py 1000000 /tmp/bench/database
+"""
+from datetime import date, timedelta
+import argparse
+import csv
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from features.storage.backends import FIELDNAMES
+from features.transactions.records import EXPENSE_CATEGORIES, INCOME_CATEGORIES
+
+# Relative frequency and (median, spread) of amounts in rupees for each category.
+EXPENSE_PROFILE = {
+    "Food": (40, 600, 0.8),
+    "Transport": (20, 250, 0.7),
+    "Shopping": (12, 2500, 1.0),
+    "Bills": (4, 4000, 0.5),
+    "Entertainment": (8, 1200, 0.9),
+    "Health": (4, 1800, 1.0),
+    "Other": (12, 800, 1.1),
+}
+INCOME_PROFILE = {
+    "Freelance": (50, 25000, 0.7),
+    "Business": (20, 40000, 0.8),
+    "Investment": (20, 8000, 1.0),
+    "Gift": (8, 5000, 0.9),
+    "Other": (2, 3000, 1.0),
+}
+SALARY_PAISA = 15000000
+DESCRIPTIONS = {
+    "Food": ["Groceries", "Lunch", "Dinner out", "Coffee", "Bakery"],
+    "Transport": ["Fuel", "Bus fare", "Ride share", "Parking"],
+    "Shopping": ["Clothes", "Electronics", "Home goods", "Books"],
+    "Bills": ["Electricity", "Internet", "Mobile", "Water", "Gas"],
+    "Entertainment": ["Cinema", "Streaming", "Concert", "Games"],
+    "Health": ["Pharmacy", "Doctor visit", "Gym"],
+    "Other": ["Misc", "Donation", "Repair"],
+}
+BACKDATED_SHARE = 0.05
+DEFAULT_BUDGETS = {"Food": 3000000, "Transport": 1000000, "Shopping": 2000000, "Bills": 1500000, "Entertainment": 800000}
+
+assert set(EXPENSE_PROFILE) == set(EXPENSE_CATEGORIES)
+assert set(INCOME_PROFILE) | {"Salary"} == set(INCOME_CATEGORIES)
+
+def _amount(rng, median, spread):
+    """Draws a log-normal amount in paisa around a median in rupees."""
+    return max(100, int(rng.lognormvariate(0, spread) * median * 100))
+
+def iter_transactions(rows, end=None, years=3, seed=42):
+    """Yields `rows` synthetic transaction dicts spanning `years` years up to `end`."""
+    rng = random.Random(seed)
+    end = end or date.today()
+    start = end - timedelta(days=365 * years)
+    span = (end - start).days + 1
+    expense_names = list(EXPENSE_PROFILE)
+    expense_weights = [EXPENSE_PROFILE[name][0] for name in expense_names]
+    income_names = list(INCOME_PROFILE)
+    income_weights = [INCOME_PROFILE[name][0] for name in income_names]
+    salary_every = max(1, rows // (years * 12))
+
+    for i in range(rows):
+        day = start + timedelta(days=i * span // rows)
+        if rng.random() < BACKDATED_SHARE:
+            day -= timedelta(days=rng.randint(1, 45))
+        if i % salary_every == 0:
+            yield {"date": day.isoformat(), "type": "income", "category": "Salary",
+                   "description": "Monthly salary", "amount_paisa": SALARY_PAISA}
+        elif rng.random() < 0.03:
+            category = rng.choices(income_names, income_weights)[0]
+            _, median, spread = INCOME_PROFILE[category]
+            yield {"date": day.isoformat(), "type": "income", "category": category,
+                   "description": f"{category} payment", "amount_paisa": _amount(rng, median, spread)}
+        else:
+            category = rng.choices(expense_names, expense_weights)[0]
+            _, median, spread = EXPENSE_PROFILE[category]
+            yield {"date": day.isoformat(), "type": "expense", "category": category,
+                   "description": rng.choice(DESCRIPTIONS[category]), "amount_paisa": _amount(rng, median, spread)}
+
+def write_ledger(database_dir, rows, seed=42, budgets=DEFAULT_BUDGETS):
+    """Writes transactions.txt and budgets.txt into `database_dir`; returns the ledger path."""
+    os.makedirs(database_dir, exist_ok=True)
+    path = os.path.join(database_dir, "transactions.txt")
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(iter_transactions(rows, seed=seed))
+    with open(os.path.join(database_dir, "budgets.txt"), 'w', newline='', encoding='utf-8') as file:
+        csv.writer(file).writerows(budgets.items())
+    return path
+
+def parse_size(text):
+    """Parses row counts like '10k', '1M' or '250000'."""
+    text = text.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * multiplier)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic transactions ledger.")
+    parser.add_argument("rows", type=parse_size)
+    parser.add_argument("database_dir")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    print(write_ledger(args.database_dir, args.rows, args.seed))
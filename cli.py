@@ -0,0 +1,245 @@
+"""Non-interactive entry point for scripts and cron jobs.
+
+Examples:
+    python cli.py add-expense --amount 12.50 --category Food --description Lunch
+    python cli.py balance --month 2025-11 --json
+    python cli.py list --month 2025-11 --type expense --limit 10
+    replay-webhooks | python cli.py ingest --batch-size 500 --interval 0.2
+    python cli.py serve --port 8765
+    python cli.py report --month 2025-11 --format md --output-dir reports
+    python cli.py shard --account household
+
+Each subcommand imports only the modules it needs, so one-shot commands do
+not pay for the interactive UI (questionary and the feature menus).
+"""
+import argparse
+import json
+import os
+import sys
+
+def _open_store():
+    """Opens the transaction store on the configured backend, replaying any crashed ingest.
+
+    The budget view is attached so writes from scripts keep it current too.
+    """
+    from features.storage.backends import get_backend
+    from features.storage.storage import TransactionStore
+    from features.storage import journal
+    from features.budgets.budget_view import BudgetView
+
+    os.makedirs("database", exist_ok=True)
+    store = TransactionStore(get_backend())
+    BudgetView(store).attach()
+    if journal.has_pending():
+        replayed = journal.recover(store)
+        if replayed:
+            print(f"Recovered {replayed} journaled transactions.", file=sys.stderr)
+    return store
+
+def _current_month():
+    from datetime import datetime
+    return datetime.now().strftime("%Y-%m")
+
+# --- Subcommands ---
+def cmd_add(args):
+    """Records one expense or income transaction."""
+    from features.transactions.records import new_transaction
+
+    try:
+        transaction = new_transaction(args.type, args.amount, args.category, args.description, args.date)
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    _open_store().append(transaction)
+    if args.json:
+        print(json.dumps(transaction))
+    else:
+        print(f"Added {args.type}: {transaction['amount_paisa'] / 100:,.2f} ({transaction['category']}) on {transaction['date']}")
+    return 0
+
+def cmd_balance(args):
+    """Prints income, expenses and net balance for one month."""
+    from features.storage.table import month_range
+
+    month = args.month or _current_month()
+    try:
+        month_range(month)
+    except ValueError:
+        print(f"error: invalid month {month!r}; use YYYY-MM.", file=sys.stderr)
+        return 1
+    rollup = _open_store().month(month)
+    balance = rollup.income - rollup.expenses
+    if args.json:
+        print(json.dumps({
+            "month": month,
+            "income_paisa": rollup.income,
+            "expenses_paisa": rollup.expenses,
+            "balance_paisa": balance,
+        }))
+    else:
+        print(f"Balance for {month}")
+        print(f"  Total Income:   {rollup.income / 100:>15,.2f}")
+        print(f"  Total Expenses: {rollup.expenses / 100:>15,.2f}")
+        print(f"  Net Balance:    {balance / 100:>15,.2f}")
+    return 0
+
+def cmd_list(args):
+    """Prints the newest transactions, optionally limited to one month and type."""
+    from features.storage.table import month_range
+
+    start = end = None
+    if args.month:
+        try:
+            start, end = month_range(args.month)
+        except ValueError:
+            print(f"error: invalid month {args.month!r}; use YYYY-MM.", file=sys.stderr)
+            return 1
+    table = _open_store().transactions()
+    indices = []
+    for i in table.newest_first(type=args.type, start=start, end=end):
+        if len(indices) == args.limit:
+            break
+        indices.append(i)
+
+    for t in table.rows(indices):
+        if args.json:
+            print(json.dumps(t))
+        else:
+            print(f"{t['date']}  {t['type']:<8} {t['category']:<14} {t['amount_paisa'] / 100:>12,.2f}  {t['description']}")
+    return 0
+
+def cmd_ingest(args):
+    """Ingests JSON-lines transactions through the write-ahead journal."""
+    from time import perf_counter
+    from features.storage.journal import IngestJournal
+
+    source = sys.stdin if args.file == "-" else open(args.file, 'r', encoding='utf-8')
+    journal = IngestJournal(
+        _open_store(), batch_size=args.batch_size, interval=args.interval, compact_every=args.compact_every
+    )
+    accepted = rejected = 0
+    started = perf_counter()
+    try:
+        journal.open()
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    try:
+        for line_number, line in enumerate(source, 1):
+            if not line.strip():
+                continue
+            try:
+                journal.submit(json.loads(line))
+                accepted += 1
+            except ValueError as error:
+                rejected += 1
+                print(f"line {line_number}: {error}", file=sys.stderr)
+    finally:
+        journal.close()
+        if source is not sys.stdin:
+            source.close()
+    seconds = perf_counter() - started
+    print(
+        f"Ingested {accepted:,} transactions ({rejected:,} rejected) in {seconds:.2f}s, "
+        f"{accepted / max(seconds, 1e-9):,.0f}/s with {journal.commits} group commits and {journal.compactions} compactions."
+    )
+    return 0
+
+def cmd_serve(args):
+    """Runs the local HTTP/JSON API until interrupted."""
+    _open_store()  # Replays any crashed ingest before serving.
+    from features.api.server import serve
+
+    serve(args.host, args.port)
+    return 0
+
+def cmd_report(args):
+    """Writes the balance, budget, spending, income, savings, health and alert reports."""
+    from features.storage.table import month_range
+
+    months = args.month or [_current_month()]
+    for month in months:
+        try:
+            month_range(month)
+        except ValueError:
+            print(f"error: invalid month {month!r}; use YYYY-MM.", file=sys.stderr)
+            return 1
+    _open_store()  # Replays any crashed ingest before reporting.
+    from features.reports.reports import write_reports
+
+    for path in write_reports(months, args.format or ["json", "md", "html"], args.output_dir):
+        print(path)
+    return 0
+
+def cmd_shard(args):
+    """Splits the CSV ledger into per-year shards for one account."""
+    from features.storage.backends import CsvBackend
+    from features.storage.shards import ShardedBackend, split_into_shards
+
+    try:
+        copied = split_into_shards(CsvBackend(), ShardedBackend(account=args.account))
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    print(
+        f"Copied {copied:,} transactions into per-year shards for account '{args.account}'. "
+        f"Set FINANCE_TRACKER_STORAGE=sharded to use them."
+    )
+    return 0
+
+# --- Argument parsing ---
+def build_parser():
+    parser = argparse.ArgumentParser(prog="finance", description="Personal Finance Tracker (non-interactive)")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    for type in ("expense", "income"):
+        add = subcommands.add_parser(f"add-{type}", help=f"Record an {type}")
+        add.add_argument("--amount", required=True, help="Amount, e.g. 12.50")
+        add.add_argument("--category", required=True, help="Category name" if type == "expense" else "Income source")
+        add.add_argument("--description", default="", help="Free-text description")
+        add.add_argument("--date", help="YYYY-MM-DD (default: today)")
+        add.add_argument("--json", action="store_true", help="Print the recorded transaction as JSON")
+        add.set_defaults(handler=cmd_add, type=type)
+
+    balance = subcommands.add_parser("balance", help="Show a month's income, expenses and balance")
+    balance.add_argument("--month", help="YYYY-MM (default: current month)")
+    balance.add_argument("--json", action="store_true", help="Print as JSON")
+    balance.set_defaults(handler=cmd_balance)
+
+    listing = subcommands.add_parser("list", help="List the newest transactions")
+    listing.add_argument("--month", help="YYYY-MM")
+    listing.add_argument("--type", choices=["expense", "income"])
+    listing.add_argument("--limit", type=int, default=20)
+    listing.add_argument("--json", action="store_true", help="Print one JSON object per line")
+    listing.set_defaults(handler=cmd_list)
+
+    ingest = subcommands.add_parser("ingest", help="Ingest JSON-lines transactions through the write-ahead journal")
+    ingest.add_argument("--file", default="-", help="JSON-lines file (default: stdin)")
+    ingest.add_argument("--batch-size", type=int, default=500, help="Entries per group commit")
+    ingest.add_argument("--interval", type=float, default=0.2, help="Seconds before an idle batch is committed")
+    ingest.add_argument("--compact-every", type=int, default=5000, help="Entries between compactions into the ledger")
+    ingest.set_defaults(handler=cmd_ingest)
+
+    server = subcommands.add_parser("serve", help="Run the local HTTP/JSON API")
+    server.add_argument("--host", default="127.0.0.1")
+    server.add_argument("--port", type=int, default=8765)
+    server.set_defaults(handler=cmd_serve)
+
+    report = subcommands.add_parser("report", help="Write all reports as JSON, Markdown and HTML files")
+    report.add_argument("--month", action="append", help="YYYY-MM; repeat for several (default: current month)")
+    report.add_argument("--format", action="append", choices=["json", "md", "html"], help="Repeat for several (default: all)")
+    report.add_argument("--output-dir", default="reports", help="Directory for the report files (default: reports)")
+    report.set_defaults(handler=cmd_report)
+
+    shard = subcommands.add_parser("shard", help="Split the CSV ledger into per-year shards for an account")
+    shard.add_argument("--account", default="main", help="Account the ledger belongs to (default: main)")
+    shard.set_defaults(handler=cmd_shard)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,41 +2,41 @@ from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from collections import Counter
-from datetime import datetime, timedelta
+from datetime import datetime
 import questionary
 
-from features.transactions.transactions import _get_transactions, EXPENSE_CATEGORIES
+from features.diagnostics.probes import timed
+from features.transactions.transactions import _store, _results, EXPENSE_CATEGORIES
 from features.budgets.budgets import _get_budgets
+from features.analytics.trends import WINDOWS, monthly_series, moving_average, linear_fit, project_month_end
 
 console = Console()
 
+@timed("analytics.monthly_data")
 def _get_monthly_data(month_str):
     """Helper to get income, expenses, and savings for a specific month."""
-    transactions = _get_transactions()
-    income = 0
-    expenses = 0
-    expenses_by_cat = Counter()
-
-    for t in transactions:
-        if t['date'].startswith(month_str):
-            if t['type'] == 'income':
-                income += t['amount_paisa']
-            else:
-                expenses += t['amount_paisa']
-                expenses_by_cat[t['category']] += t['amount_paisa']
-                
-    savings = income - expenses
-    return income, expenses, savings, expenses_by_cat
+    rollup = _store.month(month_str)
+    savings = rollup.income - rollup.expenses
+    return rollup.income, rollup.expenses, savings, Counter(rollup.expenses_by_cat)
 
+@_results.memoize("spending_summary")
+def _spending_summary(date_str):
+    """Returns a month's spending by category, largest first, and the month-end projection as of `date_str`."""
+    today = datetime.strptime(date_str, "%Y-%m-%d").date()
+    _, total_expenses, _, expenses_by_cat = _get_monthly_data(date_str[:7])
+    return {
+        "total_expenses": total_expenses,
+        "by_category": expenses_by_cat.most_common(),
+        "projection": project_month_end(_store, today),
+    }
+
+@timed("analytics.spending_analysis")
 def show_spending_analysis():
     """Displays a detailed analysis of spending for the current month."""
     console.print("\n[bold]────── Spending Analysis (Current Month) ──────[/bold]")
     
-    current_month_str = datetime.now().strftime("%Y-%m")
-    days_in_month = (datetime.now().replace(day=1) + timedelta(days=32)).day
-    today = datetime.now().day
-
-    _, total_expenses, _, expenses_by_cat = _get_monthly_data(current_month_str)
+    summary = _spending_summary(datetime.now().strftime("%Y-%m-%d"))
+    total_expenses = summary["total_expenses"]
 
     if total_expenses == 0:
         console.print("[yellow]No spending data for the current month.[/yellow]")
@@ -49,7 +49,7 @@ def show_spending_analysis():
     table.add_column(width=50)
     table.add_column(justify="right", style="bold")
 
-    sorted_expenses = expenses_by_cat.most_common()
+    sorted_expenses = summary["by_category"]
     
     for category, amount in sorted_expenses:
         percentage = (amount / total_expenses) * 100
@@ -66,80 +66,94 @@ def show_spending_analysis():
     top_3_str = ", ".join([f"{cat} ({amt/100:,.2f})" for cat, amt in top_3])
     console.print(f"🔥 [bold]Top Spending Categories:[/]	{top_3_str}")
 
-    # Burn Rate
-    avg_daily_expense = (total_expenses / today) / 100
+    # Burn Rate & Month-End Projection
+    projection = summary["projection"]
+    avg_daily_expense = (projection["spent"] / projection["day"]) / 100
     console.print(f"📈 [bold]Average Daily Expense (Burn Rate):[/]	{avg_daily_expense:,.2f}")
+    console.print(f"🔮 [bold]Projected Month-End Spend:[/]	{projection['projected']/100:,.2f} [dim]({projection['method']})[/dim]")
+    if projection["trend"] is not None:
+        console.print(f"📉 [bold]Six-Month Trend Estimate:[/]	{projection['trend']/100:,.2f}")
+
+def _income_summary(month_str):
+    """Returns a month's total income and income by source, largest first."""
+    rollup = _store.month(month_str)
+    return {"total_income": rollup.income, "by_source": rollup.income_by_cat.most_common()}
 
+@timed("analytics.income_analysis")
 def show_income_analysis():
     """Displays a detailed analysis of income for the current month."""
     console.print("\n[bold]────── Income Analysis (Current Month) ──────[/bold]")
-    current_month_str = datetime.now().strftime("%Y-%m")
-    
-    total_income, _, _, _ = _get_monthly_data(current_month_str)
+    summary = _income_summary(datetime.now().strftime("%Y-%m"))
+    total_income = summary["total_income"]
 
     if total_income == 0:
         console.print("[yellow]No income data for the current month.[/yellow]")
         return
-        
-    transactions = _get_transactions()
-    income_by_source = Counter()
-    for t in transactions:
-        if t['type'] == 'income' and t['date'].startswith(current_month_str):
-            income_by_source[t['category']] += t['amount_paisa']
 
     table = Table(title="Income by Source", show_header=True, header_style="bold magenta")
     table.add_column("Source", style="cyan")
     table.add_column("Amount", justify="right")
     table.add_column("Percentage", justify="right")
 
-    for source, amount in income_by_source.most_common():
+    for source, amount in summary["by_source"]:
         percentage = (amount / total_income) * 100
         table.add_row(source, f"{amount / 100:,.2f}", f"{percentage:.1f}%")
         
     console.print(table)
     console.print(f"\n[bold green]Total Income this month: {total_income / 100:,.2f}[/bold green]")
 
+def _savings_summary(month_str):
+    """Returns a month's savings and savings rate, and the savings of it and the two months before.
+
+    Each trend row carries the 3-month moving average ending that month.
+    """
+    series = monthly_series(_store, month_str, 5)
+    averages = moving_average(series["savings"], 3)
+    income, savings = series["income"][-1], series["savings"][-1]
+    return {
+        "income": income,
+        "savings": savings,
+        "savings_rate": (savings / income) * 100 if income > 0 else None,
+        "trend": [
+            {"month": series["months"][i], "savings": series["savings"][i], "average": averages[i]}
+            for i in range(4, 1, -1)
+        ],
+    }
+
+@timed("analytics.savings_analysis")
 def show_savings_analysis():
     """Displays savings rate and trend."""
     console.print("\n[bold]────── Savings Analysis ──────[/bold]")
     
-    today = datetime.now()
-    current_month_str = today.strftime("%Y-%m")
-    
-    total_income, _, savings, _ = _get_monthly_data(current_month_str)
+    summary = _savings_summary(datetime.now().strftime("%Y-%m"))
+    savings = summary["savings"]
 
-    if total_income == 0:
+    if summary["income"] == 0:
         console.print("[yellow]No income data for the current month to calculate savings rate.[/yellow]")
         return
 
-    savings_rate = (savings / total_income) * 100 if total_income > 0 else 0
+    savings_rate = summary["savings_rate"]
     
     console.print(f"💰 [bold]Current Month Savings:[/]	[green]{savings / 100:,.2f}[/green]")
-    console.print(f"📊 [bold]Current Month Savings Rate:[/]	[bold {{'green' if savings_rate > 0 else 'red'}} ]{savings_rate:.2f}%[/bold]")
+    console.print(f"📊 [bold]Current Month Savings Rate:[/]	[bold {'green' if savings_rate > 0 else 'red'}]{savings_rate:.2f}%[/]")
 
-    # Trend Analysis (Last 3 Months)
+    # Trend Analysis (Last 3 Months), by calendar month
     table = Table(title="Savings Trend (Last 3 Months)", show_header=True, header_style="bold magenta")
     table.add_column("Month", style="cyan")
     table.add_column("Savings", justify="right")
+    table.add_column("3-Month Average", justify="right")
     
-    for i in range(3):
-        month = today - timedelta(days=i*30)
-        month_str = month.strftime("%Y-%m")
-        income, expenses, _, _ = _get_monthly_data(month_str)
-        month_savings = income - expenses
-        table.add_row(month.strftime("%B %Y"), f"{month_savings/100:,.2f}")
+    for row in summary["trend"]:
+        month = datetime.strptime(row["month"], "%Y-%m")
+        table.add_row(month.strftime("%B %Y"), f"{row['savings']/100:,.2f}", f"{row['average']/100:,.2f}")
         
     console.print(table)
 
-def show_financial_health_score():
-    """Calculates and displays a financial health score."""
-    console.print("\n[bold]────── Financial Health Score ──────[/bold]")
-    
-    today = datetime.now()
-    current_month_str = today.strftime("%Y-%m")
-    
+@_results.memoize("health_score")
+def _health_score(month_str):
+    """Scores a month's finances out of 100; returns the total, its parts and recommendations."""
     # --- 1. Savings Rate Score (30 points) ---
-    total_income, total_expenses, savings, expenses_by_cat = _get_monthly_data(current_month_str)
+    total_income, total_expenses, savings, expenses_by_cat = _get_monthly_data(month_str)
     savings_rate = (savings / total_income) * 100 if total_income > 0 else -100 # Penalize if no income
     
     if savings_rate >= 20:
@@ -177,9 +191,31 @@ def show_financial_health_score():
     # --- 4. Debt Management (20 points) ---
     # Placeholder - assuming no debt data for now
     debt_score = 20
+
+    # Recommendations
+    recs = []
+    if savings_score < 20: recs.append("💡 Try to increase your savings rate to at least 10-20% of your income.")
+    if budget_score < 20 and not budgets: recs.append("💡 Set up monthly budgets to better track and control your spending.")
+    if budget_score < 20 and budgets: recs.append("💡 You're overspending in some categories. Review your budget vs. actuals.")
+    if inc_exp_score < 15: recs.append("💡 Your expenses are high compared to your income. Look for areas to cut back.")
+    if not recs: recs.append("🎉 You're doing great! Keep up the good work.")
+
+    return {
+        "total": int(savings_score + budget_score + inc_exp_score + debt_score),
+        "savings_rate": int(savings_score),
+        "budget_adherence": int(budget_score),
+        "income_vs_expenses": int(inc_exp_score),
+        "debt_management": int(debt_score),
+        "recommendations": recs,
+    }
+
+@timed("analytics.health_score")
+def show_financial_health_score():
+    """Calculates and displays a financial health score."""
+    console.print("\n[bold]────── Financial Health Score ──────[/bold]")
     
-    # --- Final Score ---
-    total_score = int(savings_score + budget_score + inc_exp_score + debt_score)
+    score = _health_score(datetime.now().strftime("%Y-%m"))
+    total_score = score["total"]
     
     score_color = "red"
     if total_score >= 80:
@@ -193,22 +229,97 @@ def show_financial_health_score():
     table = Table(title="Score Breakdown", show_header=False)
     table.add_column(style="cyan")
     table.add_column(justify="right", style="bold")
-    table.add_row("Savings Rate (>10%)", f"{int(savings_score)} / 30")
-    table.add_row("Budget Adherence", f"{int(budget_score)} / 25")
-    table.add_row("Income vs. Expenses", f"{int(inc_exp_score)} / 25")
-    table.add_row("Debt Management (Assumed)", f"{int(debt_score)} / 20")
+    table.add_row("Savings Rate (>10%)", f"{score['savings_rate']} / 30")
+    table.add_row("Budget Adherence", f"{score['budget_adherence']} / 25")
+    table.add_row("Income vs. Expenses", f"{score['income_vs_expenses']} / 25")
+    table.add_row("Debt Management (Assumed)", f"{score['debt_management']} / 20")
     console.print(table)
     
-    # Recommendations
-    recs = []
-    if savings_score < 20: recs.append("💡 Try to increase your savings rate to at least 10-20% of your income.")
-    if budget_score < 20 and not budgets: recs.append("💡 Set up monthly budgets to better track and control your spending.")
-    if budget_score < 20 and budgets: recs.append("💡 You're overspending in some categories. Review your budget vs. actuals.")
-    if inc_exp_score < 15: recs.append("💡 Your expenses are high compared to your income. Look for areas to cut back.")
-    if not recs: recs.append("🎉 You're doing great! Keep up the good work.")
-    
-    console.print(Panel("\n".join(recs), title="Recommendations", style="bold blue"))
+    console.print(Panel("\n".join(score["recommendations"]), title="Recommendations", style="bold blue"))
+
+
+def _trends(month_str, count):
+    """Returns `count` months of series up to `month_str`, expense moving averages, category trends and the forecast."""
+    series = monthly_series(_store, month_str, count)
+    window = 3 if count < 12 else 6 if count < 24 else 12
+    category_trends = []
+    if count >= 3:
+        # The current month is still in progress, so trends use completed months only.
+        ranked = sorted(series["by_category"].items(), key=lambda item: sum(item[1]), reverse=True)
+        category_trends = [
+            {"category": category, "total": sum(values), "slope": linear_fit(values[:-1])[0]}
+            for category, values in ranked
+        ]
+    return {
+        "series": series,
+        "window": window,
+        "averages": moving_average(series["expenses"], window),
+        "category_trends": category_trends,
+        "projection": project_month_end(_store),
+    }
+
+@timed("analytics.trends")
+def show_trends():
+    """Displays rolling income, expense and savings series with a month-end forecast."""
+    console.print("\n[bold]────── Trends & Forecast ──────[/bold]")
+    choice = questionary.select(
+        "Months to show:",
+        choices=[f"{window} months" for window in WINDOWS] + ["Custom"]
+    ).ask()
+    if choice is None: return
+    if choice == "Custom":
+        count_str = questionary.text(
+            "Number of months:",
+            validate=lambda text: (text.isdigit() and 0 < int(text) <= 120) or "Enter a number from 1 to 120."
+        ).ask()
+        if count_str is None: return
+        count = int(count_str)
+    else:
+        count = int(choice.split()[0])
+
+    trends = _trends(datetime.now().strftime("%Y-%m"), count)
+    series = trends["series"]
+    window = trends["window"]
+    averages = trends["averages"]
+
+    table = Table(title=f"Last {count} Months", show_header=True, header_style="bold magenta")
+    table.add_column("Month", style="cyan")
+    table.add_column("Income", justify="right")
+    table.add_column("Expenses", justify="right")
+    table.add_column("Savings", justify="right")
+    table.add_column(f"{window}-Month Avg Expenses", justify="right")
+    for i, month_str in enumerate(series["months"]):
+        savings = series["savings"][i]
+        table.add_row(
+            month_str,
+            f"{series['income'][i]/100:,.2f}",
+            f"{series['expenses'][i]/100:,.2f}",
+            f"[{'green' if savings >= 0 else 'red'}]{savings/100:,.2f}[/]",
+            f"{averages[i]/100:,.2f}" if averages[i] is not None else "-",
+        )
+    console.print(table)
+
+    # --- Category trends ---
+    if trends["category_trends"]:
+        category_table = Table(title="Category Trends (change per month)", show_header=True, header_style="bold magenta")
+        category_table.add_column("Category", style="cyan")
+        category_table.add_column("Total", justify="right")
+        category_table.add_column("Trend", justify="right")
+        for row in trends["category_trends"]:
+            color = "red" if row["slope"] > 0 else "green"
+            category_table.add_row(row["category"], f"{row['total']/100:,.2f}", f"[{color}]{row['slope']/100:+,.2f}[/{color}]")
+        console.print(category_table)
 
+    # --- Forecast ---
+    projection = trends["projection"]
+    console.print(Panel(
+        f"Spent so far: {projection['spent']/100:,.2f} (day {projection['day']} of {projection['days_in_month']})\n"
+        f"Run rate: {projection['run_rate']/100:,.2f}\n"
+        + (f"Seasonal: {projection['seasonal']/100:,.2f}\n" if projection["seasonal"] is not None else "")
+        + (f"Trend: {projection['trend']/100:,.2f}\n" if projection["trend"] is not None else "")
+        + f"[bold]Projected month-end spend: {projection['projected']/100:,.2f}[/bold] ({projection['method']})",
+        title="Month-End Forecast", style="bold blue", expand=False
+    ))
 
 def analytics_menu():
     """Displays the analytics submenu."""
@@ -216,6 +327,7 @@ def analytics_menu():
         "Spending Analysis": show_spending_analysis,
         "Income Analysis": show_income_analysis,
         "Savings Analysis": show_savings_analysis,
+        "Trends & Forecast": show_trends,
         "Financial Health Score": show_financial_health_score,
         "Back to Main Menu": None
     }
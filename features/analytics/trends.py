@@ -0,0 +1,114 @@
+import calendar
+from datetime import date
+
+from features.storage.table import month_range
+
+WINDOWS = (3, 6, 12)
+# Earlier months used to learn how spending is spread across a month.
+PROFILE_MONTHS = 6
+
+def shift_month(month_str, months):
+    """Returns the YYYY-MM month `months` calendar months after (or before) `month_str`."""
+    year, month = map(int, month_str.split("-"))
+    index = year * 12 + (month - 1) + months
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+def month_keys(end_month, count):
+    """Returns the `count` YYYY-MM months ending with `end_month`, oldest first."""
+    return [shift_month(end_month, offset) for offset in range(1 - count, 1)]
+
+def monthly_series(store, end_month, count):
+    """Returns income, expense, savings and per-category series for `count` months up to `end_month`.
+
+    Built from the store's month rollups, which cover every month in one pass
+    over the ledger, so a longer series costs a dictionary lookup per month.
+    """
+    months = month_keys(end_month, count)
+    rollups = [store.month(month_str) for month_str in months]
+    categories = sorted({category for rollup in rollups for category in rollup.expenses_by_cat})
+    return {
+        "months": months,
+        "income": [rollup.income for rollup in rollups],
+        "expenses": [rollup.expenses for rollup in rollups],
+        "savings": [rollup.income - rollup.expenses for rollup in rollups],
+        "by_category": {
+            category: [rollup.expenses_by_cat.get(category, 0) for rollup in rollups]
+            for category in categories
+        },
+    }
+
+def moving_average(values, window):
+    """Returns the trailing `window`-month average at each point; None until the window is full."""
+    averages = []
+    running = 0
+    for i, value in enumerate(values):
+        running += value
+        if i >= window:
+            running -= values[i - window]
+        averages.append(running / window if i >= window - 1 else None)
+    return averages
+
+def linear_fit(values):
+    """Returns the least-squares (slope, intercept) of values against their position."""
+    n = len(values)
+    if n < 2:
+        return 0.0, float(values[0]) if values else 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    variance = sum((x - mean_x) ** 2 for x in range(n))
+    slope = covariance / variance
+    return slope, mean_y - slope * mean_x
+
+def _spent_through(table, month_str, day):
+    """Expenses from the first of a month through `day` (clamped to the month's length)."""
+    start, end = month_range(month_str)
+    return table.total(type='expense', start=start, end=min(start + day, end))
+
+def project_month_end(store, today=None):
+    """Projects the current month's total spending from what has been spent so far.
+
+    Returns a dict with the spending to date and three estimates:
+    `run_rate` extrapolates the average daily spend to the whole month;
+    `seasonal` scales spending to date by the share of a month's spending
+    that usually falls by this day, learned from the previous PROFILE_MONTHS
+    months; `trend` extends the linear trend of the previous six full months,
+    adjusted by the same calendar month's deviation from its year's average
+    when a year of history exists. `projected` is the seasonal estimate when
+    enough history exists, else the run rate.
+    """
+    today = today or date.today()
+    month_str = today.strftime("%Y-%m")
+    days_in_month = calendar.monthrange(today.year, today.month)[1]
+    profile_months = month_keys(shift_month(month_str, -1), PROFILE_MONTHS)
+    table = store.window(month_range(profile_months[0])[0], month_range(month_str)[1])
+    spent = _spent_through(table, month_str, today.day)
+    run_rate = spent / today.day * days_in_month
+
+    shares = []
+    for previous in profile_months:
+        total = store.month(previous).expenses
+        if total > 0:
+            shares.append(_spent_through(table, previous, today.day) / total)
+    share = sum(shares) / len(shares) if len(shares) >= 3 else None
+    seasonal = spent / share if share else None
+
+    history = monthly_series(store, shift_month(month_str, -1), 12)["expenses"]
+    slope, intercept = linear_fit(history[-6:])
+    trend = max(0.0, intercept + slope * 6)
+    year_average = sum(history) / 12
+    last_year = store.month(shift_month(month_str, -12)).expenses
+    if all(history) and year_average > 0 and last_year > 0:
+        trend *= last_year / year_average
+
+    return {
+        "month": month_str,
+        "spent": spent,
+        "day": today.day,
+        "days_in_month": days_in_month,
+        "run_rate": run_rate,
+        "seasonal": seasonal,
+        "trend": trend if any(history[-6:]) else None,
+        "projected": max(seasonal, spent) if seasonal is not None else run_rate,
+        "method": "seasonal" if seasonal is not None else "run rate",
+    }
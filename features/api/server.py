@@ -0,0 +1,289 @@
+from datetime import datetime
+from http import HTTPStatus
+from itertools import islice
+from urllib.parse import parse_qs, urlsplit
+import asyncio
+import json
+import traceback
+
+from rich.text import Text
+
+from features.diagnostics.probes import timed
+from features.transactions.transactions import _store, _balance
+from features.transactions.records import new_transaction
+from features.budgets.budgets import _budget_status
+from features.analytics.analytics import _get_monthly_data, _health_score
+from features.smart_assistant.smart_assistant import _get_alerts
+from features.storage.table import date_to_ordinal, month_range
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1024 * 1024
+MAX_PAGE_SIZE = 1000
+BATCH_MAX_ROWS = 1000
+BATCH_MAX_DELAY = 0.005
+
+class ApiError(Exception):
+    """An error reported to the client with an HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _month(query):
+    """Returns the `month` query parameter, defaulting to the current month."""
+    month_str = query.get("month", datetime.now().strftime("%Y-%m"))
+    try:
+        datetime.strptime(month_str, "%Y-%m")
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid month {month_str!r}; use YYYY-MM.")
+    return month_str
+
+def _int(query, name, default, maximum=None):
+    try:
+        value = int(query.get(name, default))
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer.")
+    if value < 0:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must not be negative.")
+    return min(value, maximum) if maximum else value
+
+class _WriteBatcher:
+    """Coalesces concurrent add requests into one ledger append.
+
+    Rows submitted within BATCH_MAX_DELAY of each other, up to BATCH_MAX_ROWS,
+    are written with a single store.extend(): one lock, one write and one
+    fsync for the whole batch. Each request resumes once its batch is on disk.
+    """
+
+    def __init__(self, store, max_rows=BATCH_MAX_ROWS, max_delay=BATCH_MAX_DELAY):
+        self.store = store
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self._pending = []
+        self._rows = 0
+        self._timer = None
+
+    async def submit(self, transactions):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((transactions, future))
+        self._rows += len(transactions)
+        if self._rows >= self.max_rows:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self.flush)
+        return await future
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._rows = self._pending, [], 0
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch):
+        """Writes a batch and resolves its futures; if it fails before reaching the ledger, retries each request alone."""
+        before = self.store.backend.signature()
+        try:
+            with timed("api.write_batch") as probe:
+                self.store.extend(t for transactions, _ in batch for t in transactions)
+                probe.rows = sum(len(transactions) for transactions, _ in batch)
+        except Exception as e:
+            if len(batch) > 1 and self.store.backend.signature() == before:
+                # Nothing was written, so one bad request need not fail the others.
+                for request in batch:
+                    self._write([request])
+                return
+            # Every waiting request must be answered, whatever went wrong.
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(ApiError(HTTPStatus.INTERNAL_SERVER_ERROR, f"Write failed: {e}"))
+            return
+        for transactions, future in batch:
+            if not future.done():
+                future.set_result(len(transactions))
+
+class LedgerServer:
+    """Local HTTP/JSON API over the in-memory ledger.
+
+    Reads are answered from the shared TransactionStore, which keeps the
+    parsed ledger and month rollups in memory and reloads only when the
+    ledger changes on disk. All requests run on one event loop, so reads
+    never wait on each other; writes go through a _WriteBatcher.
+    """
+
+    def __init__(self, store=_store):
+        self.store = store
+        self.batcher = _WriteBatcher(store)
+        self.routes = {
+            ("GET", "/health"): self.get_health,
+            ("GET", "/transactions"): self.get_transactions,
+            ("POST", "/transactions"): self.post_transactions,
+            ("GET", "/balance"): self.get_balance,
+            ("GET", "/budgets"): self.get_budgets,
+            ("GET", "/analytics"): self.get_analytics,
+            ("GET", "/alerts"): self.get_alerts,
+        }
+
+    # --- Endpoints ---
+    async def get_health(self, query, body):
+        return HTTPStatus.OK, {"status": "ok", "transactions": len(self.store.transactions())}
+
+    async def get_transactions(self, query, body):
+        """Newest first; filter with month, from/to (inclusive dates) and type; page with limit/offset."""
+        start = end = None
+        try:
+            if "month" in query:
+                start, end = month_range(_month(query))
+            if "from" in query:
+                start = date_to_ordinal(query["from"])
+            if "to" in query:
+                end = date_to_ordinal(query["to"]) + 1
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Dates must be YYYY-MM-DD.")
+        type = query.get("type")
+        if type not in (None, "expense", "income"):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "type must be 'expense' or 'income'.")
+        limit = _int(query, "limit", 50, MAX_PAGE_SIZE)
+        offset = _int(query, "offset", 0)
+
+        # A bounded range reads only what it covers on indexed backends.
+        table = self.store.transactions() if start is None or end is None else self.store.window(start, end)
+        indices = list(islice(table.newest_first(type=type, start=start, end=end), offset, offset + limit + 1))
+        return HTTPStatus.OK, {
+            "transactions": list(table.rows(indices[:limit])),
+            "offset": offset,
+            "limit": limit,
+            "has_more": len(indices) > limit,
+        }
+
+    async def post_transactions(self, query, body):
+        """Adds one transaction object or a list of them: {type, amount, category, description?, date?}."""
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Body must be JSON.")
+        items = payload if isinstance(payload, list) else [payload]
+        transactions = []
+        for item in items:
+            if not isinstance(item, dict):
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Each transaction must be a JSON object.")
+            try:
+                transactions.append(new_transaction(
+                    item.get("type"),
+                    str(item.get("amount", "")),
+                    item.get("category"),
+                    item.get("description", ""),
+                    item.get("date"),
+                ))
+            except (ValueError, KeyError, TypeError, OverflowError) as e:
+                message = f"Unknown type {item.get('type')!r}" if isinstance(e, KeyError) else str(e)
+                raise ApiError(HTTPStatus.BAD_REQUEST, message)
+        if not transactions:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "No transactions given.")
+        added = await self.batcher.submit(transactions)
+        return HTTPStatus.CREATED, {"added": added, "transactions": transactions}
+
+    async def get_balance(self, query, body):
+        return HTTPStatus.OK, _balance(_month(query))
+
+    async def get_budgets(self, query, body):
+        month_str = _month(query)
+        return HTTPStatus.OK, {"month": month_str, "budgets": _budget_status(month_str)}
+
+    async def get_analytics(self, query, body):
+        month_str = _month(query)
+        income, expenses, savings, expenses_by_cat = _get_monthly_data(month_str)
+        return HTTPStatus.OK, {
+            "month": month_str,
+            "income_paisa": income,
+            "expenses_paisa": expenses,
+            "savings_paisa": savings,
+            "savings_rate": (savings / income) * 100 if income > 0 else None,
+            "expenses_by_category": dict(expenses_by_cat.most_common()),
+            "income_by_category": dict(self.store.month(month_str).income_by_cat.most_common()),
+            "health_score": _health_score(month_str),
+        }
+
+    async def get_alerts(self, query, body):
+        return HTTPStatus.OK, {"alerts": [Text.from_markup(alert).plain for alert in _get_alerts()]}
+
+    # --- HTTP ---
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        handler = self.routes.get((method, url.path.rstrip("/") or "/"))
+        if handler is None:
+            if any(path == url.path for _, path in self.routes):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"{method} is not supported on {url.path}."}
+            return HTTPStatus.NOT_FOUND, {"error": f"No endpoint {url.path}."}
+        try:
+            with timed(f"api.{method} {url.path}"):
+                return await handler(query, body)
+        except ApiError as e:
+            return e.status, {"error": str(e)}
+        except Exception:
+            traceback.print_exc()
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error."}
+
+    async def handle_connection(self, reader, writer):
+        """Serves HTTP/1.1 requests on one connection, keeping it alive between requests."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_BYTES:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Request body too large."}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length)
+                    status, payload = await self.dispatch(method, target, body)
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                data = json.dumps(payload).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass  # Malformed request or client went away.
+        finally:
+            writer.close()
+
+    async def serve_forever(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+        """Warms the caches, then serves until cancelled; calls ready(address) once listening."""
+        self.store.month(datetime.now().strftime("%Y-%m"))
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        if ready:
+            ready(server.sockets[0].getsockname())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.batcher.flush()
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Runs the API server in the foreground until interrupted."""
+    def ready(address):
+        print(f"Finance Tracker API listening on http://{address[0]}:{address[1]} (Ctrl+C to stop)")
+    try:
+        asyncio.run(LedgerServer().serve_forever(host, port, ready))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,222 @@
+from collections import Counter
+from datetime import datetime
+import json
+import os
+
+from features.diagnostics.probes import timed
+from features.storage.backends import DATABASE_DIR
+from features.storage.locking import file_lock, replace_atomically
+from features.storage.table import date_to_ordinal, ordinal_to_date
+
+BUDGET_VIEW_FILE = os.path.join(DATABASE_DIR, "budget_view.json")
+CROSSINGS_SUFFIX = ".crossings.jsonl"
+THRESHOLDS = (70, 80, 100)
+MAX_CROSSINGS = 500
+
+def _level(spent_paisa, budget_paisa):
+    """Returns the highest threshold in THRESHOLDS that spending has reached, or 0."""
+    if budget_paisa <= 0:
+        return 0
+    utilization = spent_paisa * 100 / budget_paisa
+    return max((threshold for threshold in THRESHOLDS if utilization >= threshold), default=0)
+
+def _jsonable(signature):
+    """Returns a backend signature in the form it takes after a JSON round trip."""
+    return list(signature) if isinstance(signature, tuple) else signature
+
+class BudgetView:
+    """Materialized per-month, per-category spending and budget-threshold crossings.
+
+    Stored in database/budget_view.json and updated by a TransactionStore
+    listener on every write, so budget screens and alerts read totals instead
+    of rolling up the ledger. A month's spending is taken from the store's
+    month rollup the first time it is needed (a single query on indexed
+    backends) and then kept up to date. The file records the ledger
+    signature it covers; if the ledger was changed by a process that did not
+    maintain the view, the cached months are dropped and each is re-read
+    when next needed. Budgets are compared on every read, so an edited
+    budget is re-checked immediately.
+
+    For each month and category the view remembers the highest threshold
+    (70, 80 or 100% of the budget) reached so far. When a write or a budget
+    change pushes spending past a higher one, a crossing is recorded with
+    the time it happened. Crossings are appended to a separate JSON-lines
+    log, so a write only rewrites the small view file.
+    """
+
+    def __init__(self, store, path=BUDGET_VIEW_FILE):
+        self.store = store
+        self.path = path
+        self.crossings_path = os.path.splitext(path)[0] + CROSSINGS_SUFFIX
+        self._state = None
+        self._new_crossings = []
+
+    def attach(self):
+        """Starts keeping the view up to date with the store's writes."""
+        self.store.add_listener(self._on_append)
+        return self
+
+    # --- State ---
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                state = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return None
+        state["crossings"] = self._read_crossings()[-MAX_CROSSINGS:]
+        return state
+
+    def _read_crossings(self):
+        crossings = []
+        try:
+            with open(self.crossings_path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        crossings.append(json.loads(line))
+                    except ValueError:
+                        continue  # A torn line from an interrupted append.
+        except FileNotFoundError:
+            pass
+        return crossings
+
+    def _save(self):
+        """Writes the view, without crossings, and appends the crossings recorded since the last save."""
+        state = {key: value for key, value in self._state.items() if key != "crossings"}
+        self._state["crossings"] = self._state["crossings"][-MAX_CROSSINGS:]
+        with file_lock(self.path):
+            replace_atomically(self.path, lambda file: json.dump(state, file), encoding='utf-8')
+            if self._new_crossings:
+                with open(self.crossings_path, 'a', encoding='utf-8') as file:
+                    file.writelines(json.dumps(c) + "\n" for c in self._new_crossings)
+                self._new_crossings = []
+                crossings = self._read_crossings()
+                if len(crossings) > 2 * MAX_CROSSINGS:
+                    replace_atomically(
+                        self.crossings_path,
+                        lambda file: file.writelines(json.dumps(c) + "\n" for c in crossings[-MAX_CROSSINGS:]),
+                        encoding='utf-8',
+                    )
+
+    def _current(self):
+        """Returns the view state matching the ledger, re-reading or resetting it if needed."""
+        signature = _jsonable(self.store.backend.signature())
+        if self._state is None or self._state["signature"] != signature:
+            self._state = self._read()
+            if self._state is None or self._state.get("signature") != signature:
+                self._reset(signature)
+        budgets = self.store.backend.read_budgets()
+        if budgets != self._state["budgets"]:
+            self._evaluate_month(datetime.now().strftime("%Y-%m"), budgets)
+            self._save()
+        return self._state
+
+    @timed("budget_view.reset")
+    def _reset(self, signature, touched_months=()):
+        """Drops cached spending after an unseen ledger change, keeping recorded levels and crossings.
+
+        Only the current month and `touched_months` are re-read and re-checked
+        now; any other month is re-read from the store when next needed.
+        """
+        previous = self._state or self._read() or {}
+        self._state = {
+            "signature": signature,
+            "spend": {},
+            "levels": previous.get("levels", {}),
+            "crossings": previous.get("crossings", []),
+            "budgets": {},
+        }
+        budgets = self.store.backend.read_budgets()
+        self._evaluate_month(datetime.now().strftime("%Y-%m"), budgets)
+        for month in touched_months:
+            self._evaluate_month(month, budgets)
+        self._save()
+
+    def _spend(self, month_str):
+        """Returns the {category: paisa} expense totals for a month, reading them from the store if not cached."""
+        spend = self._state["spend"].get(month_str)
+        if spend is None:
+            spend = self._state["spend"][month_str] = dict(self.store.month(month_str).expenses_by_cat)
+        return spend
+
+    # --- Updates ---
+    def _on_append(self, transactions, signature_before, signature_after):
+        """Store listener: folds freshly written rows into the view."""
+        state = self._current_before(signature_before)
+        if state is None:
+            months = {ordinal_to_date(date_to_ordinal(t['date']))[:7] for t in transactions if t['type'] != 'income'}
+            self._reset(_jsonable(signature_after), sorted(months))
+            return
+
+        touched = set()
+        for t in transactions:
+            if t['type'] == 'income':
+                continue
+            month = ordinal_to_date(date_to_ordinal(t['date']))[:7]
+            categories = state["spend"].get(month)
+            # Months not cached yet are read from the store, which already has these rows.
+            if categories is not None:
+                categories[t['category']] = categories.get(t['category'], 0) + int(t['amount_paisa'])
+            touched.add((month, t['category']))
+
+        if touched:
+            budgets = state["budgets"] = self.store.backend.read_budgets()
+            for month, category in touched:
+                self._evaluate(month, category, budgets)
+        state["signature"] = _jsonable(signature_after)
+        self._save()
+
+    def _current_before(self, signature_before):
+        """Returns the state if it covered the ledger exactly up to this write, else None."""
+        signature_before = _jsonable(signature_before)
+        if self._state is None or self._state["signature"] != signature_before:
+            self._state = self._read()
+        if self._state is None or self._state.get("signature") != signature_before:
+            return None
+        return self._state
+
+    def _evaluate_month(self, month_str, budgets):
+        """Re-checks every budgeted category of a month against `budgets`."""
+        self._state["budgets"] = budgets
+        categories = set(budgets) | set(self._state["levels"].get(month_str, {}))
+        for category in categories:
+            self._evaluate(month_str, category, budgets)
+
+    def _evaluate(self, month_str, category, budgets):
+        """Records any thresholds newly reached by a category's spending in a month."""
+        spent_paisa = self._spend(month_str).get(category, 0)
+        budget_paisa = budgets.get(category, 0)
+        level = _level(spent_paisa, budget_paisa)
+        levels = self._state["levels"].setdefault(month_str, {})
+        previous = levels.get(category, 0)
+        at = datetime.now().isoformat(timespec="seconds")
+        for threshold in THRESHOLDS:
+            if previous < threshold <= level:
+                crossing = {
+                    "month": month_str,
+                    "category": category,
+                    "threshold": threshold,
+                    "spent_paisa": spent_paisa,
+                    "budget_paisa": budget_paisa,
+                    "at": at,
+                }
+                self._state["crossings"].append(crossing)
+                self._new_crossings.append(crossing)
+        # A raised budget lowers the level, so the threshold can fire again later.
+        levels[category] = level
+
+    # --- Reads ---
+    def spent_by_category(self, month_str):
+        """Returns a Counter of expense totals by category for a YYYY-MM month."""
+        self._current()
+        return Counter(self._spend(month_str))
+
+    def level(self, month_str, category):
+        """Returns the highest threshold the category has reached this month, or 0."""
+        return self._current()["levels"].get(month_str, {}).get(category, 0)
+
+    def crossings(self, month_str=None):
+        """Returns recorded threshold crossings, oldest first, optionally for one month."""
+        crossings = self._current()["crossings"]
+        if month_str is None:
+            return list(crossings)
+        return [c for c in crossings if c["month"] == month_str]
@@ -3,39 +3,23 @@ from rich.console import Console
 from rich.table import Table
 from rich.progress_bar import ProgressBar
 from datetime import datetime
-import csv
-import os
 
-from features.transactions.transactions import _get_transactions
+from features.storage.backends import BUDGETS_FILE, get_backend
+from features.diagnostics.probes import timed
+from features.transactions.transactions import _budget_view
+from features.transactions.records import parse_amount
 
-BUDGETS_FILE = "database/budgets.txt"
 console = Console()
 
 EXPENSE_CATEGORIES = ["Food", "Transport", "Shopping", "Bills", "Entertainment", "Health", "Other"]
 
 def _get_budgets():
-    """Reads all budgets from the storage file."""
-    if not os.path.exists(BUDGETS_FILE):
-        return {}
-    
-    budgets = {}
-    with open(BUDGETS_FILE, mode='r', newline='', encoding='utf-8') as file:
-        try:
-            reader = csv.reader(file)
-            for row in reader:
-                if row:
-                    budgets[row[0]] = int(row[1])
-        except (csv.Error, ValueError, IndexError) as e:
-            console.print(f"[bold red]Error reading budgets file: {e}[/bold red]")
-            return {}
-    return budgets
+    """Reads all budgets from the storage backend."""
+    return get_backend().read_budgets()
 
 def _save_budgets(budgets):
-    """Saves all budgets to the storage file."""
-    with open(BUDGETS_FILE, mode='w', newline='', encoding='utf-8') as file:
-        writer = csv.writer(file)
-        for category, amount_paisa in budgets.items():
-            writer.writerow([category, amount_paisa])
+    """Saves all budgets to the storage backend."""
+    get_backend().save_budgets(budgets)
 
 def set_budget():
     """Sets a monthly budget for a specific category."""
@@ -53,9 +37,10 @@ def set_budget():
         ).ask()
         if amount_str is None: return
 
-        amount_paisa = int(float(amount_str) * 100)
-        if amount_paisa <= 0:
-            console.print("[bold red]Budget amount must be positive.[/bold red]")
+        try:
+            amount_paisa = parse_amount(amount_str)
+        except ValueError as e:
+            console.print(f"[bold red]{e}[/bold red]")
             return
 
         budgets = _get_budgets()
@@ -67,23 +52,40 @@ def set_budget():
     except (KeyboardInterrupt, TypeError):
         console.print("\n[bold yellow]Operation cancelled.[/bold yellow]")
 
+def _budget_status(month_str):
+    """Returns budget, spending, utilization and status for each budgeted category in a month."""
+    budgets = _get_budgets()
+    spent_by_category = _budget_view.spent_by_category(month_str)
+    rows = []
+    for category, budget_paisa in budgets.items():
+        spent_paisa = spent_by_category.get(category, 0)
+        utilization = (spent_paisa / budget_paisa) * 100 if budget_paisa > 0 else 0
+        if utilization >= 100:
+            status = "OVER"
+        elif utilization >= 70:
+            status = "WARN"
+        else:
+            status = "OK"
+        rows.append({
+            "category": category,
+            "budget_paisa": budget_paisa,
+            "spent_paisa": spent_paisa,
+            "remaining_paisa": budget_paisa - spent_paisa,
+            "utilization": utilization,
+            "status": status,
+        })
+    return rows
+
+@timed("budgets.view_budgets")
 def view_budgets():
     """Displays budget status against actual spending for the current month."""
     console.print("\n[bold]────── Budget vs. Spending (Current Month) ──────[/bold]")
-    budgets = _get_budgets()
-    if not budgets:
+    current_month = datetime.now().strftime("%Y-%m")
+    status_rows = _budget_status(current_month)
+    if not status_rows:
         console.print("[bold yellow]No budgets set. Use 'Set Budget' to create one.[/bold yellow]")
         return
 
-    transactions = _get_transactions()
-    current_month = datetime.now().strftime("%Y-%m")
-    
-    spent_by_category = {cat: 0 for cat in EXPENSE_CATEGORIES}
-    for t in transactions:
-        if t['type'] == 'expense' and t['date'].startswith(current_month):
-            if t['category'] in spent_by_category:
-                spent_by_category[t['category']] += t['amount_paisa']
-
     table = Table(title="Monthly Budget Status", show_header=True, header_style="bold magenta")
     table.add_column("Category", style="cyan")
     table.add_column("Budget", justify="right")
@@ -94,11 +96,13 @@ def view_budgets():
 
     total_budget = 0
     total_spent = 0
+    status_styles = {"OVER": "bold red", "WARN": "yellow", "OK": "green"}
 
-    for category, budget_paisa in budgets.items():
-        spent_paisa = spent_by_category.get(category, 0)
-        remaining_paisa = budget_paisa - spent_paisa
-        utilization = (spent_paisa / budget_paisa) * 100 if budget_paisa > 0 else 0
+    for row in status_rows:
+        budget_paisa = row["budget_paisa"]
+        spent_paisa = row["spent_paisa"]
+        remaining_paisa = row["remaining_paisa"]
+        utilization = row["utilization"]
 
         total_budget += budget_paisa
         total_spent += spent_paisa
@@ -107,14 +111,8 @@ def view_budgets():
         spent_str = f"{spent_paisa / 100:,.2f}"
         remaining_str = f"{remaining_paisa / 100:,.2f}"
         
-        status_style = "green"
-        status_text = "OK"
-        if utilization >= 100:
-            status_style = "bold red"
-            status_text = "OVER"
-        elif utilization >= 70:
-            status_style = "yellow"
-            status_text = "WARN"
+        status_text = row["status"]
+        status_style = status_styles[status_text]
 
         progress_color = "red" if utilization > 100 else "yellow" if utilization > 70 else "green"
         
@@ -125,7 +123,7 @@ def view_budgets():
 
 
         table.add_row(
-            category,
+            row["category"],
             budget_str,
             f"[{'red' if spent_paisa > 0 else 'white'}]{spent_str}[/]",
             f"[{'green' if remaining_paisa >= 0 else 'red'}]{remaining_str}[/]",
@@ -151,3 +149,13 @@ def view_budgets():
 
     if total_spent > total_budget:
         console.print("[bold red]🚨 You are over your total monthly budget![/bold red]")
+
+    # --- Threshold crossings ---
+    crossings = _budget_view.crossings(current_month)
+    if crossings:
+        console.print("\n[bold]Thresholds reached this month:[/bold]")
+        for crossing in crossings[-5:]:
+            console.print(
+                f"  {crossing['at'].replace('T', ' ')}  '{crossing['category']}' reached {crossing['threshold']}% "
+                f"({crossing['spent_paisa'] / 100:,.2f} of {crossing['budget_paisa'] / 100:,.2f})"
+            )
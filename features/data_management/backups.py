@@ -0,0 +1,237 @@
+from datetime import datetime
+import gzip
+import hashlib
+import json
+import os
+
+# Files that only ever grow at the end; backups store just the new bytes.
+APPEND_ONLY_FILES = {"transactions.txt"}
+# Subdirectories whose .txt files are append-only ledger shards.
+SHARD_DIRS = ("shards/",)
+# Derived or temporary files that are rebuilt on demand and never backed up.
+SKIPPED_SUFFIXES = (".fp", ".cache.json", ".lock", ".wal", ".tmp", ".import-progress", "-journal", "-wal", "-shm")
+TAIL_SIZE = 64 * 1024
+KEEP_SNAPSHOTS = 10
+
+def _is_append_only(name):
+    return name in APPEND_ONLY_FILES or (name.startswith(SHARD_DIRS) and name.endswith(".txt"))
+
+def _database_files(database_dir):
+    """Yields (name, path) for every file to back up, with names relative to the directory."""
+    for directory, subdirectories, names in os.walk(database_dir):
+        subdirectories.sort()
+        for name in sorted(names):
+            path = os.path.join(directory, name)
+            if not name.endswith(SKIPPED_SUFFIXES):
+                yield os.path.relpath(path, database_dir).replace(os.sep, "/"), path
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+def _tail_sha256(path, size):
+    """Checksums the last TAIL_SIZE bytes before `size`, to spot rewritten files cheaply."""
+    with open(path, 'rb') as file:
+        start = max(0, size - TAIL_SIZE)
+        file.seek(start)
+        return _sha256(file.read(size - start))
+
+class BackupRepository:
+    """Incremental, checksummed backups of the database directory.
+
+    A manifest lists every snapshot. Append-only files (the ledger) store only
+    the bytes added since the previous snapshot, chained back to a full base;
+    other files are stored whole, and only when their content changed. Every
+    stored chunk is gzip-compressed and carries a SHA-256 checksum.
+    """
+
+    def __init__(self, root, database_dir):
+        self.root = root
+        self.database_dir = database_dir
+        self.chunks_dir = os.path.join(root, "chunks")
+        self.manifest_path = os.path.join(root, "manifest.json")
+        self._bytes_stored = 0
+
+    # --- Manifest ---
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {"snapshots": []}
+
+    def _save_manifest(self, manifest):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def snapshots(self):
+        """Returns the snapshot entries, oldest first."""
+        return self.load_manifest()["snapshots"]
+
+    # --- Chunks ---
+    def _write_chunk(self, name, data):
+        path = os.path.join("chunks", name.replace("/", "_") + ".gz")
+        self._bytes_stored += len(data)
+        with gzip.open(os.path.join(self.root, path), 'wb') as file:
+            file.write(data)
+        return path
+
+    def _read_chunk(self, entry):
+        with gzip.open(os.path.join(self.root, entry["chunk"]), 'rb') as file:
+            data = file.read()
+        if _sha256(data) != entry["sha256"]:
+            raise ValueError(f"Checksum mismatch in backup chunk {entry['chunk']}")
+        return data
+
+    # --- Snapshots ---
+    def create_snapshot(self):
+        """Backs up every changed byte in the database directory; returns the snapshot."""
+        os.makedirs(self.chunks_dir, exist_ok=True)
+        manifest = self.load_manifest()
+        previous = manifest["snapshots"][-1]["files"] if manifest["snapshots"] else {}
+        previous_id = manifest["snapshots"][-1]["id"] if manifest["snapshots"] else None
+        snapshot_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        files = {}
+        self._bytes_stored = 0
+
+        for name, path in _database_files(self.database_dir):
+            if _is_append_only(name):
+                files[name] = self._snapshot_append_only(snapshot_id, name, path, previous_id, previous.get(name))
+            else:
+                files[name] = self._snapshot_whole(snapshot_id, name, path, previous.get(name))
+
+        snapshot = {
+            "id": snapshot_id,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "stored_bytes": self._bytes_stored,
+            "files": files,
+        }
+        manifest["snapshots"].append(snapshot)
+        self._save_manifest(manifest)
+        return snapshot
+
+    def _snapshot_append_only(self, snapshot_id, name, path, previous_id, previous):
+        size = os.path.getsize(path)
+        offset = 0
+        parent = None
+        if (
+            previous is not None
+            and previous["mode"] == "append"
+            and size >= previous["size"]
+            and _tail_sha256(path, previous["size"]) == previous["tail_sha256"]
+        ):
+            offset = previous["size"]
+            parent = previous_id
+        # Otherwise this is the first backup or the file was rewritten: start a new base.
+
+        with open(path, 'rb') as file:
+            file.seek(offset)
+            data = file.read(size - offset)
+
+        entry = {
+            "mode": "append",
+            "parent": parent,
+            "offset": offset,
+            "size": size,
+            "tail_sha256": _tail_sha256(path, size),
+            "chunk": None,
+            "sha256": _sha256(data),
+        }
+        if data or parent is None:
+            entry["chunk"] = self._write_chunk(f"{snapshot_id}-{name}", data)
+        return entry
+
+    def _snapshot_whole(self, snapshot_id, name, path, previous):
+        with open(path, 'rb') as file:
+            data = file.read()
+        checksum = _sha256(data)
+        if previous is not None and previous["mode"] == "whole" and previous["sha256"] == checksum:
+            return previous  # Unchanged; reuse the earlier chunk.
+        return {
+            "mode": "whole",
+            "size": len(data),
+            "chunk": self._write_chunk(f"{snapshot_id}-{name}", data),
+            "sha256": checksum,
+        }
+
+    # --- Restore ---
+    def _materialize(self, name, entry, by_id):
+        """Rebuilds a file's full content from its snapshot entry, verifying every chunk."""
+        if entry["mode"] == "whole":
+            return self._read_chunk(entry)
+
+        chain = [entry]
+        while chain[-1]["parent"] is not None:
+            chain.append(by_id[chain[-1]["parent"]]["files"][name])
+        data = b"".join(self._read_chunk(e) if e["chunk"] else b"" for e in reversed(chain))
+        if len(data) != entry["size"]:
+            raise ValueError("Backup chain is incomplete: restored size does not match the manifest.")
+        return data
+
+    def restore(self, snapshot_id, target_dir=None):
+        """Rewrites the database files as they were at the given snapshot."""
+        target_dir = target_dir or self.database_dir
+        by_id = {s["id"]: s for s in self.snapshots()}
+        snapshot = by_id.get(snapshot_id)
+        if snapshot is None:
+            raise ValueError(f"No backup snapshot named {snapshot_id}")
+
+        contents = {name: self._materialize(name, entry, by_id) for name, entry in snapshot["files"].items()}
+        os.makedirs(target_dir, exist_ok=True)
+        for name, data in contents.items():
+            path = os.path.join(target_dir, *name.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + ".tmp", 'wb') as file:
+                file.write(data)
+            os.replace(path + ".tmp", path)
+        # Derived indexes describe the old files; let them rebuild.
+        for directory, _, names in os.walk(target_dir):
+            for name in names:
+                if name.endswith(".fp"):
+                    os.remove(os.path.join(directory, name))
+        return snapshot
+
+    # --- Retention ---
+    def compact(self, keep=KEEP_SNAPSHOTS):
+        """Drops all but the newest `keep` snapshots and deletes unreferenced chunks.
+
+        The oldest surviving snapshot is rewritten as a self-contained base, so
+        the chains of later snapshots no longer depend on deleted ones.
+        Returns the number of snapshots removed.
+        """
+        manifest = self.load_manifest()
+        snapshots = manifest["snapshots"]
+        if len(snapshots) <= keep:
+            return 0
+
+        removed = len(snapshots) - keep
+        by_id = {s["id"]: s for s in snapshots}
+        kept = snapshots[removed:]
+        base = kept[0]
+        for name, entry in base["files"].items():
+            if entry["mode"] == "append" and entry["parent"] is not None:
+                data = self._materialize(name, entry, by_id)
+                base["files"][name] = dict(
+                    entry,
+                    parent=None,
+                    offset=0,
+                    sha256=_sha256(data),
+                    chunk=self._write_chunk(f"{base['id']}-{name}-base", data),
+                )
+
+        manifest["snapshots"] = kept
+        self._save_manifest(manifest)
+        self._delete_unreferenced_chunks(kept)
+        return removed
+
+    def _delete_unreferenced_chunks(self, snapshots):
+        referenced = {
+            os.path.normpath(entry["chunk"])
+            for snapshot in snapshots
+            for entry in snapshot["files"].values()
+            if entry["chunk"]
+        }
+        for name in os.listdir(self.chunks_dir):
+            if os.path.normpath(os.path.join("chunks", name)) not in referenced:
+                os.remove(os.path.join(self.chunks_dir, name))
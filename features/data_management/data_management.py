@@ -1,59 +1,92 @@
 import questionary
 from rich.console import Console
+from rich.panel import Panel
+from rich.progress import Progress, TextColumn, BarColumn, DownloadColumn, TimeRemainingColumn
+from rich.table import Table
+from concurrent.futures import ProcessPoolExecutor
 import os
 import csv
-import json
-import shutil
+import time
 from datetime import datetime
 
-from features.transactions.transactions import _get_transactions, _write_transaction
+from features.diagnostics.probes import timed
+from features.transactions.transactions import _get_transactions, _write_transactions, _store, EXPENSE_CATEGORIES, INCOME_CATEGORIES
+from features.data_management.backups import BackupRepository, KEEP_SNAPSHOTS
+from features.data_management.exporter import EXPORT_FORMATS, export_rows
+from features.data_management.importer import (
+    ImportCheckpoint, expand_sources, iter_chunks, iter_csv_records, parse_file, read_header, validate_record
+)
+from features.storage.backends import CsvBackend, SqliteBackend, SQLITE_FILE, migrate_csv_to_sqlite
+from features.storage.fingerprints import fingerprint
+from features.storage.table import check_amount, date_to_ordinal
 
 console = Console()
 DATABASE_DIR = "database"
 EXPORTS_DIR = "exports"
 BACKUPS_DIR = "backups"
-TRANSACTIONS_FILE = os.path.join(DATABASE_DIR, "transactions.txt")
 
 def _ensure_dirs():
     """Ensure that directories for exports and backups exist."""
     os.makedirs(EXPORTS_DIR, exist_ok=True)
     os.makedirs(BACKUPS_DIR, exist_ok=True)
 
-def export_transactions_csv():
-    """Exports all transactions to a CSV file."""
+def _export_transactions(format_name, start=None, end=None, category=None, compress=False):
+    """Streams the matching transactions to a timestamped file in EXPORTS_DIR."""
     _ensure_dirs()
     transactions = _get_transactions()
-    if not transactions:
+    indices = transactions.indices(category=category, start=start, end=end)
+    if not indices:
         console.print("[yellow]No transactions to export.[/yellow]")
         return
-        
+
+    extension, _ = EXPORT_FORMATS[format_name]
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = os.path.join(EXPORTS_DIR, f"transactions_{timestamp}.csv")
-    
-    with open(filename, 'w', newline='', encoding='utf-8') as file:
-        writer = csv.DictWriter(file, fieldnames=transactions[0].keys())
-        writer.writeheader()
-        writer.writerows(transactions)
-        
-    console.print(f"[green]✔ Successfully exported {len(transactions)} transactions to {filename}[/green]")
+    filename = os.path.join(EXPORTS_DIR, f"transactions_{timestamp}{extension}{'.gz' if compress else ''}")
+
+    with timed(f"data_management.export_{format_name.lower().replace(' ', '_')}") as probe:
+        count = export_rows(transactions.rows(indices), filename, format_name, compress)
+        probe.rows = count
+    console.print(f"[green]✔ Successfully exported {count} transactions to {filename}[/green]")
+
+def export_transactions_csv():
+    """Exports all transactions to a CSV file."""
+    _export_transactions("CSV")
 
 def export_transactions_json():
     """Exports all transactions to a JSON file."""
-    _ensure_dirs()
-    transactions = _get_transactions()
-    if not transactions:
-        console.print("[yellow]No transactions to export.[/yellow]")
-        return
+    _export_transactions("JSON")
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = os.path.join(EXPORTS_DIR, f"transactions_{timestamp}.json")
+def export_transactions_filtered():
+    """Exports transactions filtered by date range and category, optionally gzipped."""
+    console.print("\n[bold]────── Custom Export ──────[/bold]")
+    try:
+        format_name = questionary.select("Export format:", choices=list(EXPORT_FORMATS)).ask()
+        if format_name is None: return
 
-    with open(filename, 'w', encoding='utf-8') as file:
-        json.dump(transactions, file, indent=4)
-        
-    console.print(f"[green]✔ Successfully exported {len(transactions)} transactions to {filename}[/green]")
+        from_str = questionary.text("From date (YYYY-MM-DD), or leave empty for no limit:").ask()
+        if from_str is None: return
+        to_str = questionary.text("To date (YYYY-MM-DD, inclusive), or leave empty for no limit:").ask()
+        if to_str is None: return
+        start = date_to_ordinal(from_str) if from_str else None
+        end = date_to_ordinal(to_str) + 1 if to_str else None
 
+        category = questionary.select(
+            "Category:",
+            choices=["All"] + EXPENSE_CATEGORIES + [c for c in INCOME_CATEGORIES if c not in EXPENSE_CATEGORIES]
+        ).ask()
+        if category is None: return
+
+        compress = questionary.confirm("Compress with gzip?", default=False).ask()
+        if compress is None: return
+
+        _export_transactions(format_name, start, end, None if category == "All" else category, compress)
+    except KeyboardInterrupt:
+        console.print("\n[bold yellow]Operation cancelled.[/bold yellow]")
+    except ValueError:
+        console.print("[bold red]Invalid date format. Please use YYYY-MM-DD.[/bold red]")
 
+
+@timed("data_management.import_csv")
 def import_transactions_csv():
     """Imports transactions from a user-specified CSV file."""
     console.print("\n[bold]⚠️ Transaction Import[/bold]")
@@ -75,22 +108,17 @@ def import_transactions_csv():
             console.print("[red]Invalid CSV format or missing headers.[/red]")
             return
             
-        # Deduplication
-        existing_transactions = _get_transactions()
-        existing_ids = {f"{t['date']}-{t['type']}-{t['amount_paisa']}-{t['description']}" for t in existing_transactions}
-        
+        # Validation and deduplication
         transactions_to_add = []
         for t in new_transactions:
-            t_id = f"{t['date']}-{t['type']}-{t['amount_paisa']}-{t['description']}"
-            if t_id not in existing_ids:
-                # Further validation
-                try:
-                    t['amount_paisa'] = int(t['amount_paisa'])
-                    datetime.strptime(t['date'], "%Y-%m-%d")
-                    transactions_to_add.append(t)
-                except (ValueError, TypeError):
-                    console.print(f"[yellow]Skipping invalid record: {t}[/yellow]")
-                    continue
+            try:
+                t['amount_paisa'] = check_amount(int(t['amount_paisa']))
+                date_to_ordinal(t['date'])
+            except (ValueError, TypeError):
+                console.print(f"[yellow]Skipping invalid record: {t}[/yellow]")
+                continue
+            if not _store.backend.contains(t):
+                transactions_to_add.append(t)
 
         if not transactions_to_add:
             console.print("[yellow]No new, unique transactions to import.[/yellow]")
@@ -100,9 +128,8 @@ def import_transactions_csv():
         confirm = questionary.confirm("Do you want to import these transactions?").ask()
 
         if confirm:
-            for t in transactions_to_add:
-                _write_transaction(t)
-            console.print(f"[green]✔ Successfully imported {len(transactions_to_add)} transactions.[/green]")
+            imported = _write_transactions(transactions_to_add, skip_existing=True)
+            console.print(f"[green]✔ Successfully imported {imported} transactions.[/green]")
         else:
             console.print("[yellow]Import cancelled.[/yellow]")
 
@@ -110,33 +137,248 @@ def import_transactions_csv():
         console.print(f"[bold red]An error occurred during import: {e}[/bold red]")
 
 
+@timed("data_management.import_streaming")
+def import_transactions_streaming():
+    """Imports a very large CSV file in bounded chunks, resumable after interruption."""
+    console.print("\n[bold]⚠️ Streaming Transaction Import[/bold]")
+    console.print("The CSV must have headers: date,type,category,description,amount_paisa")
+
+    try:
+        filepath = questionary.text("Enter the full path to the CSV file:").ask()
+        if not filepath or not os.path.exists(filepath):
+            console.print("[red]File not found or path is empty.[/red]")
+            return
+
+        checkpoint = ImportCheckpoint(filepath)
+        total_bytes = os.path.getsize(filepath)
+        with open(filepath, 'rb') as file:
+            columns, offset = read_header(file)
+            if columns is None:
+                console.print("[red]Invalid CSV format or missing headers.[/red]")
+                return
+
+            imported = rejected = duplicates = 0
+            progress = checkpoint.load()
+            if progress and progress['offset'] > offset:
+                resume = questionary.confirm(
+                    f"Resume the previous import from byte {progress['offset']:,} of {total_bytes:,}?"
+                ).ask()
+                if resume is None: return
+                if resume:
+                    offset = progress['offset']
+                    imported, rejected, duplicates = progress['imported'], progress['rejected'], progress['duplicates']
+
+            confirm = questionary.confirm(
+                f"Stream {(total_bytes - offset) / 1_000_000:,.1f} MB from this file into the ledger?"
+            ).ask()
+            if not confirm:
+                console.print("[yellow]Import cancelled.[/yellow]")
+                return
+
+            with Progress(
+                TextColumn("[bold]{task.description}"),
+                BarColumn(),
+                DownloadColumn(),
+                TimeRemainingColumn(),
+                console=console,
+            ) as bar:
+                task = bar.add_task("Importing", total=total_bytes, completed=offset)
+                for chunk in iter_chunks(iter_csv_records(file, offset)):
+                    transactions_to_add = []
+                    for fields, _ in chunk:
+                        if fields == []:
+                            continue  # Blank line
+                        t = validate_record(fields, columns)
+                        if t is None:
+                            rejected += 1
+                        elif _store.backend.contains(t):
+                            duplicates += 1
+                        else:
+                            transactions_to_add.append(t)
+
+                    # Another importer may have added some of these since the check above.
+                    written = _write_transactions(transactions_to_add, skip_existing=True)
+                    imported += written
+                    duplicates += len(transactions_to_add) - written
+                    offset = chunk[-1][1]
+                    checkpoint.save(offset, imported, rejected, duplicates)
+                    bar.update(
+                        task,
+                        completed=offset,
+                        description=f"Imported {imported:,} · rejected [red]{rejected:,}[/red] · duplicates {duplicates:,}",
+                    )
+
+        checkpoint.clear()
+        console.print(
+            f"[green]✔ Imported {imported:,} transactions[/green] "
+            f"([yellow]{rejected:,} rejected[/yellow], {duplicates:,} duplicates skipped)."
+        )
+
+    except KeyboardInterrupt:
+        console.print("\n[bold yellow]Import interrupted. Run it again on the same file to resume.[/bold yellow]")
+    except Exception as e:
+        console.print(f"[bold red]An error occurred during import: {e}[/bold red]")
+
+
+@timed("data_management.import_batch")
+def import_transactions_batch():
+    """Imports every CSV file in a directory or glob, parsing them in parallel."""
+    console.print("\n[bold]⚠️ Batch Transaction Import[/bold]")
+    console.print("Each CSV must have headers: date,type,category,description,amount_paisa")
+
+    try:
+        pattern = questionary.text("Enter a directory or glob pattern (e.g. statements/*.csv):").ask()
+        if not pattern: return
+
+        sources = expand_sources(pattern)
+        if not sources:
+            console.print("[red]No CSV files matched.[/red]")
+            return
+
+        started = time.perf_counter()
+        with console.status(f"Parsing {len(sources)} files..."):
+            with ProcessPoolExecutor() as executor:
+                # map() yields results in input order, so the merge below is
+                # deterministic no matter which worker finishes first.
+                results = list(executor.map(parse_file, sources))
+
+        table = Table(title="Per-file Import Summary", show_header=True, header_style="bold magenta")
+        table.add_column("File", style="cyan")
+        table.add_column("Valid", justify="right")
+        table.add_column("Rejected", justify="right")
+        table.add_column("Duplicates", justify="right")
+        table.add_column("Rows/s", justify="right")
+        table.add_column("MB/s", justify="right")
+
+        # Single writer: dedupe against the ledger and across the batch itself.
+        transactions_to_add = []
+        seen = set()
+        for result in results:
+            name = os.path.basename(result['path'])
+            if 'error' in result:
+                table.add_row(name, "-", "-", "-", "-", f"[red]{result['error']}[/red]")
+                continue
+
+            duplicates = 0
+            for t in result['transactions']:
+                t_fingerprint = fingerprint(t)
+                if t_fingerprint in seen or _store.backend.contains(t):
+                    duplicates += 1
+                    continue
+                seen.add(t_fingerprint)
+                transactions_to_add.append(t)
+
+            seconds = max(result['seconds'], 1e-9)
+            rows = len(result['transactions']) + result['rejected']
+            table.add_row(
+                name,
+                f"{len(result['transactions']):,}",
+                f"[yellow]{result['rejected']:,}[/yellow]",
+                f"{duplicates:,}",
+                f"{rows / seconds:,.0f}",
+                f"{result['bytes'] / 1_000_000 / seconds:,.2f}",
+            )
+
+        console.print(table)
+        console.print(f"Processed {len(sources)} files in {time.perf_counter() - started:.2f}s.")
+
+        if not transactions_to_add:
+            console.print("[yellow]No new, unique transactions to import.[/yellow]")
+            return
+
+        console.print(f"Found {len(transactions_to_add):,} new transactions.")
+        confirm = questionary.confirm("Do you want to import these transactions?").ask()
+        if confirm:
+            imported = _write_transactions(transactions_to_add, skip_existing=True)
+            console.print(f"[green]✔ Successfully imported {imported:,} transactions.[/green]")
+        else:
+            console.print("[yellow]Import cancelled.[/yellow]")
+
+    except Exception as e:
+        console.print(f"[bold red]An error occurred during import: {e}[/bold red]")
+
+
+@timed("data_management.create_backup")
 def create_backup():
-    """Creates a timestamped zip archive of the database directory."""
+    """Creates an incremental, checksummed snapshot of the database directory."""
     _ensure_dirs()
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_filename = os.path.join(BACKUPS_DIR, f"backup-{timestamp}")
-    
+    repository = BackupRepository(BACKUPS_DIR, DATABASE_DIR)
+
     try:
-        shutil.make_archive(backup_filename, 'zip', DATABASE_DIR)
-        console.print(f"[green]✔ Backup created successfully: {backup_filename}.zip[/green]")
-        
-        # Auto-cleanup old backups (keep last 10)
-        backups = sorted(os.listdir(BACKUPS_DIR), reverse=True)
-        if len(backups) > 10:
-            for old_backup in backups[10:]:
-                os.remove(os.path.join(BACKUPS_DIR, old_backup))
-            console.print("[cyan]Cleaned up old backups.[/cyan]")
+        # Holding the write lock keeps a concurrent append out of the copied files.
+        with _store.backend.write_lock():
+            snapshot = repository.create_snapshot()
+        console.print(
+            f"[green]✔ Backup created successfully: {snapshot['id']} ({snapshot['stored_bytes']:,} new bytes stored)[/green]"
+        )
+
+        # Retention: keep the last KEEP_SNAPSHOTS restore points, compacting older chains
+        removed = repository.compact(KEEP_SNAPSHOTS)
+        if removed:
+            console.print(f"[cyan]Compacted {removed} old backups.[/cyan]")
 
     except Exception as e:
         console.print(f"[bold red]Backup failed: {e}[/bold red]")
 
+@timed("data_management.restore_backup")
+def restore_backup():
+    """Restores the database directory to a chosen backup snapshot."""
+    repository = BackupRepository(BACKUPS_DIR, DATABASE_DIR)
+    snapshots = repository.snapshots()
+    if not snapshots:
+        console.print("[yellow]No backups found. Use 'Create Backup' first.[/yellow]")
+        return
+
+    try:
+        choices = {f"{s['created']}  ({s['id']})": s["id"] for s in reversed(snapshots)}
+        choice = questionary.select("Restore which backup?", choices=list(choices)).ask()
+        if choice is None: return
+
+        confirm = questionary.confirm(
+            "This replaces the current database files. A backup of the current state is taken first. Continue?"
+        ).ask()
+        if not confirm:
+            console.print("[yellow]Restore cancelled.[/yellow]")
+            return
+
+        # No other process may append between the safety snapshot and the restore.
+        with _store.backend.write_lock():
+            repository.create_snapshot()
+            repository.restore(choices[choice])
+        _store.invalidate()
+        console.print(f"[green]✔ Restored backup {choices[choice]}.[/green]")
+    except KeyboardInterrupt:
+        console.print("\n[bold yellow]Operation cancelled.[/bold yellow]")
+    except Exception as e:
+        console.print(f"[bold red]Restore failed: {e}[/bold red]")
+
+def migrate_to_sqlite():
+    """Copies the CSV ledger and budgets into the SQLite database."""
+    console.print("\n[bold]🗄️ Migrate to SQLite[/bold]")
+    try:
+        count = migrate_csv_to_sqlite(CsvBackend(), SqliteBackend())
+    except ValueError as e:
+        console.print(f"[red]Migration skipped: {e}[/red]")
+        return
+    except Exception as e:
+        console.print(f"[bold red]Migration failed: {e}[/bold red]")
+        return
+
+    console.print(f"[green]✔ Migrated {count} transactions to {SQLITE_FILE}[/green]")
+    console.print("Set [bold]FINANCE_TRACKER_STORAGE=sqlite[/bold] to use the SQLite database.")
+
 def data_management_menu():
     """Displays the data management submenu."""
     menu_actions = {
         "Export Transactions to CSV": export_transactions_csv,
         "Export Transactions to JSON": export_transactions_json,
+        "Custom Export (Filters, JSON Lines, gzip)": export_transactions_filtered,
         "Import Transactions from CSV": import_transactions_csv,
+        "Import Large CSV (Streaming)": import_transactions_streaming,
+        "Batch Import (Directory or Glob)": import_transactions_batch,
         "Create Backup": create_backup,
+        "Restore Backup": restore_backup,
+        "Migrate to SQLite": migrate_to_sqlite,
         "Back to Main Menu": None
     }
     
@@ -0,0 +1,54 @@
+import csv
+import gzip
+import json
+import textwrap
+
+from features.storage.backends import FIELDNAMES
+
+def write_csv(rows, file):
+    """Streams transaction dicts to a CSV file; returns the number written."""
+    writer = csv.DictWriter(file, fieldnames=FIELDNAMES)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+def write_json_lines(rows, file):
+    """Streams transaction dicts as one JSON object per line; returns the number written."""
+    count = 0
+    for row in rows:
+        file.write(json.dumps(row))
+        file.write("\n")
+        count += 1
+    return count
+
+def write_json_array(rows, file):
+    """Streams transaction dicts as an indented JSON array, one element at a time."""
+    count = 0
+    file.write("[")
+    for row in rows:
+        file.write(",\n" if count else "\n")
+        file.write(textwrap.indent(json.dumps(row, indent=4), "    "))
+        count += 1
+    file.write("\n]" if count else "]")
+    return count
+
+EXPORT_FORMATS = {
+    "CSV": (".csv", write_csv),
+    "JSON": (".json", write_json_array),
+    "JSON Lines": (".jsonl", write_json_lines),
+}
+
+def open_export(path, compress=False):
+    """Opens an export file for text writing, gzip-compressed if requested."""
+    if compress:
+        return gzip.open(path, 'wt', newline='', encoding='utf-8')
+    return open(path, 'w', newline='', encoding='utf-8')
+
+def export_rows(rows, path, format_name, compress=False):
+    """Writes rows to `path` in one of EXPORT_FORMATS; returns the number written."""
+    _, writer = EXPORT_FORMATS[format_name]
+    with open_export(path, compress) as file:
+        return writer(rows, file)
@@ -0,0 +1,193 @@
+import csv
+import glob
+import json
+import os
+import time
+
+from features.storage.table import check_amount, date_to_ordinal
+
+REQUIRED_HEADERS = ["date", "type", "category", "description", "amount_paisa"]
+CHUNK_SIZE = 5000
+# A quoted field is not expected to run past this; beyond it the record is rejected.
+MAX_RECORD_BYTES = 1024 * 1024
+
+def iter_csv_records(file, offset=0):
+    """Yields (fields, end_offset) for each CSV record in a binary file.
+
+    Starts reading at byte `offset` and reports the byte offset just past
+    every record, so a reader can resume exactly where it stopped. Quoted
+    fields that span several lines are joined into one record; a record that
+    grows past MAX_RECORD_BYTES (an unterminated quote) is given up on and
+    yielded as fields=None, and reading resumes on the next line.
+    """
+    file.seek(offset)
+    pending = b""
+    in_quotes = False
+    for line in iter(file.readline, b""):
+        offset += len(line)
+        if not in_quotes and b'"' not in line:
+            yield _parse_record(line), offset
+            continue
+        pending += line
+        in_quotes = _inside_quotes(line, in_quotes)
+        if in_quotes:
+            if len(pending) > MAX_RECORD_BYTES:
+                pending, in_quotes = b"", False
+                yield None, offset
+            continue  # Inside a quoted field; keep reading.
+        record, pending = pending, b""
+        yield _parse_record(record), offset
+    if pending:
+        yield _parse_record(pending), offset
+
+def _inside_quotes(line, in_quotes):
+    """Returns whether a quoted field is still open after `line`, given whether one was open before it.
+
+    Follows the csv module: a quote opens a quoted field only at the start of
+    a field, so a quote inside an unquoted field is literal, and a doubled
+    quote inside a quoted field is an escaped quote.
+    """
+    i, n = 0, len(line)
+    field_start = not in_quotes
+    while i < n:
+        if in_quotes:
+            j = line.find(b'"', i)
+            if j < 0:
+                return True
+            if line[j + 1:j + 2] == b'"':
+                i = j + 2
+                continue
+            in_quotes, field_start, i = False, False, j + 1
+        elif field_start and line[i:i + 1] == b'"':
+            in_quotes, i = True, i + 1
+        else:
+            j = line.find(b',', i)
+            if j < 0:
+                return False
+            field_start, i = True, j + 1
+    return in_quotes
+
+def _parse_record(raw):
+    """Parses one raw CSV record; returns None if it is not valid UTF-8 or not valid CSV."""
+    try:
+        return next(csv.reader([raw.decode('utf-8-sig')]), [])
+    except (UnicodeDecodeError, csv.Error):
+        return None
+
+def read_header(file):
+    """Reads the header record and returns (column positions, data start offset).
+
+    Returns (None, offset) if a required column is missing.
+    """
+    for fields, offset in iter_csv_records(file, 0):
+        if not fields:
+            continue
+        names = [name.strip() for name in fields]
+        if not set(REQUIRED_HEADERS).issubset(names):
+            return None, offset
+        return {name: names.index(name) for name in REQUIRED_HEADERS}, offset
+    return None, 0
+
+def validate_record(fields, columns):
+    """Turns raw CSV fields into a transaction dict, or returns None if invalid."""
+    if not fields:
+        return None
+    try:
+        transaction = {name: fields[i] for name, i in columns.items()}
+        transaction['amount_paisa'] = check_amount(int(transaction['amount_paisa']))
+        date_to_ordinal(transaction['date'])
+    except (ValueError, TypeError, IndexError):
+        return None
+    return transaction
+
+def iter_chunks(records, size=CHUNK_SIZE):
+    """Groups (fields, end_offset) records into lists of at most `size`."""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class ImportCheckpoint:
+    """Remembers how far a streaming import got, so it can be resumed.
+
+    Stored as JSON next to the source file and tied to the source's size and
+    mtime, so a checkpoint for a file that has since changed is ignored.
+    """
+
+    def __init__(self, source_path):
+        self.source_path = source_path
+        self.path = source_path + ".import-progress"
+
+    def _source_signature(self):
+        stat = os.stat(self.source_path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def load(self):
+        """Returns the saved progress dict, or None if there is no usable checkpoint."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                progress = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if progress.get('source') != self._source_signature():
+            return None
+        return progress
+
+    def save(self, offset, imported, rejected, duplicates):
+        """Records that everything before byte `offset` has been handled."""
+        progress = {
+            'source': self._source_signature(),
+            'offset': offset,
+            'imported': imported,
+            'rejected': rejected,
+            'duplicates': duplicates,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(progress, file)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Removes the checkpoint once the import has finished."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def parse_file(path):
+    """Parses and validates one statement file; runs inside a worker process.
+
+    Returns a dict with the valid transactions, the rejected row count, the
+    file size and the time spent, or an `error` message if the file has no
+    usable header.
+    """
+    started = time.perf_counter()
+    transactions = []
+    rejected = 0
+    with open(path, 'rb') as file:
+        columns, offset = read_header(file)
+        if columns is None:
+            return {'path': path, 'error': "Invalid CSV format or missing headers."}
+        for fields, _ in iter_csv_records(file, offset):
+            if fields == []:
+                continue
+            t = validate_record(fields, columns)
+            if t is None:
+                rejected += 1
+            else:
+                transactions.append(t)
+    return {
+        'path': path,
+        'transactions': transactions,
+        'rejected': rejected,
+        'bytes': os.path.getsize(path),
+        'seconds': time.perf_counter() - started,
+    }
+
+def expand_sources(pattern):
+    """Returns the sorted CSV files named by a directory or a glob pattern."""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.csv")
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
@@ -0,0 +1,77 @@
+import questionary
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from features.diagnostics import probes
+
+console = Console()
+
+def show_timings():
+    """Shows call counts, wall time and rows scanned for every probe this session."""
+    console.print("\n[bold]────── Session Timings ──────[/bold]")
+    stats = probes.snapshot()
+    if not stats:
+        console.print("[yellow]Nothing has been measured yet.[/yellow]")
+        return
+
+    table = Table(title="Slowest First", show_header=True, header_style="bold magenta")
+    table.add_column("Probe", style="cyan", no_wrap=True)
+    table.add_column("Calls", justify="right")
+    table.add_column("Total (ms)", justify="right")
+    table.add_column("Mean (ms)", justify="right")
+    table.add_column("Max (ms)", justify="right")
+    table.add_column("Rows Scanned", justify="right")
+    for name, stat in stats:
+        table.add_row(
+            name,
+            str(stat.calls),
+            f"{stat.seconds * 1000:,.2f}",
+            f"{stat.seconds * 1000 / stat.calls:,.2f}",
+            f"{stat.max_seconds * 1000:,.2f}",
+            f"{stat.rows:,}" if stat.rows else "-",
+        )
+    console.print(table)
+
+def profile_next_action():
+    """Arms cProfile for the next action chosen from the main menu."""
+    probes.profile_next_action()
+    console.print("[green]✔ The next main-menu action will be profiled with cProfile.[/green]")
+
+def reset_timings():
+    """Clears the session's measurements."""
+    probes.reset()
+    console.print("[green]✔ Timings cleared.[/green]")
+
+def show_profile(path):
+    """Prints where a saved profile was written and its top functions."""
+    console.print(f"\n[bold]Profile saved to {path}[/bold]")
+    console.print(probes.summarize_profile(path), markup=False, highlight=False)
+
+def diagnostics_menu():
+    """Displays the diagnostics submenu."""
+    diagnostics_actions = {
+        "Show Timings": show_timings,
+        "Profile Next Action": profile_next_action,
+        "Reset Timings": reset_timings,
+        "Back to Main Menu": None
+    }
+
+    while True:
+        console.print("\n")
+        console.print(Panel("[bold cyan]Diagnostics[/bold cyan]", expand=False, border_style="yellow"))
+
+        choice = questionary.select(
+            "Diagnostics Options:",
+            choices=list(diagnostics_actions.keys())
+        ).ask()
+
+        if choice is None or choice == "Back to Main Menu":
+            break
+
+        action = diagnostics_actions.get(choice)
+        if action:
+            action()
+            if choice == "Profile Next Action":
+                break
+            input("\nPress Enter to return to the diagnostics menu...")
@@ -0,0 +1,148 @@
+from datetime import datetime
+from time import perf_counter
+import atexit
+import functools
+import os
+import sys
+
+# Kept free of UI and profiler imports: the storage layer records into it on every load.
+ENV_VAR = "FINANCE_TRACKER_DIAGNOSTICS"
+PROFILES_DIR = "profiles"
+PROFILE_LINES = 20
+
+class Stat:
+    """Accumulated call count, wall time and rows scanned for one probe."""
+
+    __slots__ = ("calls", "seconds", "max_seconds", "rows")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+
+_stats = {}
+_profile_next = False
+
+def record(name, seconds, rows=0):
+    """Adds one call's measurements to the probe called `name`."""
+    stat = _stats.get(name)
+    if stat is None:
+        stat = _stats[name] = Stat()
+    stat.calls += 1
+    stat.seconds += seconds
+    stat.rows += rows
+    if seconds > stat.max_seconds:
+        stat.max_seconds = seconds
+
+class timed:
+    """Times a block or a function under a probe name.
+
+    As a context manager, set `rows` on the returned probe to record how many
+    rows the block scanned:
+
+        with timed("storage.load") as probe:
+            ...
+            probe.rows = len(table)
+
+    As a decorator, `@timed("analytics.spending")` records every call.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = 0
+        self._started = None
+
+    def __enter__(self):
+        self.rows = 0
+        self._started = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(self.name, perf_counter() - self._started, self.rows)
+        return False
+
+    def __call__(self, function):
+        name = self.name
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with timed(name):
+                return function(*args, **kwargs)
+        return wrapper
+
+# --- Reading the data ---
+def enabled():
+    """True if the diagnostics environment variable is set."""
+    return os.environ.get(ENV_VAR, "").lower() not in ("", "0", "false", "no")
+
+def snapshot():
+    """Returns (name, Stat) pairs, slowest total first."""
+    return sorted(_stats.items(), key=lambda item: item[1].seconds, reverse=True)
+
+def reset():
+    """Forgets everything recorded so far."""
+    _stats.clear()
+
+def format_report():
+    """Renders the session's measurements as a plain-text table."""
+    lines = [f"{'probe':<40} {'calls':>7} {'total ms':>11} {'mean ms':>10} {'max ms':>10} {'rows':>12}"]
+    for name, stat in snapshot():
+        lines.append(
+            f"{name:<40} {stat.calls:>7} {stat.seconds * 1000:>11.2f} "
+            f"{stat.seconds * 1000 / stat.calls:>10.2f} {stat.max_seconds * 1000:>10.2f} {stat.rows:>12,}"
+        )
+    return "\n".join(lines)
+
+def _dump_report():
+    """Writes the session report at exit: to stderr, or to the file the env var names."""
+    if not _stats:
+        return
+    target = os.environ.get(ENV_VAR, "")
+    report = f"Diagnostics report (pid {os.getpid()})\n{format_report()}\n"
+    if target.lower() in ("1", "true", "yes", "-"):
+        sys.stderr.write(report)
+    else:
+        with open(target, 'a', encoding='utf-8') as file:
+            file.write(report)
+
+if enabled():
+    atexit.register(_dump_report)
+
+# --- Profiling ---
+def profile_next_action():
+    """Arms cProfile for the next menu action run through run_action()."""
+    global _profile_next
+    _profile_next = True
+
+def run_action(name, action):
+    """Runs a menu action under a probe, profiling it if profiling was armed.
+
+    Returns the path of the saved profile, or None if it was not profiled.
+    """
+    global _profile_next
+    if not _profile_next:
+        with timed(f"menu.{name}"):
+            action()
+        return None
+
+    import cProfile
+
+    _profile_next = False
+    profiler = cProfile.Profile()
+    with timed(f"menu.{name}"):
+        profiler.runcall(action)
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+    slug = "".join(c if c.isalnum() else "_" for c in name.lower())
+    path = os.path.join(PROFILES_DIR, f"{slug}_{datetime.now():%Y%m%d_%H%M%S}.prof")
+    profiler.dump_stats(path)
+    return path
+
+def summarize_profile(path, lines=PROFILE_LINES):
+    """Returns the top functions by cumulative time from a saved profile."""
+    import io
+    import pstats
+
+    output = io.StringIO()
+    pstats.Stats(path, stream=output).strip_dirs().sort_stats("cumulative").print_stats(lines)
+    return output.getvalue()
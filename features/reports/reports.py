@@ -0,0 +1,158 @@
+from datetime import date, datetime
+import calendar
+import html
+import json
+import os
+
+from rich.text import Text
+
+from features.diagnostics.probes import timed
+from features.transactions.transactions import _store, _balance
+from features.budgets.budgets import _budget_status
+from features.analytics.analytics import _spending_summary, _income_summary, _savings_summary, _health_score
+from features.smart_assistant.smart_assistant import _get_alerts
+
+REPORTS_DIR = "reports"
+FORMATS = ("json", "md", "html")
+
+def _as_of(month_str, today=None):
+    """Returns the date a month's report describes: today for the current month, else its last day."""
+    today = today or date.today()
+    if month_str == today.strftime("%Y-%m"):
+        return today
+    year, month = map(int, month_str.split("-"))
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+@timed("reports.build")
+def build_report(month_str, today=None):
+    """Computes every report for a YYYY-MM month from the shared, once-loaded ledger."""
+    as_of = _as_of(month_str, today)
+    report = {
+        "month": month_str,
+        "as_of": as_of.isoformat(),
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "balance": _balance(month_str),
+        "budgets": _budget_status(month_str),
+        "spending": _spending_summary(as_of.isoformat()),
+        "income": _income_summary(month_str),
+        "savings": _savings_summary(month_str),
+        "health_score": _health_score(month_str),
+    }
+    # Alerts describe the ledger right now, so only the current month's report has them.
+    if as_of == (today or date.today()):
+        report["alerts"] = [Text.from_markup(alert).plain for alert in _get_alerts()]
+    return report
+
+# --- Rendering ---
+def _money(paisa):
+    return f"{paisa / 100:,.2f}"
+
+def _percent(part, whole):
+    return f"{part / whole * 100:.1f}%" if whole else "-"
+
+def _sections(report):
+    """Lays a report out as (title, columns, rows, notes) sections shared by every text format."""
+    balance = report["balance"]
+    spending = report["spending"]
+    projection = spending["projection"]
+    income = report["income"]
+    savings = report["savings"]
+    score = report["health_score"]
+
+    sections = [
+        ("Balance", ["", "Amount"], [
+            ["Total Income", _money(balance["income_paisa"])],
+            ["Total Expenses", _money(balance["expenses_paisa"])],
+            ["Net Balance", _money(balance["balance_paisa"])],
+        ], []),
+        ("Budgets", ["Category", "Budget", "Spent", "Remaining", "Utilization", "Status"], [
+            [row["category"], _money(row["budget_paisa"]), _money(row["spent_paisa"]),
+             _money(row["remaining_paisa"]), f"{row['utilization']:.1f}%", row["status"]]
+            for row in report["budgets"]
+        ], [] if report["budgets"] else ["No budgets set."]),
+        ("Spending", ["Category", "Amount", "Share"], [
+            [category, _money(amount), _percent(amount, spending["total_expenses"])]
+            for category, amount in spending["by_category"]
+        ], [
+            f"Total spending: {_money(spending['total_expenses'])}",
+            f"Average daily expense: {_money(projection['spent'] / projection['day'])}",
+            f"Projected month-end spend: {_money(projection['projected'])} ({projection['method']})",
+        ]),
+        ("Income", ["Source", "Amount", "Share"], [
+            [source, _money(amount), _percent(amount, income["total_income"])]
+            for source, amount in income["by_source"]
+        ], [f"Total income: {_money(income['total_income'])}"]),
+        ("Savings", ["Month", "Savings", "3-Month Average"], [
+            [row["month"], _money(row["savings"]), _money(row["average"])] for row in savings["trend"]
+        ], [
+            f"Savings rate: {savings['savings_rate']:.2f}%" if savings["savings_rate"] is not None
+            else "Savings rate: no income recorded."
+        ]),
+        ("Financial Health Score", ["Component", "Score"], [
+            ["Savings Rate (>10%)", f"{score['savings_rate']} / 30"],
+            ["Budget Adherence", f"{score['budget_adherence']} / 25"],
+            ["Income vs. Expenses", f"{score['income_vs_expenses']} / 25"],
+            ["Debt Management (Assumed)", f"{score['debt_management']} / 20"],
+            ["Total", f"{score['total']} / 100"],
+        ], list(score["recommendations"])),
+    ]
+    if "alerts" in report:
+        sections.append(("Alerts", [], [], report["alerts"] or ["No immediate alerts."]))
+    return sections
+
+def render_json(report):
+    return json.dumps(report, indent=2) + "\n"
+
+def render_markdown(report):
+    lines = [f"# Finance Report — {report['month']}", "", f"As of {report['as_of']}, generated {report['generated']}.", ""]
+    for title, columns, rows, notes in _sections(report):
+        lines += [f"## {title}", ""]
+        if rows:
+            lines.append("| " + " | ".join(columns) + " |")
+            lines.append("|" + "|".join(" --- " if i == 0 else " ---: " for i in range(len(columns))) + "|")
+            lines += ["| " + " | ".join(str(cell).replace("|", "\\|") for cell in row) + " |" for row in rows]
+            lines.append("")
+        if notes:
+            lines += [f"- {note}" for note in notes] + [""]
+    return "\n".join(lines)
+
+def render_html(report):
+    escape = html.escape
+    parts = [
+        "<!DOCTYPE html>",
+        "<html><head><meta charset=\"utf-8\">",
+        f"<title>Finance Report — {escape(report['month'])}</title>",
+        "<style>body{font-family:sans-serif;max-width:56em;margin:2em auto}"
+        "table{border-collapse:collapse}th,td{padding:.25em .75em;border-bottom:1px solid #ddd}"
+        "td+td,th+th{text-align:right}</style>",
+        "</head><body>",
+        f"<h1>Finance Report — {escape(report['month'])}</h1>",
+        f"<p>As of {escape(report['as_of'])}, generated {escape(report['generated'])}.</p>",
+    ]
+    for title, columns, rows, notes in _sections(report):
+        parts.append(f"<h2>{escape(title)}</h2>")
+        if rows:
+            parts.append("<table><tr>" + "".join(f"<th>{escape(c)}</th>" for c in columns) + "</tr>")
+            parts += ["<tr>" + "".join(f"<td>{escape(str(cell))}</td>" for cell in row) + "</tr>" for row in rows]
+            parts.append("</table>")
+        if notes:
+            parts.append("<ul>" + "".join(f"<li>{escape(note)}</li>" for note in notes) + "</ul>")
+    parts.append("</body></html>")
+    return "\n".join(parts) + "\n"
+
+RENDERERS = {"json": render_json, "md": render_markdown, "html": render_html}
+
+def write_reports(months, formats=FORMATS, output_dir=REPORTS_DIR, today=None):
+    """Builds the reports for each month and writes one file per format; returns the paths written."""
+    os.makedirs(output_dir, exist_ok=True)
+    if not _store.backend.indexed:
+        _store.transactions()  # One ledger load serves every report.
+    paths = []
+    for month_str in months:
+        report = build_report(month_str, today)
+        for format_name in formats:
+            path = os.path.join(output_dir, f"report-{month_str}.{format_name}")
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(RENDERERS[format_name](report))
+            paths.append(path)
+    return paths
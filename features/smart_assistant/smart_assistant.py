@@ -5,12 +5,15 @@ from datetime import datetime
 import calendar
 import questionary
 
-from features.transactions.transactions import _get_transactions
-from features.budgets.budgets import _get_budgets
+from features.diagnostics.probes import timed
+from features.transactions.transactions import _store, _budget_view, _results
+from features.budgets.budgets import _get_budgets, _budget_status
 from features.analytics.analytics import _get_monthly_data
+from features.storage.table import month_range
 
 console = Console()
 
+@timed("smart_assistant.alerts")
 def _get_alerts():
     """Gathers all active financial alerts."""
     alerts = []
@@ -18,55 +21,79 @@ def _get_alerts():
     current_month_str = today.strftime("%Y-%m")
     
     # --- Data Gathering ---
-    budgets = _get_budgets()
     total_income, total_expenses, _, expenses_by_cat = _get_monthly_data(current_month_str)
     
     # --- Alert Generation ---
-    # 1. Budget Warnings
-    if budgets:
-        for category, budget_paisa in budgets.items():
-            spent_paisa = expenses_by_cat.get(category, 0)
-            utilization = (spent_paisa / budget_paisa) * 100 if budget_paisa > 0 else 0
-            if utilization >= 100:
-                alerts.append(f"❗️ [bold red]OVERBUDGET:[/] You've spent {spent_paisa/100:,.2f} in '{category}', exceeding your budget of {budget_paisa/100:,.2f}.")
-            elif utilization >= 80:
-                alerts.append(f"⚠️ [yellow]Budget Warning:[/] You've used {utilization:.0f}% of your '{category}' budget.")
+    # 1. Budget Warnings, from the thresholds the budget view has recorded
+    for row in _budget_status(current_month_str):
+        category = row["category"]
+        level = _budget_view.level(current_month_str, category)
+        if level >= 100:
+            alerts.append(f"❗️ [bold red]OVERBUDGET:[/] You've spent {row['spent_paisa']/100:,.2f} in '{category}', exceeding your budget of {row['budget_paisa']/100:,.2f}.")
+        elif level >= 80:
+            alerts.append(f"⚠️ [yellow]Budget Warning:[/] You've used {row['utilization']:.0f}% of your '{category}' budget.")
 
     # 2. Large Transaction Alert
     if total_income > 0:
-        transactions = _get_transactions()
+        start, end = month_range(current_month_str)
+        transactions = _store.window(start, end)
         large_tx_threshold = total_income * 0.2 # Transaction > 20% of monthly income
-        for t in transactions:
-            if t['date'].startswith(current_month_str) and t['type'] == 'expense' and t['amount_paisa'] > large_tx_threshold:
-                alerts.append(f"💸 [cyan]Large Transaction:[/] A purchase of {t['amount_paisa']/100:,.2f} for '{t['description']}' was detected.")
+        month_expenses = transactions.indices(type='expense', start=start, end=end)
+        large_expenses = [i for i in month_expenses if transactions.amounts[i] > large_tx_threshold]
+        for t in transactions.rows(large_expenses):
+            alerts.append(f"💸 [cyan]Large Transaction:[/] A purchase of {t['amount_paisa']/100:,.2f} for '{t['description']}' was detected.")
 
     return alerts
 
+@_results.memoize("daily_check")
+def _daily_check(date_str):
+    """Returns the day's spending, daily budget guideline, active alerts and tip for a YYYY-MM-DD date."""
+    day = datetime.strptime(date_str, "%Y-%m-%d")
+    today_ordinal = day.toordinal()
+    transactions = _store.window(today_ordinal, today_ordinal + 1)
+    todays_spending = transactions.total(type='expense', start=today_ordinal, end=today_ordinal + 1)
+
+    check = {"todays_spending": todays_spending, "daily_budget": None, "remaining_daily": None}
+    budgets = _get_budgets()
+    if budgets:
+        total_budget = sum(budgets.values())
+        _, num_days = calendar.monthrange(day.year, day.month)
+        check["daily_budget"] = total_budget / num_days
+        check["remaining_daily"] = check["daily_budget"] - todays_spending
+
+    check["alerts"] = _get_alerts()
+
+    _, _, savings, _ = _get_monthly_data(date_str[:7])
+    if not budgets:
+        tip = "You don't have any budgets set. Creating them can help you gain control over your spending."
+    elif todays_spending == 0:
+        tip = "No spending today! Great job. Maybe transfer a small amount to your savings?"
+    elif savings < 0:
+        tip = "Your expenses are higher than your income this month. Look for opportunities to cut back."
+    else:
+        tip = "You're on track this month. Keep up the great work!"
+    check["tip"] = tip
+    return check
+
+@timed("smart_assistant.daily_check")
 def daily_financial_check():
     """Shows a smart daily financial check-up."""
     console.print(f"\n[bold]📊 Daily Financial Check ({datetime.now().strftime('%b %d, %Y')})[/bold]")
     
-    today_str = datetime.now().strftime("%Y-%m-%d")
-    transactions = _get_transactions()
+    check = _daily_check(datetime.now().strftime("%Y-%m-%d"))
     
     # --- Today's Spending ---
-    todays_spending = sum(t['amount_paisa'] for t in transactions if t['date'] == today_str and t['type'] == 'expense')
-    console.print(f"\nToday's Spending: [bold red]{todays_spending/100:,.2f}[/bold red]")
+    console.print(f"\nToday's Spending: [bold red]{check['todays_spending']/100:,.2f}[/bold red]")
 
     # --- Daily Budget ---
-    budgets = _get_budgets()
-    if budgets:
-        total_budget = sum(budgets.values())
-        _, num_days = calendar.monthrange(datetime.now().year, datetime.now().month)
-        daily_budget = total_budget / num_days
-        remaining_daily = daily_budget - todays_spending
-        
+    if check["daily_budget"] is not None:
+        remaining_daily = check["remaining_daily"]
         color = "green" if remaining_daily >= 0 else "red"
-        console.print(f"Daily Budget Guideline: {daily_budget/100:,.2f}")
+        console.print(f"Daily Budget Guideline: {check['daily_budget']/100:,.2f}")
         console.print(f"Remaining for Today: [{color}]{remaining_daily/100:,.2f}[/{color}]")
 
     # --- Alerts ---
-    alerts = _get_alerts()
+    alerts = check["alerts"]
     if alerts:
         alert_str = "\n".join(f"• {a}" for a in alerts)
         console.print(Panel(alert_str, title="[bold]Active Alerts[/bold]", border_style="yellow", expand=False))
@@ -74,41 +101,26 @@ def daily_financial_check():
         console.print("[green]✔ No immediate alerts.[/green]")
 
     # --- Quick Tip ---
-    _, _, savings, _ = _get_monthly_data(datetime.now().strftime("%Y-%m"))
-    tip = ""
-    if not budgets:
-        tip = "You don't have any budgets set. Creating them can help you gain control over your spending."
-    elif todays_spending == 0:
-        tip = "No spending today! Great job. Maybe transfer a small amount to your savings?"
-    elif savings < 0:
-        tip = "Your expenses are higher than your income this month. Look for opportunities to cut back."
-    else:
-        tip = "You're on track this month. Keep up the great work!"
-    
-    console.print(f"\n💡 [bold]Tip of the Day:[/] [i]{tip}[/i]")
+    console.print(f"\n💡 [bold]Tip of the Day:[/] [i]{check['tip']}[/i]")
 
 
-def show_smart_recommendations():
-    """Generates and displays personalized financial recommendations."""
-    console.print("\n[bold]💡 Smart Recommendations[/bold]")
-    
+@_results.memoize("recommendations")
+def _recommendations(month_str):
+    """Returns rule-based (title, description) recommendations for a YYYY-MM month."""
     recs = []
-    today = datetime.now()
-    current_month_str = today.strftime("%Y-%m")
     
     # Data gathering
     budgets = _get_budgets()
-    total_income, total_expenses, savings, expenses_by_cat = _get_monthly_data(current_month_str)
+    total_income, total_expenses, savings, expenses_by_cat = _get_monthly_data(month_str)
     
     # Rule-based recommendations
     if not budgets:
         recs.append(("Set Budgets", "Create monthly budgets for top spending categories like 'Food' and 'Shopping' to gain better financial control."))
     else:
-        overspent_cats = []
-        for cat, spent in expenses_by_cat.items():
-            budget = budgets.get(cat, 0)
-            if budget > 0 and spent > budget:
-                overspent_cats.append(cat)
+        overspent_cats = [
+            row["category"] for row in _budget_status(month_str)
+            if row["budget_paisa"] > 0 and row["spent_paisa"] > row["budget_paisa"]
+        ]
         if overspent_cats:
             recs.append(("Reduce Overspending", f"You're over budget in {', '.join(overspent_cats)}. Review recent transactions in these areas to find potential savings."))
 
@@ -121,6 +133,14 @@ def show_smart_recommendations():
         
     if not recs:
         recs.append(("Great Job!", "You're managing your finances well. Consider setting a new savings goal or increasing your investment contributions."))
+    return recs
+
+@timed("smart_assistant.recommendations")
+def show_smart_recommendations():
+    """Generates and displays personalized financial recommendations."""
+    console.print("\n[bold]💡 Smart Recommendations[/bold]")
+    
+    recs = _recommendations(datetime.now().strftime("%Y-%m"))
 
     table = Table(box=None, show_header=False)
     table.add_column(width=20, style="bold cyan")
@@ -0,0 +1,411 @@
+from collections import Counter
+from operator import itemgetter
+import csv
+import os
+import sqlite3
+
+from features.diagnostics.probes import timed
+from features.storage.fingerprints import FingerprintIndex, fingerprint
+from features.storage.locking import file_lock, replace_atomically
+from features.storage.table import date_to_ordinal, ordinal_to_date
+
+_console = None
+
+def console_print(message):
+    """Prints a diagnostic to a shared stderr Rich console, importing Rich only once there is something to show.
+
+    The storage layer rarely prints, and deferring the import keeps it out of
+    the start-up path of one-shot command-line runs. Writing to stderr keeps
+    warnings out of output that scripts parse, such as `list --json`.
+    """
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console(stderr=True)
+    _console.print(message)
+
+DATABASE_DIR = "database"
+TRANSACTIONS_FILE = os.path.join(DATABASE_DIR, "transactions.txt")
+BUDGETS_FILE = os.path.join(DATABASE_DIR, "budgets.txt")
+SQLITE_FILE = os.path.join(DATABASE_DIR, "finance.db")
+
+FIELDNAMES = ["date", "type", "category", "description", "amount_paisa"]
+
+class CsvBackend:
+    """Stores transactions and budgets in the plain-text CSV files."""
+
+    indexed = False
+
+    def __init__(self, transactions_path=TRANSACTIONS_FILE, budgets_path=BUDGETS_FILE):
+        self.transactions_path = transactions_path
+        self.budgets_path = budgets_path
+        self.fingerprints = FingerprintIndex(os.path.splitext(transactions_path)[0] + ".fp", transactions_path)
+
+    def _size(self):
+        try:
+            return os.path.getsize(self.transactions_path)
+        except FileNotFoundError:
+            return 0
+
+    def signature(self):
+        """Returns the (mtime, size) of the transactions file, or None if it is missing."""
+        try:
+            stat = os.stat(self.transactions_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def budgets_signature(self):
+        """Returns the (mtime, size) of the budgets file, or None if it is missing."""
+        try:
+            stat = os.stat(self.budgets_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def write_lock(self):
+        """Returns a context manager that makes this process the ledger's only writer."""
+        return file_lock(self.transactions_path)
+
+    def read_transactions(self):
+        """Yields every transaction row as a dict of strings, in file order.
+
+        Holds a shared lock while reading, so a concurrent batch append is
+        seen either completely or not at all.
+        """
+        if not os.path.exists(self.transactions_path):
+            return
+        with file_lock(self.transactions_path, shared=True):
+            with open(self.transactions_path, mode='r', newline='', encoding='utf-8') as file:
+                yield from csv.DictReader(file)
+
+    def read_rows(self):
+        """Yields (line_number, fields) for every row, fields in FIELDNAMES order.
+
+        The fast path for loading the ledger: a positional csv.reader with the
+        columns picked by a single itemgetter, and no dict per row. A row with
+        missing columns yields fields=None. Raises KeyError if the header
+        lacks a column.
+        """
+        if not os.path.exists(self.transactions_path):
+            return
+        with file_lock(self.transactions_path, shared=True):
+            with open(self.transactions_path, mode='r', newline='', encoding='utf-8') as file:
+                reader = csv.reader(file)
+                header = next(reader, None)
+                if header is None:
+                    return
+                missing = [name for name in FIELDNAMES if name not in header]
+                if missing:
+                    raise KeyError(f"missing column {missing[0]!r}")
+                pick = itemgetter(*(header.index(name) for name in FIELDNAMES))
+                for row in reader:
+                    if not row:
+                        continue
+                    try:
+                        yield reader.line_num, pick(row)
+                    except IndexError:
+                        yield reader.line_num, None
+
+    def append_transaction(self, transaction):
+        """Appends one transaction row to the file."""
+        with self.write_lock():
+            size_before = self._size()
+            with open(self.transactions_path, mode='a', newline='', encoding='utf-8') as file:
+                writer = csv.DictWriter(file, fieldnames=FIELDNAMES, extrasaction='ignore')
+                if size_before == 0:
+                    writer.writeheader()
+                writer.writerow(transaction)
+            self.fingerprints.record([transaction], size_before)
+
+    @timed("storage.append")
+    def append_transactions(self, transactions, skip_existing=False):
+        """Appends many rows through one buffered handle, with a single fsync.
+
+        With `skip_existing`, rows already in the ledger are dropped under the
+        same lock as the append, so concurrent importers cannot both add the
+        same row. Returns the rows actually appended.
+        """
+        with self.write_lock():
+            if skip_existing:
+                transactions = [t for t in transactions if not self.contains(t)]
+            if not transactions:
+                return transactions
+            size_before = self._size()
+            with open(self.transactions_path, mode='a', newline='', encoding='utf-8', buffering=1024 * 1024) as file:
+                writer = csv.DictWriter(file, fieldnames=FIELDNAMES, extrasaction='ignore')
+                if size_before == 0:
+                    writer.writeheader()
+                writer.writerows(transactions)
+                file.flush()
+                os.fsync(file.fileno())
+            self.fingerprints.record(transactions, size_before)
+        return transactions
+
+    def contains(self, transaction):
+        """True if a transaction with the same date, type, amount and description exists."""
+        return self.fingerprints.contains(transaction)
+
+    @timed("storage.read_budgets")
+    def read_budgets(self):
+        """Returns the {category: amount_paisa} budgets."""
+        if not os.path.exists(self.budgets_path):
+            return {}
+
+        budgets = {}
+        with open(self.budgets_path, mode='r', newline='', encoding='utf-8') as file:
+            try:
+                reader = csv.reader(file)
+                for row in reader:
+                    if row:
+                        budgets[row[0]] = int(row[1])
+            except (csv.Error, ValueError, IndexError) as e:
+                console_print(f"[bold red]Error reading budgets file: {e}[/bold red]")
+                return {}
+        return budgets
+
+    def save_budgets(self, budgets):
+        """Replaces all budgets by writing a temp file and renaming it over the old one."""
+        def write(file):
+            writer = csv.writer(file)
+            for category, amount_paisa in budgets.items():
+                writer.writerow([category, amount_paisa])
+
+        with file_lock(self.budgets_path):
+            replace_atomically(self.budgets_path, write, newline='', encoding='utf-8')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    description TEXT NOT NULL,
+    amount_paisa INTEGER NOT NULL,
+    fingerprint INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date);
+CREATE INDEX IF NOT EXISTS idx_transactions_type_date ON transactions (type, date);
+CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions (category);
+CREATE TABLE IF NOT EXISTS budgets (
+    category TEXT PRIMARY KEY,
+    amount_paisa INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('ledger_version', 0);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('budgets_version', 0);
+"""
+INSERT_TRANSACTION = (
+    "INSERT INTO transactions (date, type, category, description, amount_paisa, fingerprint)"
+    " VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+def _sqlite_fingerprint(transaction):
+    """Returns fingerprint() as a signed 64-bit integer, the form SQLite stores, or None for a bad date."""
+    try:
+        value = fingerprint(transaction)
+    except (ValueError, TypeError, AttributeError):
+        return None
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+def _sqlite_row(transaction):
+    """Returns the INSERT_TRANSACTION parameters for a transaction."""
+    return [transaction[field] for field in FIELDNAMES[:-1]] + [
+        int(transaction['amount_paisa']), _sqlite_fingerprint(transaction),
+    ]
+
+class SqliteBackend:
+    """Stores transactions and budgets in an embedded SQLite database.
+
+    Transactions are indexed on date, (type, date) and category, so month
+    rollups are answered by index lookups instead of a scan of the whole
+    ledger. Each row also stores its fingerprint(), indexed, so duplicate
+    checks normalize exactly as the CSV backends' fingerprint index does.
+    """
+
+    indexed = True
+
+    def __init__(self, path=SQLITE_FILE):
+        self.path = path
+        self._connection = None
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            self._connection.executescript(SCHEMA)
+            self._add_fingerprints()
+        return self._connection
+
+    def _add_fingerprints(self):
+        """Adds and fills the fingerprint column in a database created before it existed."""
+        connection = self._connection
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(transactions)")]
+        if "fingerprint" not in columns:
+            with connection:
+                connection.execute("ALTER TABLE transactions ADD COLUMN fingerprint INTEGER")
+                rows = connection.execute(
+                    "SELECT id, date, type, category, description, amount_paisa FROM transactions"
+                ).fetchall()
+                connection.executemany(
+                    "UPDATE transactions SET fingerprint = ? WHERE id = ?",
+                    ((_sqlite_fingerprint(dict(zip(FIELDNAMES, row[1:]))), row[0]) for row in rows),
+                )
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_transactions_fingerprint ON transactions (fingerprint)")
+
+    def signature(self):
+        """Returns a version number that changes whenever a transaction is added."""
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'ledger_version'").fetchone()
+        return row[0]
+
+    def budgets_signature(self):
+        """Returns a version number that changes whenever the budgets are saved."""
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'budgets_version'").fetchone()
+        return row[0]
+
+    def write_lock(self):
+        """Returns a context manager that makes this process the ledger's only writer.
+
+        SQLite already serializes its own writes; this lock additionally keeps
+        a duplicate check and the insert that follows it atomic.
+        """
+        return file_lock(self.path)
+
+    def read_transactions(self):
+        """Yields every transaction as a dict, in insertion order."""
+        cursor = self.connection.execute(
+            "SELECT date, type, category, description, amount_paisa FROM transactions ORDER BY id"
+        )
+        for row in cursor:
+            yield dict(zip(FIELDNAMES, row))
+
+    def read_rows(self):
+        """Yields (row id, fields) for every transaction, fields in FIELDNAMES order."""
+        cursor = self.connection.execute(
+            "SELECT id, date, type, category, description, amount_paisa FROM transactions ORDER BY id"
+        )
+        for row in cursor:
+            yield row[0], row[1:]
+
+    def window_bounds(self, start, end):
+        """Returns the range read_rows_between() reads for start <= date < end: exactly that range."""
+        return start, end
+
+    def read_rows_between(self, start, end):
+        """Yields read_rows() pairs for rows dated start <= date < end (day ordinals), via the date index."""
+        cursor = self.connection.execute(
+            "SELECT id, date, type, category, description, amount_paisa FROM transactions"
+            " WHERE date >= ? AND date < ? ORDER BY id",
+            (ordinal_to_date(start), ordinal_to_date(end)),
+        )
+        for row in cursor:
+            yield row[0], row[1:]
+
+    def append_transaction(self, transaction):
+        """Inserts one transaction and bumps the ledger version."""
+        with self.write_lock(), self.connection:
+            self.connection.execute(INSERT_TRANSACTION, _sqlite_row(transaction))
+            self.connection.execute("UPDATE meta SET value = value + 1 WHERE key = 'ledger_version'")
+
+    @timed("storage.append")
+    def append_transactions(self, transactions, skip_existing=False):
+        """Inserts many transactions in one SQLite transaction; returns the rows inserted.
+
+        With `skip_existing`, rows already in the ledger are dropped first,
+        under the write lock.
+        """
+        with self.write_lock():
+            if skip_existing:
+                transactions = [t for t in transactions if not self.contains(t)]
+            if not transactions:
+                return transactions
+            with self.connection:
+                self.connection.executemany(INSERT_TRANSACTION, (_sqlite_row(t) for t in transactions))
+                self.connection.execute("UPDATE meta SET value = value + 1 WHERE key = 'ledger_version'")
+        return transactions
+
+    @timed("storage.month_query")
+    def month_totals(self, month_str):
+        """Returns (income_by_cat, expenses_by_cat) Counters for a YYYY-MM month."""
+        cursor = self.connection.execute(
+            "SELECT type, category, SUM(amount_paisa) FROM transactions"
+            " WHERE date >= ? AND date < ? GROUP BY type, category",
+            (f"{month_str}-01", f"{month_str}-32"),
+        )
+        income_by_cat = Counter()
+        expenses_by_cat = Counter()
+        for type, category, total in cursor:
+            if type == 'income':
+                income_by_cat[category] += total
+            else:
+                expenses_by_cat[category] += total
+        return income_by_cat, expenses_by_cat
+
+    def contains(self, transaction):
+        """True if a transaction with the same fingerprint() exists: same date, type, amount and description."""
+        value = _sqlite_fingerprint(transaction)
+        if value is None:
+            return False
+        row = self.connection.execute("SELECT 1 FROM transactions WHERE fingerprint = ? LIMIT 1", (value,)).fetchone()
+        return row is not None
+
+    @timed("storage.read_budgets")
+    def read_budgets(self):
+        """Returns the {category: amount_paisa} budgets."""
+        return dict(self.connection.execute("SELECT category, amount_paisa FROM budgets ORDER BY rowid"))
+
+    def save_budgets(self, budgets):
+        """Replaces all budgets in one SQLite transaction."""
+        with self.connection:
+            self.connection.execute("DELETE FROM budgets")
+            self.connection.executemany("INSERT INTO budgets (category, amount_paisa) VALUES (?, ?)", budgets.items())
+            self.connection.execute("UPDATE meta SET value = value + 1 WHERE key = 'budgets_version'")
+
+def migrate_csv_to_sqlite(csv_backend, sqlite_backend):
+    """Copies all transactions and budgets from the CSV files into SQLite.
+
+    Returns the number of transactions copied. Refuses to run if the SQLite
+    database already holds transactions, so it can only be run once.
+    """
+    connection = sqlite_backend.connection
+    if connection.execute("SELECT 1 FROM transactions LIMIT 1").fetchone():
+        raise ValueError(f"{sqlite_backend.path} already contains transactions.")
+
+    rows = []
+    for t in csv_backend.read_transactions():
+        try:
+            date_to_ordinal(t['date'])
+            rows.append(_sqlite_row(t))
+        except (ValueError, TypeError):
+            console_print(f"[yellow]Skipping corrupted transaction record: {t}[/yellow]")
+    with connection:
+        connection.executemany(INSERT_TRANSACTION, rows)
+        connection.execute("UPDATE meta SET value = value + 1 WHERE key = 'ledger_version'")
+    sqlite_backend.save_budgets(csv_backend.read_budgets())
+    return len(rows)
+
+_backend = None
+
+def get_backend():
+    """Returns the process-wide storage backend.
+
+    CSV is the default; set FINANCE_TRACKER_STORAGE=sqlite to use the SQLite
+    database instead, or =sharded for per-account, per-year CSV shards. With
+    shards, FINANCE_TRACKER_ACCOUNT limits reads and writes to one account;
+    otherwise reads span every account and writes go to the default one.
+    """
+    global _backend
+    if _backend is None:
+        storage = os.environ.get("FINANCE_TRACKER_STORAGE", "csv").lower()
+        if storage == "sqlite":
+            _backend = SqliteBackend()
+        elif storage == "sharded":
+            from features.storage.shards import DEFAULT_ACCOUNT, ShardedBackend
+            account = os.environ.get("FINANCE_TRACKER_ACCOUNT")
+            _backend = ShardedBackend(account=account or DEFAULT_ACCOUNT, accounts=[account] if account else None)
+        else:
+            _backend = CsvBackend()
+    return _backend
@@ -0,0 +1,153 @@
+from hashlib import blake2b
+import csv
+import os
+
+from features.diagnostics.probes import timed
+from features.storage.locking import file_lock, replace_atomically
+from features.storage.table import date_to_ordinal, ordinal_to_date
+
+HEADER_SIZE = 8
+DIGEST_SIZE = 8
+
+def fingerprint(transaction):
+    """Returns a fixed-width 64-bit hash of a transaction's normalized identity.
+
+    The identity is (date, type, amount_paisa, description) with the date in
+    canonical YYYY-MM-DD form. Fields are joined with a unit separator, so
+    descriptions containing '-' can no longer collide with other fields.
+    Raises ValueError if the date or amount is invalid.
+    """
+    key = "\x1f".join((
+        ordinal_to_date(date_to_ordinal(transaction['date'])),
+        transaction['type'].strip().lower(),
+        str(int(transaction['amount_paisa'])),
+        transaction['description'].strip(),
+    ))
+    return int.from_bytes(blake2b(key.encode('utf-8'), digest_size=DIGEST_SIZE).digest(), 'little')
+
+class FingerprintIndex:
+    """Persistent set of transaction fingerprints kept next to the ledger.
+
+    The file starts with the ledger size it covers, followed by one 8-byte
+    fingerprint per row. Appends extend it in place; if the ledger size no
+    longer matches (the ledger was edited elsewhere), it is rebuilt once from
+    the ledger on the next lookup. When another process has appended to both
+    files, only the new fingerprints are read.
+    """
+
+    def __init__(self, path, ledger_path):
+        self.path = path
+        self.ledger_path = ledger_path
+        self._fingerprints = None
+        self._covered_size = None
+        # Inode and digest count of the index file as last read, for incremental reloads.
+        self._file_id = None
+        self._loaded = 0
+
+    def _ledger_size(self):
+        try:
+            return os.path.getsize(self.ledger_path)
+        except FileNotFoundError:
+            return 0
+
+    def _read_covered_size(self):
+        """Returns the ledger size recorded in the index header, or None if there is no index."""
+        try:
+            with open(self.path, 'rb') as file:
+                header = file.read(HEADER_SIZE)
+        except FileNotFoundError:
+            return None
+        if len(header) != HEADER_SIZE:
+            return None
+        return int.from_bytes(header, 'little')
+
+    def _read(self):
+        """Loads fingerprints from the index file.
+
+        If the file is the one read last time (same inode, only appended to),
+        just the digests added since are read; otherwise all of them.
+        """
+        with open(self.path, 'rb') as file:
+            file_id = os.fstat(file.fileno()).st_ino
+            covered_size = int.from_bytes(file.read(HEADER_SIZE), 'little')
+            if self._fingerprints is None or file_id != self._file_id or covered_size < self._covered_size:
+                self._fingerprints = set()
+                self._loaded = 0
+            file.seek(HEADER_SIZE + self._loaded * DIGEST_SIZE)
+            data = file.read()
+        usable = len(data) - len(data) % DIGEST_SIZE
+        self._fingerprints.update(
+            int.from_bytes(data[i:i + DIGEST_SIZE], 'little') for i in range(0, usable, DIGEST_SIZE)
+        )
+        self._loaded += usable // DIGEST_SIZE
+        self._covered_size = covered_size
+        self._file_id = file_id
+
+    def rebuild(self):
+        """Recomputes the index from the ledger and rewrites the file."""
+        fingerprints = []
+        size = self._ledger_size()
+        with timed("storage.fingerprint_rebuild") as probe:
+            if size:
+                with open(self.ledger_path, mode='r', newline='', encoding='utf-8') as file:
+                    for row in csv.DictReader(file):
+                        probe.rows += 1
+                        try:
+                            fingerprints.append(fingerprint(row))
+                        except (ValueError, TypeError, AttributeError, KeyError):
+                            continue
+
+        def write(file):
+            file.write(size.to_bytes(HEADER_SIZE, 'little'))
+            file.write(b"".join(fp.to_bytes(DIGEST_SIZE, 'little') for fp in fingerprints))
+
+        replace_atomically(self.path, write, mode='wb')
+        self._fingerprints = set(fingerprints)
+        self._covered_size = size
+        self._file_id = os.stat(self.path).st_ino
+        self._loaded = len(fingerprints)
+
+    def _fingerprint_set(self):
+        """Returns the in-memory fingerprint set, loading or rebuilding it if stale.
+
+        Reloading happens under a shared ledger lock, so the ledger and the
+        index are never seen halfway through another process's append.
+        """
+        if self._fingerprints is not None and self._covered_size == self._ledger_size():
+            return self._fingerprints
+        with file_lock(self.ledger_path, shared=True):
+            ledger_size = self._ledger_size()
+            if self._read_covered_size() == ledger_size:
+                self._read()
+            else:
+                self.rebuild()
+        return self._fingerprints
+
+    def contains(self, transaction):
+        """True if a transaction with the same fingerprint is already in the ledger."""
+        return fingerprint(transaction) in self._fingerprint_set()
+
+    def record(self, transactions, ledger_size_before):
+        """Adds fingerprints for rows just appended to the ledger.
+
+        `ledger_size_before` is the ledger size before the append; if the index
+        did not cover exactly that much, it is left stale and rebuilt lazily.
+        """
+        if self._read_covered_size() != ledger_size_before:
+            self._fingerprints = None
+            return
+
+        fingerprints = [fingerprint(t) for t in transactions]
+        ledger_size = self._ledger_size()
+        with open(self.path, 'r+b') as file:
+            file.seek(0, os.SEEK_END)
+            file.write(b"".join(fp.to_bytes(DIGEST_SIZE, 'little') for fp in fingerprints))
+            file.seek(0)
+            file.write(ledger_size.to_bytes(HEADER_SIZE, 'little'))
+
+        if self._fingerprints is not None and self._covered_size == ledger_size_before:
+            self._fingerprints.update(fingerprints)
+            self._covered_size = ledger_size
+            self._loaded += len(fingerprints)
+        else:
+            self._fingerprints = None
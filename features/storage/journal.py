@@ -0,0 +1,216 @@
+from contextlib import ExitStack
+from time import monotonic
+import json
+import os
+import threading
+
+from features.diagnostics.probes import timed
+from features.storage.backends import DATABASE_DIR
+from features.storage.locking import file_lock
+from features.storage.table import check_amount, date_to_ordinal
+
+JOURNAL_FILE = os.path.join(DATABASE_DIR, "transactions.wal")
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_INTERVAL = 0.2
+DEFAULT_COMPACT_EVERY = 5000
+
+def _validated(transaction):
+    """Returns a normalized copy of a transaction, or raises ValueError if it is invalid."""
+    try:
+        amount_paisa = transaction["amount_paisa"]
+        if isinstance(amount_paisa, bool) or (isinstance(amount_paisa, float) and not amount_paisa.is_integer()):
+            raise ValueError(f"amount_paisa must be a whole number, not {amount_paisa!r}")
+        t = {
+            "date": transaction["date"],
+            "type": transaction["type"],
+            "category": transaction["category"],
+            "description": transaction.get("description", ""),
+            "amount_paisa": check_amount(int(amount_paisa)),
+        }
+        date_to_ordinal(t["date"])
+    except (KeyError, TypeError, AttributeError, OverflowError) as e:
+        raise ValueError(f"Invalid transaction: {e}")
+    if t["type"] not in ("expense", "income"):
+        raise ValueError(f"Invalid transaction type: {t['type']!r}")
+    for field in ("category", "description"):
+        if not isinstance(t[field], str):
+            raise ValueError(f"Invalid transaction {field}: {t[field]!r}")
+    return t
+
+def _read_journal(path):
+    """Returns (entries, compacted_seq) from a journal file.
+
+    A torn final line, left by a crash in the middle of a write, is ignored:
+    it was never acknowledged as committed.
+    """
+    entries = []
+    compacted_seq = 0
+    try:
+        with open(path, 'rb') as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if "compact" in record:
+                    compacted_seq = record["compact"]
+                else:
+                    entries.append((record["seq"], record["t"]))
+    except FileNotFoundError:
+        pass
+    return entries, compacted_seq
+
+def has_pending(path=JOURNAL_FILE):
+    """True if the journal holds entries that have not reached the ledger."""
+    try:
+        return os.path.getsize(path) > 0
+    except FileNotFoundError:
+        return False
+
+def recover(store, path=JOURNAL_FILE):
+    """Replays a journal left behind by a crash into the ledger; returns the rows replayed.
+
+    Entries covered by a compaction marker may already be in the ledger (the
+    crash hit during compaction), so those are appended only if absent.
+    Everything after the marker never reached the ledger and is appended as is.
+    A journal that a running ingest still holds open is left alone.
+    """
+    if not has_pending(path):
+        return 0
+    try:
+        with file_lock(path, blocking=False), store.backend.write_lock():
+            entries, compacted_seq = _read_journal(path)
+            replayed = store.extend([t for seq, t in entries if seq <= compacted_seq], skip_existing=True)
+            replayed += store.extend([t for seq, t in entries if seq > compacted_seq])
+            with open(path, 'r+b') as file:
+                file.truncate(0)
+                os.fsync(file.fileno())
+    except BlockingIOError:
+        return 0
+    return replayed
+
+class IngestJournal:
+    """Write-ahead journal for high-rate ingestion into the ledger.
+
+    submit() appends an entry to the journal file without syncing it. Entries
+    are made durable together in a group commit — one fsync — once
+    `batch_size` are pending or `interval` seconds have passed; a background
+    thread commits idle batches. Every `compact_every` committed entries, and
+    on close, the journal is compacted: its entries are appended to the ledger
+    in one batch and the journal is emptied. Compaction only runs on the
+    submitting or closing thread, never the background one, since backends
+    such as SQLite must be used from the thread that opened them. recover() replays whatever a
+    crash left in the journal.
+
+    Entries are visible to ledger readers only after compaction.
+    """
+
+    def __init__(self, store, path=JOURNAL_FILE, batch_size=DEFAULT_BATCH_SIZE,
+                 interval=DEFAULT_INTERVAL, compact_every=DEFAULT_COMPACT_EVERY):
+        self.store = store
+        self.path = path
+        self.batch_size = batch_size
+        self.interval = interval
+        self.compact_every = compact_every
+        self.commits = 0
+        self.compactions = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._seq = 0
+        self._pending = 0
+        self._unapplied = []
+        self._last_commit = monotonic()
+        self._closed = threading.Event()
+        self._flusher = None
+        self._held = ExitStack()
+
+    # --- Lifecycle ---
+    def open(self):
+        """Replays any leftover journal, then starts accepting entries.
+
+        Raises ValueError if another process is already ingesting through
+        the same journal.
+        """
+        try:
+            self._held.enter_context(file_lock(self.path, blocking=False))
+        except BlockingIOError:
+            raise ValueError(f"{self.path} is in use by another ingest.")
+        recover(self.store, self.path)
+        self._file = open(self.path, 'ab')
+        self._closed.clear()
+        self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._flusher.start()
+        return self
+
+    def close(self):
+        """Commits and compacts everything submitted, then stops."""
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            self._commit()
+            self._compact()
+            self._file.close()
+        self._held.close()
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.interval):
+            with self._lock:
+                if self._pending and monotonic() - self._last_commit >= self.interval:
+                    self._commit(compact=False)
+
+    # --- Writing ---
+    def submit(self, transaction):
+        """Adds a transaction to the journal; raises ValueError if it is invalid.
+
+        The entry is durable after the next group commit, which happens within
+        `interval` seconds or as soon as `batch_size` entries are pending.
+        """
+        t = _validated(transaction)
+        with self._lock:
+            self._seq += 1
+            self._file.write(json.dumps({"seq": self._seq, "t": t}).encode('utf-8') + b"\n")
+            self._unapplied.append(t)
+            self._pending += 1
+            if self._pending >= self.batch_size or monotonic() - self._last_commit >= self.interval:
+                self._commit()
+
+    def commit(self):
+        """Forces a group commit of every pending entry."""
+        with self._lock:
+            self._commit()
+
+    def _commit(self, compact=True):
+        if self._pending:
+            with timed("journal.commit") as probe:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                probe.rows = self._pending
+            self.commits += 1
+            self._pending = 0
+        self._last_commit = monotonic()
+        if compact and len(self._unapplied) >= self.compact_every:
+            self._compact()
+
+    def _compact(self):
+        """Moves committed entries into the ledger and empties the journal."""
+        if not self._unapplied:
+            return
+        with timed("journal.compact") as probe:
+            # The marker tells recovery that these entries may already be in the ledger.
+            self._file.write(json.dumps({"compact": self._seq}).encode('utf-8') + b"\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.store.extend(self._unapplied)
+            self._file.truncate(0)
+            os.fsync(self._file.fileno())
+            probe.rows = len(self._unapplied)
+        self._unapplied = []
+        self.compactions += 1
@@ -0,0 +1,58 @@
+from contextlib import contextmanager
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; locking degrades to a no-op there.
+    fcntl = None
+
+# Locks the current thread already holds, by path. flock() locks belong to an
+# open file, so re-locking through a second handle would deadlock against ourselves.
+_local = threading.local()
+
+@contextmanager
+def file_lock(path, shared=False, blocking=True):
+    """Holds an advisory lock for `path` for the duration of the block.
+
+    The lock is taken on a `<path>.lock` sidecar rather than on the file
+    itself, so it stays valid while the file is replaced by a rename. Writers
+    take it exclusively and readers shared: any number of readers, or a
+    single writer, at a time. Locks are advisory, so only processes that use
+    this function are coordinated. Nested calls for a path the current thread
+    has already locked are no-ops; an exclusive lock must be taken outermost.
+    With blocking=False, raises BlockingIOError instead of waiting.
+    """
+    held = _local.__dict__.setdefault("held", set())
+    if fcntl is None or path in held:
+        yield
+        return
+
+    with open(path + ".lock", 'a') as lock_file:
+        fcntl.flock(
+            lock_file.fileno(),
+            (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | (0 if blocking else fcntl.LOCK_NB),
+        )
+        held.add(path)
+        try:
+            yield
+        finally:
+            held.discard(path)
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+def replace_atomically(path, write, mode='w', **open_kwargs):
+    """Rewrites `path` by calling write(file) on a temp file, then renaming it into place.
+
+    Readers see either the old content or the new, never a truncated file.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, mode, **open_kwargs) as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,95 @@
+from collections import OrderedDict
+from functools import wraps
+import json
+import os
+
+from features.diagnostics.probes import record, timed
+from features.storage.backends import DATABASE_DIR
+from features.storage.locking import file_lock, replace_atomically
+
+RESULT_CACHE_FILE = os.path.join(DATABASE_DIR, "results.cache.json")
+DEFAULT_MAX_ENTRIES = 256
+
+def result_cache_path():
+    """Returns where results persist, from FINANCE_TRACKER_RESULT_CACHE, or None to keep them in memory.
+
+    "1" uses database/results.cache.json; any other value is taken as a file path.
+    """
+    setting = os.environ.get("FINANCE_TRACKER_RESULT_CACHE", "")
+    if setting in ("", "0"):
+        return None
+    return RESULT_CACHE_FILE if setting == "1" else setting
+
+def _jsonable(signature):
+    return list(signature) if isinstance(signature, tuple) else signature
+
+class ResultCache:
+    """LRU cache of computed screen results, keyed by ledger and budgets versions.
+
+    A result is stored under (function, period, ledger version, budgets
+    version). The versions are the backend's signatures, which every
+    transaction write and budget save changes, in this process or any other,
+    so a stale result is never served: it simply stops matching and ages out.
+    Results must be JSON-serializable. With a `path`, they are also kept on
+    disk, so a later run over an unchanged ledger starts warm.
+    """
+
+    def __init__(self, backend, max_entries=DEFAULT_MAX_ENTRIES, path=None):
+        self.backend = backend
+        self.max_entries = max_entries
+        self.path = path
+        self._entries = None
+
+    def versions(self):
+        """Returns the (ledger, budgets) versions that results are keyed on."""
+        return _jsonable(self.backend.signature()), _jsonable(self.backend.budgets_signature())
+
+    def get(self, name, period, compute):
+        """Returns compute(period), reusing the cached result if nothing has changed since."""
+        entries = self._load()
+        key = json.dumps([name, period, *self.versions()])
+        if key in entries:
+            entries.move_to_end(key)
+            record("result_cache.hit", 0.0)
+            return entries[key]
+
+        with timed("result_cache.miss"):
+            value = compute(period)
+        entries[key] = value
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        self._save()
+        return value
+
+    def memoize(self, name):
+        """Decorates a function of one period argument (a YYYY-MM month or a date) to cache its results."""
+        def decorate(function):
+            @wraps(function)
+            def wrapper(period):
+                return self.get(name, period, function)
+            wrapper.uncached = function
+            return wrapper
+        return decorate
+
+    def clear(self):
+        self._entries = OrderedDict()
+        self._save()
+
+    # --- Persistence ---
+    def _load(self):
+        if self._entries is None:
+            self._entries = OrderedDict()
+            if self.path:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as file:
+                        self._entries.update(json.load(file))
+                except (FileNotFoundError, ValueError):
+                    pass
+        return self._entries
+
+    def _save(self):
+        if not self.path:
+            return
+        entries = list(self._entries.items())
+        with file_lock(self.path):
+            replace_atomically(self.path, lambda file: json.dump(entries, file), encoding='utf-8')
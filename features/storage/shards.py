@@ -0,0 +1,222 @@
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import chain
+import os
+
+from features.diagnostics.probes import timed
+from features.storage.backends import BUDGETS_FILE, DATABASE_DIR, CsvBackend, console_print
+from features.storage.locking import file_lock
+from features.storage.table import check_amount, date_to_ordinal, ordinal_to_date
+
+SHARDS_DIR = os.path.join(DATABASE_DIR, "shards")
+DEFAULT_ACCOUNT = "main"
+SHARD_SUFFIX = ".txt"
+# Below this many bytes of shards to scan, a worker pool costs more than it saves.
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+def shard_year(transaction):
+    """Returns the YYYY year shard a transaction belongs in; raises ValueError for a bad date."""
+    return ordinal_to_date(date_to_ordinal(transaction['date']))[:4]
+
+def _shard_rollups(path):
+    """Returns {month: (income_by_cat, expenses_by_cat)} for every month of one shard file.
+
+    Runs in worker processes, so it takes a path and returns plain Counters.
+    """
+    months = {}
+    month_of = {}
+    for row in CsvBackend(path).read_transactions():
+        try:
+            month = month_of.get(row['date'])
+            if month is None:
+                month = month_of[row['date']] = ordinal_to_date(date_to_ordinal(row['date']))[:7]
+            amount_paisa = check_amount(int(row['amount_paisa']))
+        except (ValueError, TypeError, KeyError):
+            continue  # Reported when the full ledger is loaded.
+        totals = months.get(month)
+        if totals is None:
+            totals = months[month] = (Counter(), Counter())
+        totals[0 if row['type'] == 'income' else 1][row['category']] += amount_paisa
+    return months
+
+_executor = None
+
+def _map_shards(function, paths):
+    """Maps `function` over shard paths, in parallel worker processes when there is enough to scan."""
+    global _executor
+    workers = min(len(paths), os.cpu_count() or 1)
+    if workers < 2 or sum(os.path.getsize(p) for p in paths) < PARALLEL_MIN_BYTES:
+        return [function(path) for path in paths]
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=workers)
+    # map() returns results in input order, so merges are deterministic.
+    return list(_executor.map(function, paths))
+
+class ShardedBackend:
+    """Stores the ledger as one CSV file per account and year.
+
+    Shards live in database/shards/<account>/<year>.txt, each an ordinary
+    CsvBackend ledger with its own lock and fingerprint index. New
+    transactions go to `account`; reads cover `accounts` (default: every
+    account on disk). A router picks the shards a query needs, so a month
+    query reads only that year's shards, and per-shard month totals are
+    cached until that shard changes: historical years are scanned once.
+    Stale shards are rolled up in parallel worker processes and the partial
+    totals merged. Budgets stay in the shared budgets file.
+    """
+
+    indexed = True
+
+    def __init__(self, root=SHARDS_DIR, account=DEFAULT_ACCOUNT, accounts=None, budgets_path=BUDGETS_FILE):
+        self.root = root
+        self.account = account
+        self.accounts = accounts
+        self._budgets = CsvBackend(budgets_path=budgets_path)  # Only its budget methods are used.
+        self._shards = {}
+        self._rollups = {}
+
+    # --- Routing ---
+    def shard(self, account, year):
+        """Returns the CsvBackend for one account and year, creating its directory if needed."""
+        key = (account, year)
+        backend = self._shards.get(key)
+        if backend is None:
+            os.makedirs(os.path.join(self.root, account), exist_ok=True)
+            backend = self._shards[key] = CsvBackend(os.path.join(self.root, account, year + SHARD_SUFFIX))
+        return backend
+
+    def read_accounts(self):
+        """Returns the accounts that reads cover."""
+        if self.accounts is not None:
+            return list(self.accounts)
+        try:
+            return sorted(
+                name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name))
+            )
+        except FileNotFoundError:
+            return []
+
+    def shard_paths(self, years=None):
+        """Returns the existing shard files for the read accounts, optionally only for some years."""
+        paths = []
+        for account in self.read_accounts():
+            directory = os.path.join(self.root, account)
+            try:
+                names = sorted(os.listdir(directory))
+            except FileNotFoundError:
+                continue
+            for name in names:
+                year, suffix = os.path.splitext(name)
+                if suffix == SHARD_SUFFIX and (years is None or year in years):
+                    paths.append(os.path.join(directory, name))
+        return paths
+
+    def _write_shard(self, transaction):
+        return self.shard(self.account, shard_year(transaction))
+
+    # --- Backend interface ---
+    def signature(self):
+        """Returns the (path, mtime, size) of every shard read, as strings that survive JSON."""
+        signature = []
+        for path in self.shard_paths():
+            stat = os.stat(path)
+            signature.append(f"{os.path.relpath(path, self.root)}:{stat.st_mtime_ns}:{stat.st_size}")
+        return tuple(signature)
+
+    def write_lock(self):
+        """Returns a context manager that makes this process the only writer to any shard."""
+        os.makedirs(self.root, exist_ok=True)
+        return file_lock(os.path.join(self.root, "ledger"))
+
+    def read_transactions(self):
+        """Yields every row of every shard read, shard by shard."""
+        return chain.from_iterable(CsvBackend(path).read_transactions() for path in self.shard_paths())
+
+    def read_rows(self):
+        """Yields (line_number, fields) for every row of every shard read, shard by shard."""
+        return chain.from_iterable(CsvBackend(path).read_rows() for path in self.shard_paths())
+
+    def window_bounds(self, start, end):
+        """Widens a start <= date < end range of day ordinals to the whole years whose shards hold it."""
+        first, last = date.fromordinal(start).year, date.fromordinal(end - 1).year
+        return date(first, 1, 1).toordinal(), date(last + 1, 1, 1).toordinal()
+
+    def read_rows_between(self, start, end):
+        """Yields read_rows() pairs from only the shards of the years that start <= date < end spans."""
+        first, last = date.fromordinal(start).year, date.fromordinal(end - 1).year
+        years = {f"{year:04d}" for year in range(first, last + 1)}
+        return chain.from_iterable(CsvBackend(path).read_rows() for path in self.shard_paths(years))
+
+    def append_transaction(self, transaction):
+        """Appends one transaction to its year's shard of the write account."""
+        with self.write_lock():
+            self._write_shard(transaction).append_transaction(transaction)
+
+    @timed("storage.append")
+    def append_transactions(self, transactions, skip_existing=False):
+        """Appends many rows, one batch write per shard touched; returns the rows appended."""
+        by_shard = defaultdict(list)
+        for t in transactions:
+            by_shard[shard_year(t)].append(t)
+        appended = []
+        with self.write_lock():
+            for year, rows in by_shard.items():
+                appended += self.shard(self.account, year).append_transactions(rows, skip_existing)
+        return appended
+
+    def contains(self, transaction):
+        """True if the write account already holds a matching transaction."""
+        return self._write_shard(transaction).contains(transaction)
+
+    @timed("storage.month_query")
+    def month_totals(self, month_str):
+        """Returns (income_by_cat, expenses_by_cat) for a month, merged across the year's shards."""
+        paths = self.shard_paths(years={month_str[:4]})
+        stale = []
+        for path in paths:
+            stat = os.stat(path)
+            cached = self._rollups.get(path)
+            if cached is None or cached[0] != (stat.st_mtime_ns, stat.st_size):
+                stale.append((path, (stat.st_mtime_ns, stat.st_size)))
+        for (path, version), months in zip(stale, _map_shards(_shard_rollups, [path for path, _ in stale])):
+            self._rollups[path] = (version, months)
+
+        income_by_cat = Counter()
+        expenses_by_cat = Counter()
+        for path in paths:
+            income, expenses = self._rollups[path][1].get(month_str, (Counter(), Counter()))
+            income_by_cat.update(income)
+            expenses_by_cat.update(expenses)
+        return income_by_cat, expenses_by_cat
+
+    def budgets_signature(self):
+        return self._budgets.budgets_signature()
+
+    def read_budgets(self):
+        """Returns the {category: amount_paisa} budgets."""
+        return self._budgets.read_budgets()
+
+    def save_budgets(self, budgets):
+        """Replaces all budgets."""
+        self._budgets.save_budgets(budgets)
+
+def split_into_shards(csv_backend, sharded_backend):
+    """Copies the CSV ledger into per-year shards of the sharded backend's write account.
+
+    Returns the number of transactions copied. Refuses to run if the account
+    already has shards, so it can only be run once per account.
+    """
+    account_dir = os.path.join(sharded_backend.root, sharded_backend.account)
+    if os.path.isdir(account_dir) and any(name.endswith(SHARD_SUFFIX) for name in os.listdir(account_dir)):
+        raise ValueError(f"{account_dir} already contains shards.")
+
+    rows = []
+    for t in csv_backend.read_transactions():
+        try:
+            shard_year(t)
+            int(t['amount_paisa'])
+            rows.append(t)
+        except (ValueError, TypeError):
+            console_print(f"[yellow]Skipping corrupted transaction record: {t}[/yellow]")
+    return len(sharded_backend.append_transactions(rows))
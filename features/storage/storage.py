@@ -0,0 +1,269 @@
+from collections import Counter
+import csv
+
+from features.storage.table import TransactionTable, date_to_ordinal, ordinal_to_date
+from features.storage import vectorized
+from features.storage.backends import console_print
+from features.diagnostics.probes import timed
+
+class MonthRollup:
+    """Income, expense and per-category totals for one YYYY-MM month."""
+
+    __slots__ = ("income", "expenses", "expenses_by_cat", "income_by_cat")
+
+    def __init__(self):
+        self.income = 0
+        self.expenses = 0
+        self.expenses_by_cat = Counter()
+        self.income_by_cat = Counter()
+
+    def add(self, type, category, amount_paisa):
+        """Folds one transaction into the month's totals."""
+        if type == 'income':
+            self.income += amount_paisa
+            self.income_by_cat[category] += amount_paisa
+        else:
+            self.expenses += amount_paisa
+            self.expenses_by_cat[category] += amount_paisa
+
+EMPTY_MONTH = MonthRollup()
+# Date-range tables cached for indexed backends; the cache is emptied when it fills.
+MAX_WINDOWS = 16
+
+class TransactionStore:
+    """Process-wide, in-memory view of the transaction ledger.
+
+    The ledger is read from the storage backend once into a TransactionTable
+    and kept in memory. Every read checks the backend's signature (file mtime
+    and size for CSV, a version counter for SQLite), so writes made outside
+    this process trigger a reload. With an indexed backend, single-month
+    rollups are answered by the backend without loading the whole ledger.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._transactions = None
+        self._signature = None
+        self._months = None
+        self._months_complete = False
+        self._windows = {}
+        self._listeners = []
+        self.corrupt_rows = []
+        self._reported_corrupt = set()
+
+    def add_listener(self, listener):
+        """Registers listener(transactions, signature_before, signature_after) to run after each write.
+
+        Listeners run while the write lock is still held, with the rows that
+        were appended and the backend signatures from just before and just
+        after the write, so derived state can be updated in step with the ledger.
+        """
+        self._listeners.append(listener)
+
+    def _refresh(self):
+        """Drops cached state if the backend has changed since it was read."""
+        signature = self.backend.signature()
+        if signature != self._signature:
+            self.invalidate()
+            self._signature = signature
+
+    def _load(self):
+        """Reads the whole ledger into a TransactionTable.
+
+        Rows are read positionally and validated once, as they are added.
+        Corrupted rows are skipped and kept in `corrupt_rows`; each is
+        reported only the first time this process sees it, so reloads after
+        later writes do not repeat the warning.
+        """
+        table = TransactionTable()
+        with timed("storage.load") as probe:
+            try:
+                corrupt_rows = table.extend_rows(self.backend.read_rows())
+            except (csv.Error, KeyError, OverflowError) as e:
+                console_print(f"[bold red]Error reading transactions file: {e}[/bold red]")
+                return TransactionTable()
+            probe.rows = len(table)
+        self.corrupt_rows = corrupt_rows
+        self._report_corrupt(corrupt_rows)
+        return table
+
+    def _report_corrupt(self, corrupt_rows):
+        new_rows = [row for row in corrupt_rows if row not in self._reported_corrupt]
+        if not new_rows:
+            return
+        self._reported_corrupt.update(new_rows)
+        shown = ", ".join(str(line_number) for line_number, _ in new_rows[:10])
+        more = f" and {len(new_rows) - 10:,} more" if len(new_rows) > 10 else ""
+        console_print(
+            f"[bold red]Skipping {len(new_rows):,} corrupted transaction record(s) at line {shown}{more}.[/bold red]"
+        )
+
+    def is_fresh(self):
+        """True if the cached state still matches the backend."""
+        return self._signature is not None and self.backend.signature() == self._signature
+
+    def invalidate(self):
+        """Drops the cached transactions so the next read reloads the ledger."""
+        self._transactions = None
+        self._signature = None
+        self._months = None
+        self._months_complete = False
+        self._windows = {}
+
+    def transactions(self):
+        """Returns the TransactionTable, reloading only if the ledger has changed.
+
+        The returned table is shared between callers and must not be modified.
+        """
+        self._refresh()
+        if self._transactions is None:
+            self._transactions = self._load()
+        return self._transactions
+
+    def window(self, start, end):
+        """Returns a TransactionTable holding at least the rows dated start <= date < end.
+
+        Once the full ledger is loaded, or if the backend cannot read a date
+        range, this is the whole table. Indexed backends read just the range,
+        widened to what the backend reads anyway (a sharded backend reads
+        whole years), and a cached window that covers a later request is
+        reused. Callers must still filter by date, and like transactions()
+        the table must not be modified.
+        """
+        self._refresh()
+        if self._transactions is not None or not self.backend.indexed:
+            return self.transactions()
+        for (lo, hi), table in self._windows.items():
+            if lo <= start and end <= hi:
+                return table
+        if len(self._windows) >= MAX_WINDOWS:
+            self._windows.clear()
+        lo, hi = self.backend.window_bounds(start, end)
+        table = TransactionTable()
+        with timed("storage.window") as probe:
+            table.extend_rows(self.backend.read_rows_between(lo, hi))
+            probe.rows = len(table)
+        self._windows[(lo, hi)] = table
+        return table
+
+    def _build_months(self, table):
+        """Rolls every month up in a single pure-Python pass over the columns."""
+        months = {}
+        month_of = {}
+        type_names = table.type_pool.values
+        category_names = table.category_pool.values
+        for ordinal, type_code, category_code, amount_paisa in zip(
+            table.dates, table.types, table.categories, table.amounts
+        ):
+            rollup = month_of.get(ordinal)
+            if rollup is None:
+                key = ordinal_to_date(ordinal)[:7]
+                rollup = months.get(key)
+                if rollup is None:
+                    rollup = months[key] = MonthRollup()
+                month_of[ordinal] = rollup
+            rollup.add(type_names[type_code], category_names[category_code], amount_paisa)
+        return months
+
+    def _build_all_months(self):
+        """Rolls up every month of the loaded ledger."""
+        table = self.transactions()
+        with timed("storage.build_months") as probe:
+            if vectorized.is_enabled():
+                self._months = vectorized.build_month_rollups(table, MonthRollup)
+            else:
+                self._months = self._build_months(table)
+            probe.rows = len(table)
+        self._months_complete = True
+
+    @timed("storage.query_month")
+    def _query_month(self, month_str):
+        """Builds one month's rollup from an indexed backend query."""
+        rollup = MonthRollup()
+        rollup.income_by_cat, rollup.expenses_by_cat = self.backend.month_totals(month_str)
+        rollup.income = sum(rollup.income_by_cat.values())
+        rollup.expenses = sum(rollup.expenses_by_cat.values())
+        return rollup
+
+    def month(self, month_str):
+        """Returns the MonthRollup for a YYYY-MM month.
+
+        All months are rolled up in a single pass the first time any month is
+        requested (vectorized with NumPy when FINANCE_TRACKER_NUMPY is set);
+        later appends update the rollup in place. Indexed backends answer one
+        month at a time with a query unless the full ledger is already loaded.
+        """
+        self._refresh()
+        if self._months_complete:
+            return self._months.get(month_str, EMPTY_MONTH)
+
+        if self.backend.indexed and self._transactions is None:
+            if self._months is None:
+                self._months = {}
+            if month_str not in self._months:
+                self._months[month_str] = self._query_month(month_str)
+            return self._months[month_str]
+
+        self._build_all_months()
+        return self._months.get(month_str, EMPTY_MONTH)
+
+    def months(self):
+        """Returns every YYYY-MM month that has transactions, oldest first."""
+        self._refresh()
+        if not self._months_complete:
+            self._build_all_months()
+        return sorted(self._months)
+
+    def append(self, transaction):
+        """Appends a transaction to the backend and to the cached state."""
+        with self.backend.write_lock():
+            was_fresh = self.is_fresh()
+            before = self.backend.signature() if self._listeners else None
+            self.backend.append_transaction(transaction)
+            self._cache_appended([transaction], was_fresh)
+            self._notify([transaction], before)
+
+    def extend(self, transactions, skip_existing=False):
+        """Appends many transactions to the backend in one batch write.
+
+        With `skip_existing`, rows already in the ledger are skipped atomically
+        with the write. Returns the number of rows appended.
+        """
+        transactions = list(transactions)
+        if not transactions:
+            return 0
+        # Holding the write lock from the freshness check through the cache
+        # update means no other writer can slip rows in unnoticed.
+        with self.backend.write_lock():
+            was_fresh = self.is_fresh()
+            before = self.backend.signature() if self._listeners else None
+            appended = self.backend.append_transactions(transactions, skip_existing)
+            if appended:
+                self._cache_appended(appended, was_fresh)
+                self._notify(appended, before)
+        return len(appended)
+
+    def _notify(self, transactions, signature_before):
+        if self._listeners:
+            signature_after = self.backend.signature()
+            for listener in self._listeners:
+                listener(transactions, signature_before, signature_after)
+
+    def _cache_appended(self, transactions, was_fresh):
+        """Folds freshly written rows into the cached table and rollups."""
+        if not was_fresh:
+            # Someone else wrote since our last read; reload lazily.
+            self.invalidate()
+            return
+
+        self._signature = self.backend.signature()
+        self._windows = {}
+        if self._transactions is not None:
+            self._transactions.extend(transactions)
+        if self._months is not None:
+            for transaction in transactions:
+                key = ordinal_to_date(date_to_ordinal(transaction['date']))[:7]
+                if key not in self._months and not self._months_complete:
+                    continue  # Not cached yet; the next query will include this row.
+                rollup = self._months.setdefault(key, MonthRollup())
+                rollup.add(transaction['type'], transaction['category'], int(transaction['amount_paisa']))
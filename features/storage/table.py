@@ -0,0 +1,312 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+
+class StringPool:
+    """Interns repeated strings and hands out small integer codes for them."""
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def code(self, value):
+        """Returns the code for a string, adding it to the pool if it is new."""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value):
+        """Returns the code for a string, or None if the pool has never seen it."""
+        return self._codes.get(value)
+
+# Amounts are stored as signed 64-bit paisa.
+MAX_AMOUNT_PAISA = 2**63 - 1
+
+_ordinal_cache = {}
+_date_str_cache = {}
+
+def date_to_ordinal(date_str):
+    """Converts a YYYY-MM-DD string to a day ordinal. Raises ValueError if invalid.
+
+    Each distinct string is decoded once. The fixed-width form the ledger
+    writes is sliced directly; anything else goes through strptime, which
+    also accepts unpadded months and days.
+    """
+    ordinal = _ordinal_cache.get(date_str)
+    if ordinal is None:
+        if (
+            len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-'
+            and date_str[:4].isdigit() and date_str[5:7].isdigit() and date_str[8:].isdigit()
+        ):
+            ordinal = date(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:])).toordinal()
+        else:
+            ordinal = datetime.strptime(date_str, "%Y-%m-%d").toordinal()
+        _ordinal_cache[date_str] = ordinal
+    return ordinal
+
+def ordinal_to_date(ordinal):
+    """Converts a day ordinal back to its YYYY-MM-DD string."""
+    date_str = _date_str_cache.get(ordinal)
+    if date_str is None:
+        date_str = _date_str_cache[ordinal] = date.fromordinal(ordinal).isoformat()
+    return date_str
+
+def month_range(month_str):
+    """Returns the [start, end) day ordinals covering a YYYY-MM month."""
+    year, month = int(month_str[:4]), int(month_str[5:7])
+    start = date(year, month, 1)
+    end = date(year + month // 12, month % 12 + 1, 1)
+    return start.toordinal(), end.toordinal()
+
+def check_amount(amount_paisa):
+    """Returns an integer paisa amount unchanged; raises ValueError if a 64-bit column cannot hold it."""
+    if not -MAX_AMOUNT_PAISA <= amount_paisa <= MAX_AMOUNT_PAISA:
+        raise ValueError(f"Amount out of range: {amount_paisa}")
+    return amount_paisa
+
+def _check_code(code, column):
+    """Raises ValueError if a string-pool code does not fit its column's item size."""
+    if code >= 1 << (8 * column.itemsize):
+        raise ValueError(f"Too many distinct values for a '{column.typecode}' column.")
+
+class TransactionTable:
+    """Compact, column-oriented container for the transaction ledger.
+
+    Each column is a typed array: dates are day ordinals, type, category and
+    description are codes into shared string pools, and amounts are 64-bit
+    paisa. Iterating or indexing still yields the familiar transaction dicts,
+    built on demand, while filters and sums run directly over the columns.
+
+    A date-sorted permutation of the rows is kept alongside the columns, so
+    date-range filters binary-search it and only touch the matching slice.
+    """
+
+    def __init__(self):
+        self.dates = array('l')
+        self.types = array('B')
+        self.categories = array('H')
+        self.descriptions = array('L')
+        self.amounts = array('q')
+        self.type_pool = StringPool()
+        self.category_pool = StringPool()
+        self.description_pool = StringPool()
+        self._order = None
+        self._sorted_dates = None
+
+    def append(self, transaction):
+        """Adds a transaction dict. Raises ValueError if its date or amount is invalid."""
+        self.append_row(
+            transaction['date'], transaction['type'], transaction['category'],
+            transaction['description'], transaction['amount_paisa'],
+        )
+
+    def append_row(self, date_str, type, category, description, amount_paisa):
+        """Adds a transaction given positionally, as the ledger stores it. Raises ValueError if invalid.
+
+        Every field is checked before any column is touched, so a rejected row
+        never leaves the columns out of step.
+        """
+        ordinal = date_to_ordinal(date_str)
+        amount_paisa = check_amount(int(amount_paisa))
+        type_code = self.type_pool.code(type)
+        category_code = self.category_pool.code(category)
+        description_code = self.description_pool.code(description)
+        _check_code(type_code, self.types)
+        _check_code(category_code, self.categories)
+        _check_code(description_code, self.descriptions)
+        self.dates.append(ordinal)
+        self.types.append(type_code)
+        self.categories.append(category_code)
+        self.descriptions.append(description_code)
+        self.amounts.append(amount_paisa)
+        if self._order is not None:
+            position = bisect_right(self._sorted_dates, ordinal)
+            self._sorted_dates.insert(position, ordinal)
+            self._order.insert(position, len(self.amounts) - 1)
+
+    def extend(self, transactions):
+        """Adds many transaction dicts, merging them into the date index in one pass.
+
+        Raises ValueError at the first invalid one; the rows before it are kept.
+        """
+        index, self._order = self._order, None
+        first = len(self)
+        try:
+            for t in transactions:
+                self.append_row(t['date'], t['type'], t['category'], t['description'], t['amount_paisa'])
+        finally:
+            self._order = index
+            self._merge_index(first)
+
+    def extend_rows(self, rows):
+        """Bulk append_row() for (key, fields) pairs, as backends' read_rows() yields them.
+
+        Returns the pairs whose fields were invalid; the rest are added. Column
+        appends and pool lookups are bound once, outside the loop.
+        """
+        index, self._order = self._order, None
+        first = len(self)
+        try:
+            return self._extend_rows(rows)
+        finally:
+            self._order = index
+            self._merge_index(first)
+
+    def _extend_rows(self, rows):
+        """extend_rows() without the date index, which the caller merges afterwards."""
+        rejected = []
+        cached_ordinal = _ordinal_cache.get
+        add_date, add_type, add_category = self.dates.append, self.types.append, self.categories.append
+        add_description, add_amount = self.descriptions.append, self.amounts.append
+        type_code, category_code = self.type_pool.code, self.category_pool.code
+        description_code = self.description_pool.code
+        max_type, max_category = (1 << 8 * self.types.itemsize) - 1, (1 << 8 * self.categories.itemsize) - 1
+        for key, fields in rows:
+            # Everything is validated before the first append, so a bad row is
+            # rejected whole and the columns stay aligned.
+            try:
+                date_str, type, category, description, amount_paisa = fields
+                ordinal = cached_ordinal(date_str) or date_to_ordinal(date_str)
+                amount_paisa = int(amount_paisa)
+                if not -MAX_AMOUNT_PAISA <= amount_paisa <= MAX_AMOUNT_PAISA:
+                    raise ValueError(amount_paisa)
+                type_value, category_value = type_code(type), category_code(category)
+                if type_value > max_type or category_value > max_category:
+                    raise ValueError(fields)
+                description_value = description_code(description)
+            except (ValueError, TypeError):
+                rejected.append((key, fields))
+                continue
+            add_date(ordinal)
+            add_type(type_value)
+            add_category(category_value)
+            add_description(description_value)
+            add_amount(amount_paisa)
+        return rejected
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def __getitem__(self, i):
+        return {
+            "date": ordinal_to_date(self.dates[i]),
+            "type": self.type_pool.values[self.types[i]],
+            "category": self.category_pool.values[self.categories[i]],
+            "description": self.description_pool.values[self.descriptions[i]],
+            "amount_paisa": self.amounts[i],
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def rows(self, indices):
+        """Yields the transaction dicts for the given row indices."""
+        for i in indices:
+            yield self[i]
+
+    def _merge_index(self, first):
+        """Adds rows `first` onwards to a built date index.
+
+        The new rows are sorted among themselves and spliced into the index
+        with slice copies, so a batch costs one pass over the index however
+        many of its rows are back-dated, rather than one insert per row.
+        """
+        if self._order is None or first == len(self.dates):
+            return
+        dates = self.dates
+        old_order, old_dates = self._order, self._sorted_dates
+        order, sorted_dates = array('L'), array('l')
+        previous = 0
+        for i in sorted(range(first, len(dates)), key=dates.__getitem__):
+            # bisect_right keeps existing rows ahead of new rows on the same date.
+            position = bisect_right(old_dates, dates[i], previous)
+            order += old_order[previous:position]
+            sorted_dates += old_dates[previous:position]
+            order.append(i)
+            sorted_dates.append(dates[i])
+            previous = position
+        order += old_order[previous:]
+        sorted_dates += old_dates[previous:]
+        self._order, self._sorted_dates = order, sorted_dates
+
+    def _date_index(self):
+        """Returns (row order, sorted dates), building the date index on first use."""
+        if self._order is None:
+            dates = self.dates
+            order = sorted(range(len(dates)), key=dates.__getitem__)
+            self._order = array('L', order)
+            self._sorted_dates = array('l', (dates[i] for i in order))
+        return self._order, self._sorted_dates
+
+    def date_slice(self, start=None, end=None):
+        """Returns the indices of rows with start <= date < end, oldest first.
+
+        Uses binary search over the date index, so the cost is proportional to
+        the number of matching rows rather than the size of the ledger.
+        """
+        order, sorted_dates = self._date_index()
+        lo = 0 if start is None else bisect_left(sorted_dates, start)
+        hi = len(order) if end is None else bisect_left(sorted_dates, end)
+        return order[lo:hi]
+
+    def newest_first(self, type=None, start=None, end=None):
+        """Lazily yields matching row indices from the newest date to the oldest.
+
+        Rows sharing a date come out in ledger order. The date index is built
+        by the first call (one sort, near-linear for a ledger that is mostly
+        in date order); after that, nothing is copied or sorted up front, so
+        the first rows are available immediately regardless of ledger size.
+        """
+        type_code = None
+        if type is not None:
+            type_code = self.type_pool.lookup(type)
+            if type_code is None:
+                return
+        order, sorted_dates = self._date_index()
+        lo = 0 if start is None else bisect_left(sorted_dates, start)
+        position = len(order) if end is None else bisect_left(sorted_dates, end)
+        types = self.types
+        # Walk the dates backwards, but each date's run of rows forwards.
+        while position > lo:
+            run_start = bisect_left(sorted_dates, sorted_dates[position - 1], lo, position)
+            for i in order[run_start:position]:
+                if type_code is None or types[i] == type_code:
+                    yield i
+            position = run_start
+
+    def indices(self, type=None, category=None, start=None, end=None):
+        """Returns the row indices matching every given filter, in ledger order.
+
+        `start` and `end` are day ordinals; `start` is inclusive, `end` exclusive.
+        """
+        type_code = category_code = None
+        if type is not None:
+            type_code = self.type_pool.lookup(type)
+            if type_code is None:
+                return []
+        if category is not None:
+            category_code = self.category_pool.lookup(category)
+            if category_code is None:
+                return []
+
+        if start is None and end is None:
+            candidates = range(len(self))
+        else:
+            candidates = sorted(self.date_slice(start, end))
+        if type_code is None and category_code is None:
+            return list(candidates)
+
+        types, categories = self.types, self.categories
+        return [
+            i for i in candidates
+            if (type_code is None or types[i] == type_code)
+            and (category_code is None or categories[i] == category_code)
+        ]
+
+    def total(self, type=None, category=None, start=None, end=None):
+        """Sums amount_paisa over the rows matching every given filter."""
+        amounts = self.amounts
+        return sum(amounts[i] for i in self.indices(type, category, start, end))
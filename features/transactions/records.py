@@ -0,0 +1,43 @@
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from features.storage.table import MAX_AMOUNT_PAISA
+
+# Kept free of UI imports so the command-line entry point can load it quickly.
+EXPENSE_CATEGORIES = ["Food", "Transport", "Shopping", "Bills", "Entertainment", "Health", "Other"]
+INCOME_CATEGORIES = ["Salary", "Freelance", "Business", "Investment", "Gift", "Other"]
+
+CATEGORIES = {"expense": EXPENSE_CATEGORIES, "income": INCOME_CATEGORIES}
+
+def parse_amount(amount_str):
+    """Turns a decimal amount like '12.50' into integer paisa; raises ValueError if invalid."""
+    try:
+        amount = Decimal(amount_str.strip())
+    except (InvalidOperation, AttributeError):
+        raise ValueError(f"Invalid amount: {amount_str!r}")
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount: {amount_str!r}")
+    if amount > MAX_AMOUNT_PAISA / Decimal(100):
+        raise ValueError(f"Amount is too large: {amount_str.strip()}")
+    amount_paisa = int(amount * 100)
+    if amount_paisa <= 0:
+        raise ValueError("Amount must be positive.")
+    return amount_paisa
+
+def new_transaction(type, amount_str, category, description="", date_str=None):
+    """Builds a validated transaction dict without prompting; raises ValueError if invalid."""
+    if category not in CATEGORIES[type]:
+        raise ValueError(f"Unknown {type} category {category!r}; choose from {', '.join(CATEGORIES[type])}.")
+    if not isinstance(description, str):
+        raise ValueError("Description must be text.")
+    if date_str is None:
+        date_str = datetime.now().strftime("%Y-%m-%d")
+    else:
+        datetime.strptime(date_str, "%Y-%m-%d")
+    return {
+        "date": date_str,
+        "type": type,
+        "category": category,
+        "description": description,
+        "amount_paisa": parse_amount(amount_str),
+    }
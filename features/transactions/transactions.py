@@ -2,43 +2,35 @@ import questionary
 from rich.console import Console
 from rich.table import Table
 from datetime import datetime, timedelta
-import csv
-import os
 
-TRANSACTIONS_FILE = "database/transactions.txt"
-console = Console()
+from features.storage.backends import TRANSACTIONS_FILE, get_backend
+from features.diagnostics.probes import timed
+from features.storage.storage import TransactionStore
+from features.storage.table import date_to_ordinal, month_range
+from features.transactions.records import EXPENSE_CATEGORIES, INCOME_CATEGORIES, parse_amount
+from features.budgets.budget_view import BudgetView
+from features.storage.result_cache import ResultCache, result_cache_path
 
-EXPENSE_CATEGORIES = ["Food", "Transport", "Shopping", "Bills", "Entertainment", "Health", "Other"]
-INCOME_CATEGORIES = ["Salary", "Freelance", "Business", "Investment", "Gift", "Other"]
+console = Console()
+_store = TransactionStore(get_backend())
+_budget_view = BudgetView(_store).attach()
+_results = ResultCache(_store.backend, path=result_cache_path())
 
 def _get_transactions():
-    """Reads all transactions from the storage file."""
-    if not os.path.exists(TRANSACTIONS_FILE):
-        return []
-    
-    transactions = []
-    with open(TRANSACTIONS_FILE, mode='r', newline='', encoding='utf-8') as file:
-        try:
-            reader = csv.DictReader(file)
-            for row in reader:
-                row['amount_paisa'] = int(row['amount_paisa'])
-                transactions.append(row)
-        except (csv.Error, ValueError, KeyError) as e:
-            console.print(f"[bold red]Error reading transactions file: {e}[/bold red]")
-            return []
-        except StopIteration:
-            return []  # Empty file
-    return transactions
+    """Reads all transactions through the shared in-memory store."""
+    return _store.transactions()
 
 def _write_transaction(transaction):
-    """Writes a single transaction to the storage file."""
-    file_exists = os.path.exists(TRANSACTIONS_FILE) and os.path.getsize(TRANSACTIONS_FILE) > 0
-    with open(TRANSACTIONS_FILE, mode='a', newline='', encoding='utf-8') as file:
-        fieldnames = ["date", "type", "category", "description", "amount_paisa"]
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(transaction)
+    """Writes a single transaction to the storage backend."""
+    _store.append(transaction)
+
+def _write_transactions(transactions, skip_existing=False):
+    """Writes many transactions to the storage backend in a single batch; returns the number written.
+
+    With `skip_existing`, rows already in the ledger are skipped under the
+    write lock, so concurrent importers never add the same row twice.
+    """
+    return _store.extend(transactions, skip_existing)
 
 def add_expense():
     """Adds a new expense transaction."""
@@ -50,9 +42,10 @@ def add_expense():
         ).ask()
         if amount_str is None: return
 
-        amount_paisa = int(float(amount_str) * 100)
-        if amount_paisa <= 0:
-            console.print("[bold red]Amount must be positive.[/bold red]")
+        try:
+            amount_paisa = parse_amount(amount_str)
+        except ValueError as e:
+            console.print(f"[bold red]{e}[/bold red]")
             return
 
         category = questionary.select(
@@ -98,9 +91,10 @@ def add_income():
         ).ask()
         if amount_str is None: return
 
-        amount_paisa = int(float(amount_str) * 100)
-        if amount_paisa <= 0:
-            console.print("[bold red]Amount must be positive.[/bold red]")
+        try:
+            amount_paisa = parse_amount(amount_str)
+        except ValueError as e:
+            console.print(f"[bold red]{e}[/bold red]")
             return
 
         category = questionary.select(
@@ -135,8 +129,68 @@ def add_income():
         console.print("[bold red]Invalid date format. Please use YYYY-MM-DD.[/bold red]")
 
 
+PAGE_SIZE = 20
+
+class _Pager:
+    """Pulls row indices from a lazy source one page at a time, keeping what it has fetched."""
+
+    def __init__(self, source, page_size=PAGE_SIZE):
+        self._source = source
+        self._page_size = page_size
+        self._fetched = []
+        self.exhausted = False
+
+    def _fill(self, count):
+        while len(self._fetched) < count and not self.exhausted:
+            try:
+                self._fetched.append(next(self._source))
+            except StopIteration:
+                self.exhausted = True
+
+    def page(self, number):
+        """Returns the row indices on a zero-based page."""
+        start = number * self._page_size
+        self._fill(start + self._page_size)
+        return self._fetched[start:start + self._page_size]
+
+    def has_page(self, number):
+        """True if the zero-based page has at least one row."""
+        self._fill(number * self._page_size + 1)
+        return len(self._fetched) > number * self._page_size
+
+    def page_count(self):
+        """Returns the number of pages fetched so far (all pages once exhausted)."""
+        return max(1, -(-len(self._fetched) // self._page_size))
+
+    def of_pages(self):
+        """Describes the total page count, if it is known yet."""
+        return f" of {self.page_count()}" if self.exhausted else ""
+
+@timed("transactions.render_page")
+def _render_page(transactions, indices, title):
+    """Prints one page of transactions as a Rich table."""
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("Date", style="cyan", width=12)
+    table.add_column("Type", width=10)
+    table.add_column("Category", style="yellow")
+    table.add_column("Description", width=40)
+    table.add_column("Amount", justify="right")
+
+    for t in transactions.rows(indices):
+        amount_str = f"{t['amount_paisa'] / 100:.2f}"
+        style = "green" if t['type'] == 'income' else "red"
+        type_str = f"[{style}]{t['type'].capitalize()}[/{style}]"
+        table.add_row(
+            t['date'],
+            type_str,
+            t['category'],
+            t['description'],
+            f"[{style}]{amount_str}[/]"
+        )
+    console.print(table)
+
 def list_transactions():
-    """Lists all transactions with filtering options."""
+    """Lists transactions with filtering options, one page at a time, newest first."""
     console.print("\n[bold]────── List Transactions ──────[/bold]")
     transactions = _get_transactions()
     if not transactions:
@@ -146,78 +200,90 @@ def list_transactions():
     try:
         filter_choice = questionary.select(
             "Filter transactions:",
-            choices=["All", "Last 7 days", "Current Month", "Expenses only", "Income only"]
+            choices=["All", "Last 7 days", "Current Month", "Custom Range", "Expenses only", "Income only"]
         ).ask()
         if filter_choice is None: return
 
         today = datetime.now()
-        seven_days_ago = today - timedelta(days=7)
-        current_month_str = today.strftime("%Y-%m")
-
-        filtered_transactions = []
-        for t in transactions:
-            try:
-                transaction_date = datetime.strptime(t['date'], "%Y-%m-%d")
-                if filter_choice == "All":
-                    filtered_transactions.append(t)
-                elif filter_choice == "Last 7 days" and transaction_date >= seven_days_ago:
-                    filtered_transactions.append(t)
-                elif filter_choice == "Current Month" and t['date'].startswith(current_month_str):
-                    filtered_transactions.append(t)
-                elif filter_choice == "Expenses only" and t['type'] == 'expense':
-                    filtered_transactions.append(t)
-                elif filter_choice == "Income only" and t['type'] == 'income':
-                    filtered_transactions.append(t)
-            except (ValueError, KeyError):
-                console.print(f"[bold red]Skipping corrupted transaction record: {t}[/bold red]")
-
-
-        if not filtered_transactions:
+        start = end = type = None
+
+        if filter_choice == "Last 7 days":
+            start = (today - timedelta(days=7)).toordinal() + 1
+        elif filter_choice == "Current Month":
+            start, end = month_range(today.strftime("%Y-%m"))
+        elif filter_choice == "Custom Range":
+            from_str = questionary.text("From date (YYYY-MM-DD):", default=today.strftime("%Y-%m-01")).ask()
+            if from_str is None: return
+            to_str = questionary.text("To date (YYYY-MM-DD, inclusive):", default=today.strftime("%Y-%m-%d")).ask()
+            if to_str is None: return
+            start, end = date_to_ordinal(from_str), date_to_ordinal(to_str) + 1
+            filter_choice = f"{from_str} to {to_str}"
+        elif filter_choice == "Expenses only":
+            type = 'expense'
+        elif filter_choice == "Income only":
+            type = 'income'
+
+        pager = _Pager(transactions.newest_first(type=type, start=start, end=end))
+        page_number = 0
+        page = pager.page(page_number)
+        if not page:
             console.print("[bold yellow]No transactions match the filter.[/bold yellow]")
             return
 
-        filtered_transactions.sort(key=lambda x: x['date'], reverse=True)
-
-        table = Table(title=f"Transactions ({filter_choice})", show_header=True, header_style="bold magenta")
-        table.add_column("Date", style="cyan", width=12)
-        table.add_column("Type", width=10)
-        table.add_column("Category", style="yellow")
-        table.add_column("Description", width=40)
-        table.add_column("Amount", justify="right")
-
-        for t in filtered_transactions:
-            amount_str = f"{t['amount_paisa'] / 100:.2f}"
-            style = "green" if t['type'] == 'income' else "red"
-            type_str = f"[{style}]{t['type'].capitalize()}[/{style}]"
-            table.add_row(
-                t['date'],
-                type_str,
-                t['category'],
-                t['description'],
-                f"[{style}]{amount_str}[/]"
-            )
-        console.print(table)
+        while True:
+            _render_page(transactions, page, f"Transactions ({filter_choice}) — page {page_number + 1}{pager.of_pages()}")
+            if page_number == 0 and pager.exhausted and pager.page_count() == 1:
+                return
+
+            choices = []
+            if pager.has_page(page_number + 1): choices.append("Next page")
+            if page_number > 0: choices.append("Previous page")
+            choices += ["Jump to page", "Done"]
+            action = questionary.select("Navigate:", choices=choices).ask()
+
+            if action is None or action == "Done":
+                return
+            if action == "Next page":
+                page_number += 1
+            elif action == "Previous page":
+                page_number -= 1
+            else:
+                target = questionary.text(
+                    "Page number:",
+                    validate=lambda text: text.isdigit() and int(text) > 0 or "Please enter a page number."
+                ).ask()
+                if target is None: return
+                if not pager.has_page(int(target) - 1):
+                    console.print(f"[yellow]There are only {pager.page_count()} pages.[/yellow]")
+                    page_number = pager.page_count() - 1
+                else:
+                    page_number = int(target) - 1
+            page = pager.page(page_number)
     except (KeyboardInterrupt, TypeError):
         console.print("\n[bold yellow]Operation cancelled.[/bold yellow]")
+    except ValueError:
+        console.print("[bold red]Invalid date format. Please use YYYY-MM-DD.[/bold red]")
+
 
+def _balance(month_str):
+    """Returns a month's income, expenses and net balance in paisa."""
+    rollup = _store.month(month_str)
+    return {
+        "month": month_str,
+        "income_paisa": rollup.income,
+        "expenses_paisa": rollup.expenses,
+        "balance_paisa": rollup.income - rollup.expenses,
+    }
 
+@timed("transactions.show_balance")
 def show_balance():
     """Shows the current month's financial balance."""
     console.print("\n[bold]────── Current Month's Balance ──────[/bold]")
-    transactions = _get_transactions()
-    current_month = datetime.now().strftime("%Y-%m")
-
-    total_income = 0
-    total_expenses = 0
-
-    for t in transactions:
-        if t['date'].startswith(current_month):
-            if t['type'] == 'income':
-                total_income += t['amount_paisa']
-            else:
-                total_expenses += t['amount_paisa']
+    summary = _balance(datetime.now().strftime("%Y-%m"))
+    total_income = summary["income_paisa"]
+    total_expenses = summary["expenses_paisa"]
 
-    balance = total_income - total_expenses
+    balance = summary["balance_paisa"]
     balance_color = "green" if balance >= 0 else "red"
 
     table = Table(show_header=False, box=None, padding=(0, 2))
@@ -1,14 +1,29 @@
 import questionary
 from rich.console import Console
 from rich.panel import Panel
+from importlib import import_module
 import os
 
-# Import feature functions
-from features.transactions.transactions import add_expense, add_income, list_transactions, show_balance
-from features.budgets.budgets import set_budget, view_budgets
-from features.analytics.analytics import analytics_menu
-from features.smart_assistant.smart_assistant import smart_assistant_menu
-from features.data_management.data_management import data_management_menu
+from features.diagnostics import probes
+from features.storage import journal
+
+def _lazy(module_name, function_name):
+    """Returns a menu action that imports its feature module on first use."""
+    def action():
+        return getattr(import_module(module_name), function_name)()
+    return action
+
+# Feature modules are imported only when their menu entry is chosen.
+add_expense = _lazy("features.transactions.transactions", "add_expense")
+add_income = _lazy("features.transactions.transactions", "add_income")
+list_transactions = _lazy("features.transactions.transactions", "list_transactions")
+show_balance = _lazy("features.transactions.transactions", "show_balance")
+set_budget = _lazy("features.budgets.budgets", "set_budget")
+view_budgets = _lazy("features.budgets.budgets", "view_budgets")
+analytics_menu = _lazy("features.analytics.analytics", "analytics_menu")
+smart_assistant_menu = _lazy("features.smart_assistant.smart_assistant", "smart_assistant_menu")
+data_management_menu = _lazy("features.data_management.data_management", "data_management_menu")
+diagnostics_menu = _lazy("features.diagnostics.diagnostics", "diagnostics_menu")
 
 # Create necessary directories if they don't exist
 os.makedirs("database", exist_ok=True)
@@ -44,6 +59,11 @@ def budget_menu():
 
 def main():
     """Displays the main menu and handles user choices."""
+    # Replay transactions an interrupted ingest left in the write-ahead journal.
+    if journal.has_pending():
+        replayed = journal.recover(import_module("features.transactions.transactions")._store)
+        if replayed:
+            console.print(f"[yellow]Recovered {replayed} journaled transactions from an interrupted ingest.[/yellow]")
     
     menu_actions = {
         "Add Expense": add_expense,
@@ -56,6 +76,11 @@ def main():
         "Data Management": data_management_menu,
         "Exit": None
     }
+    # Hidden unless FINANCE_TRACKER_DIAGNOSTICS is set.
+    if probes.enabled():
+        del menu_actions["Exit"]
+        menu_actions["Diagnostics"] = diagnostics_menu
+        menu_actions["Exit"] = None
     
     while True:
         console.print("\n")
@@ -72,10 +97,12 @@ def main():
         
         action = menu_actions.get(choice)
         if action:
-            action()
+            profile_path = probes.run_action(choice, action)
+            if profile_path:
+                import_module("features.diagnostics.diagnostics").show_profile(profile_path)
 
         # Add a small pause for better UX for sub-menus
-        if choice not in ["Budget Management", "Financial Analytics", "Smart Assistant", "Data Management", "Exit"]:
+        if choice not in ["Budget Management", "Financial Analytics", "Smart Assistant", "Data Management", "Diagnostics", "Exit"]:
              input("\nPress Enter to return to the main menu...")
 
 
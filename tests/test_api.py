@@ -0,0 +1,76 @@
+"""Local HTTP API: error handling and batched writes."""
+import asyncio
+import json
+
+import pytest
+
+from features.storage.backends import CsvBackend
+from features.storage.storage import TransactionStore
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # The shared store's relative paths then point here.
+    from features.api.server import LedgerServer
+    return LedgerServer(TransactionStore(CsvBackend(str(tmp_path / "transactions.txt"), str(tmp_path / "budgets.txt"))))
+
+async def _request(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode() + data
+    )
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), 5)
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+def _serve(server, client):
+    async def main():
+        ready = asyncio.Event()
+        address = []
+        task = asyncio.create_task(server.serve_forever("127.0.0.1", 0, lambda a: (address.append(a), ready.set())))
+        await ready.wait()
+        try:
+            return await client(address[0][1])
+        finally:
+            task.cancel()
+    return asyncio.run(main())
+
+def _expense(description):
+    return {"type": "expense", "amount": "1.50", "category": "Food", "description": description, "date": "2025-01-05"}
+
+def test_unexpected_handler_error_is_a_json_500(server):
+    async def broken(query, body):
+        raise KeyError("boom")
+    server.routes[("GET", "/health")] = broken
+    status, payload = _serve(server, lambda port: _request(port, "GET", "/health"))
+    assert status == 500
+    assert "error" in payload
+
+def test_failed_request_does_not_fail_its_batch(server, monkeypatch):
+    extend = server.store.extend
+
+    def failing_extend(transactions):
+        transactions = list(transactions)
+        if any(t["description"] == "bad" for t in transactions):
+            raise OSError("disk full")
+        return extend(transactions)
+    monkeypatch.setattr(server.store, "extend", failing_extend)
+
+    async def client(port):
+        return await asyncio.gather(*[
+            _request(port, "POST", "/transactions", _expense(description)) for description in ("a", "bad", "b")
+        ])
+    statuses = [status for status, _ in _serve(server, client)]
+    assert statuses == [201, 500, 201]
+    assert sorted(t["description"] for t in server.store.transactions()) == ["a", "b"]
+
+def test_bad_amounts_are_rejected(server):
+    async def client(port):
+        return await asyncio.gather(*[
+            _request(port, "POST", "/transactions", dict(_expense("x"), amount=amount))
+            for amount in ("1e20", "Infinity", "nan", "-3")
+        ])
+    assert [status for status, _ in _serve(server, client)] == [400, 400, 400, 400]
+    assert len(server.store.transactions()) == 0
@@ -0,0 +1,55 @@
+"""Storage backends agree on what counts as a duplicate."""
+import sqlite3
+
+import pytest
+
+from features.storage.backends import CsvBackend, SqliteBackend
+
+STORED = {"date": "2025-01-05", "type": "expense", "category": "Food", "description": "Coffee", "amount_paisa": 450}
+VARIANTS = [
+    dict(STORED),
+    dict(STORED, date="2025-1-5"),
+    dict(STORED, type="Expense "),
+    dict(STORED, description="  Coffee "),
+    dict(STORED, category="Other"),  # Category is not part of a transaction's identity.
+]
+DIFFERENT = [
+    dict(STORED, amount_paisa=451),
+    dict(STORED, date="2025-01-06"),
+    dict(STORED, description="coffee"),
+    dict(STORED, type="income"),
+]
+
+@pytest.fixture(params=["csv", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "csv":
+        return CsvBackend(str(tmp_path / "transactions.txt"), str(tmp_path / "budgets.txt"))
+    return SqliteBackend(str(tmp_path / "finance.db"))
+
+def test_contains_normalizes_like_fingerprint(backend):
+    backend.append_transactions([STORED])
+    assert all(backend.contains(t) for t in VARIANTS)
+    assert not any(backend.contains(t) for t in DIFFERENT)
+
+def test_skip_existing_matches_across_backends(backend):
+    backend.append_transactions([STORED])
+    appended = backend.append_transactions(VARIANTS + DIFFERENT, skip_existing=True)
+    assert appended == DIFFERENT
+
+def test_sqlite_database_without_fingerprints_is_upgraded(tmp_path):
+    path = str(tmp_path / "finance.db")
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL, type TEXT NOT NULL,
+            category TEXT NOT NULL, description TEXT NOT NULL, amount_paisa INTEGER NOT NULL
+        );
+        INSERT INTO transactions (date, type, category, description, amount_paisa)
+            VALUES ('2025-01-05', 'expense', 'Food', 'Coffee ', 450);
+    """)
+    connection.commit()
+    connection.close()
+
+    backend = SqliteBackend(path)
+    assert backend.contains(STORED)
+    assert not backend.contains(DIFFERENT[0])
@@ -0,0 +1,103 @@
+"""Incremental checksummed backups: snapshot, compact and restore."""
+import gzip
+import os
+
+import pytest
+
+from features.data_management.backups import BackupRepository
+from features.storage.backends import CsvBackend
+from features.storage.shards import ShardedBackend
+
+def _transaction(i, year=2025):
+    return {"date": "%d-01-%02d" % (year, i % 28 + 1), "type": "expense", "category": "Food",
+            "description": f"row {i}", "amount_paisa": 100 + i}
+
+def _contents(directory):
+    """Returns {relative name: bytes} for every file a backup covers."""
+    contents = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if not name.endswith((".fp", ".lock")):
+                path = os.path.join(root, name)
+                with open(path, 'rb') as file:
+                    contents[os.path.relpath(path, directory)] = file.read()
+    return contents
+
+@pytest.fixture
+def database(tmp_path):
+    directory = tmp_path / "database"
+    directory.mkdir()
+    return directory
+
+@pytest.fixture
+def ledger(database):
+    return CsvBackend(str(database / "transactions.txt"), str(database / "budgets.txt"))
+
+@pytest.fixture
+def repository(tmp_path, database):
+    return BackupRepository(str(tmp_path / "backups"), str(database))
+
+def test_snapshots_store_only_appended_bytes(ledger, repository):
+    ledger.append_transactions([_transaction(i) for i in range(50)])
+    ledger.save_budgets({"Food": 10000})
+    first = repository.create_snapshot()
+
+    ledger.append_transactions([_transaction(50)])
+    second = repository.create_snapshot()
+    entry = second["files"]["transactions.txt"]
+    assert entry["parent"] == first["id"]
+    assert entry["offset"] == first["files"]["transactions.txt"]["size"]
+    assert second["stored_bytes"] == entry["size"] - entry["offset"]
+    # Unchanged whole files reuse the earlier chunk.
+    assert second["files"]["budgets.txt"] == first["files"]["budgets.txt"]
+
+def test_backup_compact_restore_round_trip(tmp_path, database, ledger, repository):
+    shards = ShardedBackend(root=str(database / "shards"), budgets_path=str(database / "budgets.txt"))
+    expected = {}
+    for round_ in range(5):
+        ledger.append_transactions([_transaction(10 * round_ + i) for i in range(10)])
+        shards.append_transactions([_transaction(round_, year=2024), _transaction(round_, year=2025)])
+        ledger.save_budgets({"Food": 1000 * (round_ + 1)})
+        snapshot = repository.create_snapshot()
+        expected[snapshot["id"]] = _contents(database)
+
+    assert repository.compact(keep=2) == 3
+    kept = repository.snapshots()
+    assert [s["id"] for s in kept] == list(expected)[3:]
+    # The oldest survivor is now a self-contained base.
+    assert all(entry.get("parent") is None for entry in kept[0]["files"].values())
+    referenced = {os.path.basename(e["chunk"]) for s in kept for e in s["files"].values() if e["chunk"]}
+    assert set(os.listdir(tmp_path / "backups" / "chunks")) == referenced
+
+    for snapshot in kept:
+        target = tmp_path / ("restored-" + snapshot["id"])
+        repository.restore(snapshot["id"], str(target))
+        assert _contents(target) == expected[snapshot["id"]]
+
+    # Restoring in place rewinds the live files and drops derived indexes.
+    ledger.append_transactions([_transaction(999)])
+    assert ledger.contains(_transaction(999))  # Builds the fingerprint index.
+    assert os.path.exists(str(database / "transactions.fp"))
+    repository.restore(kept[0]["id"])
+    assert _contents(database) == expected[kept[0]["id"]]
+    assert not os.path.exists(str(database / "transactions.fp"))
+
+def test_rewritten_ledger_starts_a_new_base(ledger, repository):
+    ledger.append_transactions([_transaction(i) for i in range(5)])
+    repository.create_snapshot()
+    with open(ledger.transactions_path, 'w', encoding='utf-8') as file:
+        file.write("date,type,category,description,amount_paisa\n")
+    snapshot = repository.create_snapshot()
+    assert snapshot["files"]["transactions.txt"]["parent"] is None
+    assert snapshot["files"]["transactions.txt"]["offset"] == 0
+
+def test_corrupted_chunk_is_refused(tmp_path, database, ledger, repository):
+    ledger.append_transactions([_transaction(i) for i in range(5)])
+    snapshot = repository.create_snapshot()
+    chunk = tmp_path / "backups" / snapshot["files"]["transactions.txt"]["chunk"]
+    with gzip.open(str(chunk), 'wb') as file:
+        file.write(b"tampered")
+    before = _contents(database)
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        repository.restore(snapshot["id"])
+    assert _contents(database) == before
@@ -0,0 +1,79 @@
+"""Ingest journal: group commits, compaction and crash recovery."""
+import json
+import time
+
+import pytest
+
+from features.storage.backends import CsvBackend, SqliteBackend
+from features.storage.journal import IngestJournal, has_pending, recover
+from features.storage.storage import TransactionStore
+
+def _transaction(i):
+    return {"date": "2025-01-%02d" % (i % 28 + 1), "type": "expense", "category": "Food",
+            "description": f"row {i}", "amount_paisa": 100 + i}
+
+def _crash(journal):
+    """Stops a journal the way a killed process would: no final commit or compaction."""
+    journal._closed.set()
+    journal._flusher.join()
+    journal._file.close()
+    journal._held.close()
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    return TransactionStore(SqliteBackend(str(tmp_path / "finance.db")))
+
+def test_sqlite_ingest_compacts_and_recovers(tmp_path, sqlite_store):
+    path = str(tmp_path / "transactions.wal")
+    sqlite_store.transactions()  # Opens the SQLite connection on this thread.
+    journal = IngestJournal(sqlite_store, path, batch_size=1000, interval=0.05, compact_every=3).open()
+    for i in range(3):
+        journal.submit(_transaction(i))
+    time.sleep(0.3)  # Long enough for the background thread to commit the idle batch.
+    assert journal._flusher.is_alive()
+    assert journal.commits >= 1
+
+    journal.submit(_transaction(3))  # Compacts on this thread.
+    assert journal.compactions == 1
+    assert len(sqlite_store.transactions()) == 4
+
+    journal.submit(_transaction(4))
+    journal.submit(_transaction(5))
+    journal.commit()
+    _crash(journal)
+    assert has_pending(path)
+
+    # A fresh process replays the committed but uncompacted entries.
+    store = TransactionStore(SqliteBackend(str(tmp_path / "finance.db")))
+    assert recover(store, path) == 2
+    assert not has_pending(path)
+    assert sorted(t["description"] for t in store.transactions()) == [f"row {i}" for i in range(6)]
+
+def test_close_compacts_everything(tmp_path, sqlite_store):
+    path = str(tmp_path / "transactions.wal")
+    with IngestJournal(sqlite_store, path, interval=0.05, compact_every=1000) as journal:
+        for i in range(10):
+            journal.submit(_transaction(i))
+    assert len(sqlite_store.transactions()) == 10
+    assert not has_pending(path)
+
+def test_recover_ignores_torn_last_line(tmp_path):
+    path = str(tmp_path / "transactions.wal")
+    store = TransactionStore(CsvBackend(str(tmp_path / "transactions.txt"), str(tmp_path / "budgets.txt")))
+    store.extend([_transaction(1)])  # Compacted before the crash.
+    lines = [
+        {"seq": 1, "t": _transaction(1)},
+        {"seq": 2, "t": _transaction(2)},  # Covered by the marker but never reached the ledger.
+        {"compact": 2},
+        {"seq": 3, "t": _transaction(3)},
+    ]
+    with open(path, 'wb') as file:
+        for line in lines:
+            file.write(json.dumps(line).encode('utf-8') + b"\n")
+        torn = json.dumps({"seq": 4, "t": _transaction(4)}).encode('utf-8')
+        file.write(torn[:len(torn) // 2])
+
+    assert recover(store, path) == 2
+    assert not has_pending(path)
+    fresh = TransactionStore(CsvBackend(str(tmp_path / "transactions.txt"), str(tmp_path / "budgets.txt")))
+    assert sorted(t["description"] for t in fresh.transactions()) == ["row 1", "row 2", "row 3"]
@@ -0,0 +1,75 @@
+"""Per-account, per-year ledger shards."""
+from collections import Counter
+from datetime import date
+
+import pytest
+
+from features.storage.backends import CsvBackend
+from features.storage.shards import ShardedBackend, split_into_shards
+
+def _transaction(day, description, amount_paisa=100, type_="expense", category="Food"):
+    return {"date": day, "type": type_, "category": category, "description": description, "amount_paisa": amount_paisa}
+
+ROWS = [
+    _transaction("2023-12-31", "eve"),
+    _transaction("2024-01-01", "salary", 50000, "income", "Salary"),
+    _transaction("2024-01-15", "lunch", 1200),
+    _transaction("2024-02-03", "rent", 30000, category="Rent"),
+    _transaction("2025-01-05", "coffee", 450),
+]
+
+@pytest.fixture
+def make_backend(tmp_path):
+    def make(**kwargs):
+        return ShardedBackend(root=str(tmp_path / "shards"), budgets_path=str(tmp_path / "budgets.txt"), **kwargs)
+    return make
+
+def _descriptions(rows):
+    return sorted(fields[3] for _, fields in rows)
+
+def test_rows_are_routed_to_year_shards(tmp_path, make_backend):
+    backend = make_backend(account="household")
+    assert backend.append_transactions(ROWS) == ROWS
+    paths = backend.shard_paths()
+    assert paths == [str(tmp_path / "shards" / "household" / f"{year}.txt") for year in ("2023", "2024", "2025")]
+    assert [t["description"] for t in CsvBackend(paths[1]).read_transactions()] == ["salary", "lunch", "rent"]
+    assert _descriptions(backend.read_rows()) == sorted(t["description"] for t in ROWS)
+
+def test_window_reads_only_the_spanned_years(make_backend):
+    backend = make_backend()
+    backend.append_transactions(ROWS)
+    start, end = date(2024, 1, 10).toordinal(), date(2024, 2, 1).toordinal()
+    assert backend.window_bounds(start, end) == (date(2024, 1, 1).toordinal(), date(2025, 1, 1).toordinal())
+    assert _descriptions(backend.read_rows_between(start, end)) == ["lunch", "rent", "salary"]
+    end = date(2025, 1, 2).toordinal()
+    assert _descriptions(backend.read_rows_between(start, end)) == ["coffee", "lunch", "rent", "salary"]
+
+def test_month_totals_follow_appends(make_backend):
+    backend = make_backend()
+    backend.append_transactions(ROWS)
+    assert backend.month_totals("2024-01") == (Counter(Salary=50000), Counter(Food=1200))
+    backend.append_transaction(_transaction("2024-01-20", "dinner", 800))
+    assert backend.month_totals("2024-01") == (Counter(Salary=50000), Counter(Food=2000))
+    assert backend.month_totals("2022-01") == (Counter(), Counter())
+
+def test_accounts_write_apart_and_read_together(make_backend):
+    main = make_backend()
+    savings = make_backend(account="savings")
+    main.append_transactions(ROWS[:2])
+    savings.append_transactions([_transaction("2024-01-02", "deposit", 700)])
+
+    assert _descriptions(make_backend().read_rows()) == ["deposit", "eve", "salary"]
+    assert _descriptions(make_backend(accounts=["savings"]).read_rows()) == ["deposit"]
+    assert make_backend().month_totals("2024-01") == (Counter(Salary=50000), Counter(Food=700))
+    # Duplicates are judged per write account.
+    assert savings.append_transactions(ROWS[:2], skip_existing=True) == ROWS[:2]
+    assert main.append_transactions(ROWS[:2], skip_existing=True) == []
+
+def test_split_into_shards_runs_once(tmp_path, make_backend):
+    ledger = CsvBackend(str(tmp_path / "transactions.txt"), str(tmp_path / "budgets.txt"))
+    ledger.append_transactions(ROWS)
+    backend = make_backend()
+    assert split_into_shards(ledger, backend) == len(ROWS)
+    assert _descriptions(backend.read_rows()) == sorted(t["description"] for t in ROWS)
+    with pytest.raises(ValueError):
+        split_into_shards(ledger, backend)
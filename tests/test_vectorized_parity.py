@@ -0,0 +1,89 @@
+"""The NumPy month rollup must agree with the pure-Python one to the paisa."""
+from datetime import date
+import random
+
+import pytest
+
+from benchmarks.ledger import iter_transactions
+from features.storage import vectorized
+from features.storage.backends import CsvBackend
+from features.storage.storage import MonthRollup, TransactionStore
+from features.storage.table import TransactionTable
+
+np = pytest.importorskip("numpy")
+
+@pytest.fixture(autouse=True)
+def numpy_loaded(monkeypatch):
+    monkeypatch.setattr(vectorized, "np", np)
+
+@pytest.fixture
+def store(tmp_path):
+    return TransactionStore(CsvBackend(tmp_path / "transactions.txt", tmp_path / "budgets.txt"))
+
+def _table(transactions):
+    table = TransactionTable()
+    for t in transactions:
+        table.append(t)
+    return table
+
+def _plain(months):
+    return {
+        month: (r.income, r.expenses, dict(r.income_by_cat), dict(r.expenses_by_cat))
+        for month, r in months.items()
+    }
+
+def assert_parity(store, table):
+    expected = _plain(store._build_months(table))
+    actual = _plain(vectorized.build_month_rollups(table, MonthRollup))
+    assert actual == expected
+    for month, (income, expenses, income_by_cat, expenses_by_cat) in actual.items():
+        assert all(type(v) is int for v in (income, expenses, *income_by_cat.values(), *expenses_by_cat.values()))
+    return actual
+
+@pytest.mark.parametrize("rows, seed", [(1, 1), (500, 7), (20_000, 42)])
+def test_generated_ledgers(store, rows, seed):
+    assert_parity(store, _table(iter_transactions(rows, end=date(2025, 6, 30), seed=seed)))
+
+def test_empty_ledger(store):
+    assert assert_parity(store, TransactionTable()) == {}
+
+def test_months_without_transactions_are_absent(store):
+    transactions = [
+        t for t in iter_transactions(3_000, end=date(2025, 6, 30), years=2)
+        if not t["date"].startswith(("2024-03", "2024-04"))
+    ]
+    months = assert_parity(store, _table(transactions))
+    assert "2024-02" in months and "2024-05" in months
+    assert "2024-03" not in months and "2024-04" not in months
+
+def test_unknown_categories_and_types(store):
+    transactions = list(iter_transactions(2_000, end=date(2025, 6, 30), seed=3))
+    rng = random.Random(3)
+    for t in rng.sample(transactions, 200):
+        t["category"] = rng.choice(["Crypto", "Pets", "", "Ünïcode"])
+    for t in rng.sample(transactions, 50):
+        t["type"] = "refund"  # Anything but income counts as an expense.
+    assert_parity(store, _table(transactions))
+
+def test_negative_and_zero_amounts(store):
+    transactions = list(iter_transactions(2_000, end=date(2025, 6, 30), seed=5))
+    for t in transactions[::7]:
+        t["amount_paisa"] = -t["amount_paisa"]
+    transactions += [
+        # Categories that net to zero must still be listed, as Counter += does.
+        {"date": "2025-01-10", "type": "expense", "category": "Pets", "description": "", "amount_paisa": 500},
+        {"date": "2025-01-11", "type": "expense", "category": "Pets", "description": "", "amount_paisa": -500},
+        {"date": "2025-02-01", "type": "income", "category": "Gift", "description": "", "amount_paisa": 0},
+    ]
+    months = assert_parity(store, _table(transactions))
+    assert months["2025-01"][3]["Pets"] == 0
+    assert "Gift" in months["2025-02"][2]
+
+def test_large_amounts_sum_exactly(store):
+    big = 2**53 + 1  # Not representable as a float.
+    transactions = [
+        {"date": "2025-03-0%d" % day, "type": "expense", "category": "Bills", "description": "", "amount_paisa": big}
+        for day in range(1, 4)
+    ]
+    months = assert_parity(store, _table(transactions))
+    assert months["2025-03"][1] == 3 * big